@@ -1,4 +1,5 @@
-from typing import Union
+from functools import partial
+from typing import Callable, Union
 
 from . import actions
 from . import rewards
@@ -7,7 +8,7 @@ from . import stoppers
 from . import informers
 from . import renderers
 
-from tensortrade.env.generic import TradingEnv
+from tensortrade.env.generic import TradingEnv, VecTradingEnv, SubprocVecTradingEnv
 from tensortrade.env.generic.components.renderer import AggregateRenderer
 from tensortrade.feed.core import DataFeed
 from tensortrade.oms.wallets import Portfolio
@@ -84,6 +85,43 @@ def create(portfolio: 'Portfolio',
         informer=kwargs.get("informer", informers.TensorTradeInformer()),
         renderer=renderer,
         window_size=window_size,
-        t_signal=t_signal
+        t_signal=t_signal,
+        scheduler=kwargs.get("scheduler", None)
     )
     return env
+
+
+def _create_from(make: 'Callable[[int], dict]', index: int) -> TradingEnv:
+    return create(**make(index))
+
+
+def create_vec(make: 'Callable[[int], dict]',
+               num_envs: int,
+               num_workers: int = None,
+               copy: bool = True) -> 'Union[VecTradingEnv, SubprocVecTradingEnv]':
+    """Creates a batch of default `TradingEnv`s that are stepped together.
+
+    Parameters
+    ----------
+    make : `Callable[[int], dict]`
+        A function taking the index of a sub-environment and returning the
+        keyword arguments to pass to `create` for it. Every call must return
+        a new portfolio, feed, action scheme and reward scheme, since the
+        sub-environments cannot share them.
+    num_envs : int
+        The number of sub-environments.
+    num_workers : int, optional
+        The number of worker processes to step the sub-environments in. If not
+        given, they are stepped in the current process.
+    copy : bool, default True
+        Whether to return a copy of the batch of observations at each step.
+
+    Returns
+    -------
+    `Union[VecTradingEnv, SubprocVecTradingEnv]`
+        The batch of default trading environments.
+    """
+    env_fns = [partial(_create_from, make, i) for i in range(num_envs)]
+    if num_workers:
+        return SubprocVecTradingEnv(env_fns, num_workers=num_workers, copy=copy)
+    return VecTradingEnv(env_fns, copy=copy)
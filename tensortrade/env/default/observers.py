@@ -1,7 +1,8 @@
 
-from typing import List
+from typing import List, Union
 
 
+import os
 import datetime as dt
 import numpy as np
 import pandas as pd
@@ -11,9 +12,9 @@ from random import randrange
 
 
 from tensortrade.feed.core import Stream, NameSpace, DataFeed
+from tensortrade.feed.core.base import IterableStream
 from tensortrade.oms.wallets import Wallet
 from tensortrade.env.generic import Observer
-from collections import OrderedDict
 
 
 def _create_wallet_source(wallet: 'Wallet', include_worth: bool = True) -> 'List[Stream[float]]':
@@ -37,9 +38,9 @@ def _create_wallet_source(wallet: 'Wallet', include_worth: bool = True) -> 'List
     streams = []
 
     with NameSpace(exchange_name + ":/" + symbol):
-        free_balance = Stream.sensor(wallet, lambda w: w.balance.as_float(), dtype="float").rename("free")
-        locked_balance = Stream.sensor(wallet, lambda w: w.locked_balance.as_float(), dtype="float").rename("locked")
-        total_balance = Stream.sensor(wallet, lambda w: w.total_balance.as_float(), dtype="float").rename("total")
+        free_balance = Stream.sensor(wallet, lambda w: w.float_balances.free, dtype="float").rename("free")
+        locked_balance = Stream.sensor(wallet, lambda w: w.float_balances.locked, dtype="float").rename("locked")
+        total_balance = Stream.sensor(wallet, lambda w: w.float_balances.total, dtype="float").rename("total")
 
         streams += [free_balance, locked_balance, total_balance]
 
@@ -86,65 +87,86 @@ def _create_internal_streams(portfolio: 'Portfolio') -> 'List[Stream[float]]':
 class ObservationHistory(object):
     """Stores observations from a given episode of the environment.
 
+    The observations are written in place into a preallocated buffer holding
+    every row twice, so the rows of the window are always contiguous in it and
+    observing does not copy them. Missing and infinite values are replaced
+    once, when a row is written.
+
     Parameters
     ----------
     window_size : int
         The amount of observations to keep stored before discarding them.
+    n_features : int, optional
+        The number of features of an observation. Defaults to the size of the
+        first observation pushed.
+    dtype : `np.dtype`, default np.float64
+        The data type of the observations.
 
     Attributes
     ----------
     window_size : int
         The amount of observations to keep stored before discarding them.
-    rows : pd.DataFrame
-        The rows of observations that are used as the environment observation
-        at each step of an episode.
-
+    buffer : `np.array`
+        The buffer of shape `(2 * window_size, n_features)` holding the rows of
+        observations that are used as the environment observation at each step
+        of an episode.
     """
 
-    def __init__(self, window_size: int) -> None:
+    def __init__(self,
+                 window_size: int,
+                 n_features: int = None,
+                 dtype: 'np.dtype' = np.float64) -> None:
         self.window_size = window_size
-        self.rows = OrderedDict()
+        self.dtype = np.dtype(dtype)
+        self.buffer = None
         self.index = 0
 
-    def push(self, row: dict) -> None:
+        if n_features is not None:
+            self._allocate(n_features)
+
+    def _allocate(self, n_features: int) -> None:
+        self.buffer = np.zeros((2 * self.window_size, n_features), dtype=self.dtype)
+
+    def push(self, row: 'Union[dict, np.array]') -> None:
         """Stores an observation.
 
         Parameters
         ----------
-        row : dict
-            The new observation to store.
+        row : `Union[dict, np.array]`
+            The new observation to store. The values are copied, so the same
+            buffer can be reused for the next observation.
         """
-        self.rows[self.index] = row
+        if isinstance(row, dict):
+            row = list(row.values())
+        if self.buffer is None:
+            self._allocate(len(row))
+
+        position = self.index % self.window_size
+        first = self.buffer[position]
+        first[:] = row
+        np.nan_to_num(first, copy=False)
+        self.buffer[position + self.window_size] = first
         self.index += 1
-        if len(self.rows.keys()) > self.window_size:
-            del self.rows[list(self.rows.keys())[0]]
 
     def observe(self) -> 'np.array':
         """Gets the observation at a given step in an episode
 
+        The observation is a view of the buffer, so it is overwritten by the
+        following observations pushed. Rows that have not been observed yet are
+        filled with zeros.
+
         Returns
         -------
         `np.array`
             The current observation of the environment.
         """
-        rows = self.rows.copy()
-
-        if len(rows) < self.window_size:
-            size = self.window_size - len(rows)
-            padding = np.zeros((size, len(rows[list(rows.keys())[0]])))
-            r = np.array([list(inner_dict.values()) for inner_dict in rows.values()])
-            rows = np.concatenate((padding, r))
-
-        if isinstance(rows, OrderedDict):
-            rows = np.array([list(inner_dict.values()) for inner_dict in rows.values()])
-
-        rows = np.nan_to_num(rows)
-
-        return rows
+        start = self.index % self.window_size
+        return self.buffer[start:start + self.window_size]
 
     def reset(self) -> None:
         """Resets the observation history"""
-        self.rows = OrderedDict()
+        if self.buffer is not None:
+            self.buffer.fill(0)
         self.index = 0
 
 
@@ -158,6 +180,8 @@ class TensorTradeObserver(Observer):
         The portfolio to be used to create the internal data feed mechanism.
     feed : `DataFeed`
         The feed to be used to collect observations to the observation window.
+        The master feed is compiled in the same mode and with the same
+        optimization setting as this feed.
     renderer_feed : `DataFeed`
         The feed to be used for giving information to the renderer.
     window_size : int
@@ -165,7 +189,9 @@ class TensorTradeObserver(Observer):
     min_periods : int
         The amount of steps needed to warmup the `feed`.
     **kwargs : keyword arguments
-        Additional keyword arguments for observer creation.
+        Additional keyword arguments for observer creation. With `copy=False`
+        the observations are views of the observation history instead of
+        copies, which are overwritten by the following observations.
 
     Attributes
     ----------
@@ -190,21 +216,21 @@ class TensorTradeObserver(Observer):
                  min_periods: int = None,
                  **kwargs) -> None:
         internal_group = Stream.group(_create_internal_streams(portfolio)).rename("internal")
-        external_group = Stream.group(feed.inputs).rename("external")
+        external_stack = Stream.stack(feed.inputs).rename("external")
 
         if renderer_feed:
             renderer_group = Stream.group(renderer_feed.inputs).rename("renderer")
 
             self.feed = DataFeed([
                 internal_group,
-                external_group,
+                external_stack,
                 renderer_group
-            ])
+            ], mode=feed.mode, optimize=feed.optimize)
         else:
             self.feed = DataFeed([
                 internal_group,
-                external_group
-            ])
+                external_stack
+            ], mode=feed.mode, optimize=feed.optimize)
 
         self.window_size = window_size
         self.min_periods = min_periods
@@ -212,11 +238,16 @@ class TensorTradeObserver(Observer):
         self._observation_dtype = kwargs.get('dtype', np.float32)
         self._observation_lows = kwargs.get('observation_lows', -np.inf)
         self._observation_highs = kwargs.get('observation_highs', np.inf)
+        self._copy = kwargs.get('copy', True)
 
-        self.history = ObservationHistory(window_size=window_size)
+        self.feed.compile()
+        n_features = len(external_stack.columns)
 
-        initial_obs = self.feed.next()["external"]
-        n_features = len(initial_obs.keys())
+        self.history = ObservationHistory(
+            window_size=window_size,
+            n_features=n_features,
+            dtype=self._observation_dtype
+        )
 
         self._observation_space = Box(
             low=self._observation_lows,
@@ -242,8 +273,7 @@ class TensorTradeObserver(Observer):
         if self.min_periods is not None:
             for _ in range(self.min_periods):
                 if self.has_next():
-                    obs_row = self.feed.next()["external"]
-                    self.history.push(obs_row)
+                    self.history.push(self.feed.next()["external"])
 
     def observe(self, env: 'TradingEnv') -> np.array:
         """Observes the environment.
@@ -263,11 +293,11 @@ class TensorTradeObserver(Observer):
             self.renderer_history += [data["renderer"]]
 
         # Push new observation to observation history
-        obs_row = data["external"]
-        self.history.push(obs_row)
+        self.history.push(data["external"])
 
         obs = self.history.observe()
-        obs = obs.astype(self._observation_dtype)
+        if self._copy:
+            obs = obs.copy()
         return obs
 
     def has_next(self) -> bool:
@@ -297,6 +327,8 @@ class IntradayObserver(Observer):
         The portfolio to be used to create the internal data feed mechanism.
     feed : `DataFeed`
         The feed to be used to collect observations to the observation window.
+        The master feed is compiled in the same mode and with the same
+        optimization setting as this feed.
     renderer_feed : `DataFeed`
         The feed to be used for giving information to the renderer.
     stop_time : datetime.time
@@ -307,8 +339,22 @@ class IntradayObserver(Observer):
         The amount of steps needed to warmup the `feed`.
     randomize : bool
         Whether or not to select a random episode when reset.
+    episode_index : str, optional
+        The path of a file to persist the episode index in. The index is
+        loaded from the file if it exists and was built for the same timestamps
+        and stop time, otherwise it is built and saved to the file.
+    seek_warmup : int, optional
+        The number of steps replayed before the start of a random episode to
+        restore the state of the streams of the feed. Defaults to the lookback
+        of the feed, which restores lagged and rolling streams exactly. If some
+        stream depends on its whole history, it defaults to the longest
+        rolling window of the feed or the number of steps after which an
+        exponentially weighted stream gives less than 0.1% of its weight to
+        older values, so resets never replay the whole feed.
     **kwargs : keyword arguments
-        Additional keyword arguments for observer creation.
+        Additional keyword arguments for observer creation. With `copy=False`
+        the observations are views of the observation history instead of
+        copies, which are overwritten by the following observations.
     Attributes
     ----------
     feed : `DataFeed`
@@ -322,6 +368,14 @@ class IntradayObserver(Observer):
         The amount of steps needed to warmup the `feed`.
     randomize : bool
         Whether or not a random episode is selected when reset.
+    seek_warmup : int
+        The number of steps replayed before the start of a random episode.
+    num_episodes : int
+        The number of episodes in the feed.
+    episode_starts : `np.array`
+        The position of the first step of each episode in the feed.
+    episode_stops : `np.array`
+        The position of the last step of each episode in the feed.
     history : `ObservationHistory`
         The observation history.
     renderer_history : `List[dict]`
@@ -336,23 +390,22 @@ class IntradayObserver(Observer):
                  window_size: int = 1,
                  min_periods: int = None,
                  randomize: bool = False,
+                 episode_index: str = None,
+                 seek_warmup: int = None,
                  **kwargs) -> None:
         internal_group = Stream.group(_create_internal_streams(portfolio)).rename("internal")
-        external_group = Stream.group(feed.inputs).rename("external")
+        external_stack = Stream.stack([s for s in feed.inputs if s.name != "timestamp"]).rename("external")
+        streams = [internal_group, external_stack]
+
+        # The timestamps are not part of the observations, so they are kept
+        # as a separate output of the master feed.
+        timestamps = [s for s in feed.inputs if s.name == "timestamp"]
+        streams += timestamps
 
         if renderer_feed:
-            renderer_group = Stream.group(renderer_feed.inputs).rename("renderer")
+            streams += [Stream.group(renderer_feed.inputs).rename("renderer")]
 
-            self.feed = DataFeed([
-                internal_group,
-                external_group,
-                renderer_group
-            ])
-        else:
-            self.feed = DataFeed([
-                internal_group,
-                external_group
-            ])
+        self.feed = DataFeed(streams, mode=feed.mode, optimize=feed.optimize)
 
         self.stop_time = stop_time
         self.window_size = window_size
@@ -362,12 +415,16 @@ class IntradayObserver(Observer):
         self._observation_dtype = kwargs.get('dtype', np.float32)
         self._observation_lows = kwargs.get('observation_lows', -np.inf)
         self._observation_highs = kwargs.get('observation_highs', np.inf)
+        self._copy = kwargs.get('copy', True)
 
-        self.history = ObservationHistory(window_size=window_size)
+        self.feed.compile()
+        n_features = len(external_stack.columns)
 
-        initial_obs = self.feed.next()["external"]
-        initial_obs.pop('timestamp', None)
-        n_features = len(initial_obs.keys())
+        self.history = ObservationHistory(
+            window_size=window_size,
+            n_features=n_features,
+            dtype=self._observation_dtype
+        )
 
         self._observation_space = Box(
             low=self._observation_lows,
@@ -381,30 +438,115 @@ class IntradayObserver(Observer):
         self.renderer_history = []
 
         if self.randomize:
-            self.num_episodes = 0
-            while self.feed.has_next():
-                ts = self.feed.next()["external"]["timestamp"]
-                if ts.time() == self.stop_time:
-                    self.num_episodes += 1
+            if not timestamps:
+                raise KeyError("Include Stream of Timestamps named 'timestamp' in feed")
+            self._index_episodes(timestamps[0], episode_index)
 
-        self.feed.reset()
-        self.warmup()
+        if seek_warmup is None and self.randomize:
+            seek_warmup = self._default_seek_warmup()
+        self.seek_warmup = seek_warmup
 
         self.stop = False
 
+        self.feed.reset()
+        self.warmup()
+
     @property
     def observation_space(self) -> Space:
         return self._observation_space
 
+    def _default_seek_warmup(self) -> int:
+        """Gets the default number of steps replayed before a random episode.
+
+        Returns
+        -------
+        int
+            The lookback of the feed if it is bounded, otherwise the longest
+            window of its streams.
+        """
+        lookback = self.feed.lookback()
+        if lookback is not None:
+            return lookback
+
+        windows = [self.window_size, self.min_periods or 0]
+        for s in self.feed.process:
+            window = getattr(s, "window", None)
+            if isinstance(window, int):
+                windows += [window]
+            alpha = getattr(s, "alpha", None)
+            if isinstance(alpha, float) and 0 < alpha < 1:
+                windows += [int(np.ceil(np.log(1e-3) / np.log(1 - alpha)))]
+        return max(windows)
+
+    def _index_episodes(self, timestamps: 'Stream', path: str = None) -> None:
+        """Builds the index of the episodes of the feed.
+
+        Each episode stops at a step whose timestamp is at `stop_time` and the
+        next one starts right after it.
+
+        Parameters
+        ----------
+        timestamps : `Stream`
+            The stream of timestamps of the feed.
+        path : str, optional
+            The path of the file to persist the index in.
+        """
+        values = timestamps.values if isinstance(timestamps, IterableStream) else None
+        if values is None:
+            values = []
+            feed = DataFeed([timestamps])
+            while feed.has_next():
+                values += [feed.next()["timestamp"]]
+            feed.reset()
+
+        # The index is only reused for a feed of the same size, first and last
+        # timestamps, and for the same stop time.
+        stop = self.stop_time
+        fingerprint = np.array([
+            len(values),
+            pd.Timestamp(values[0]).value if len(values) else 0,
+            pd.Timestamp(values[-1]).value if len(values) else 0
+        ], dtype=np.int64)
+
+        if path and os.path.exists(path):
+            index = np.load(path)
+            if ("fingerprint" in index.files and
+                    np.array_equal(index["fingerprint"], fingerprint) and
+                    str(index["stop_time"]) == stop.isoformat()):
+                self.episode_starts = index["starts"]
+                self.episode_stops = index["stops"]
+                self.num_episodes = len(self.episode_stops)
+                return
+
+        times = pd.DatetimeIndex(values)
+        stops = np.flatnonzero(
+            (times.hour == stop.hour) &
+            (times.minute == stop.minute) &
+            (times.second == stop.second) &
+            (times.microsecond == stop.microsecond)
+        )
+
+        self.episode_stops = stops
+        self.episode_starts = np.concatenate([[0], stops[:-1] + 1]).astype(stops.dtype)
+        self.num_episodes = len(stops)
+
+        if path:
+            with open(path, "wb") as file:
+                np.savez(
+                    file,
+                    starts=self.episode_starts,
+                    stops=self.episode_stops,
+                    fingerprint=fingerprint,
+                    stop_time=stop.isoformat()
+                )
+
     def warmup(self) -> None:
         """Warms up the data feed.
         """
         if self.min_periods is not None:
             for _ in range(self.min_periods):
                 if self.has_next():
-                    obs_row = self.feed.next()["external"]
-                    obs_row.pop('timestamp', None)
-                    self.history.push(obs_row)
+                    self.history.push(self.feed.next()["external"])
 
     def observe(self, env: 'TradingEnv') -> np.array:
         """Observes the environment.
@@ -422,19 +564,19 @@ class IntradayObserver(Observer):
             self.renderer_history += [data["renderer"]]
 
         # Push new observation to observation history
-        obs_row = data["external"]
         try:
-            obs_ts = obs_row.pop('timestamp')
+            obs_ts = data["timestamp"]
         except KeyError:
             raise KeyError("Include Stream of Timestamps named 'timestamp' in feed")
-        self.history.push(obs_row)
+        self.history.push(data["external"])
 
         # Check if episode should be stopped
         if obs_ts.time() == self.stop_time:
             self.stop = True
 
         obs = self.history.observe()
-        obs = obs.astype(self._observation_dtype)
+        if self._copy:
+            obs = obs.copy()
         return obs
 
     def has_next(self) -> bool:
@@ -451,14 +593,11 @@ class IntradayObserver(Observer):
         self.renderer_history = []
         self.history.reset()
 
-        if self.randomize or not self.feed.has_next():
+        if self.randomize and self.num_episodes > 0:
+            episode = randrange(self.num_episodes)
+            self.feed.seek(int(self.episode_starts[episode]), warmup=self.seek_warmup)
+        elif self.randomize or not self.feed.has_next():
             self.feed.reset()
-            if self.randomize:
-                episode_num = 0
-                while episode_num < randrange(self.num_episodes):
-                    ts = self.feed.next()["external"]["timestamp"]
-                    if ts.time() == self.stop_time:
-                        episode_num += 1
 
         self.warmup()
 
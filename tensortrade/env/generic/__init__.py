@@ -20,3 +20,4 @@ from tensortrade.env.generic.components.informer import Informer
 from tensortrade.env.generic.components.renderer import Renderer
 
 from tensortrade.env.generic.environment import TradingEnv
+from tensortrade.env.generic.vector import VecTradingEnv, SubprocVecTradingEnv
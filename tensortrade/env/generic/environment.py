@@ -31,6 +31,7 @@ from tensortrade.env.generic import (
 )
 from tensortrade.features import FeaturePipeline
 from tensortrade.features.indicators.talib_indicator import TAlibIndicator
+from tensortrade.features.indicators.incremental import IncrementalTAIndicator
 
 
 class TradingEnv(gym.Env, TimeIndexed):
@@ -52,7 +53,8 @@ class TradingEnv(gym.Env, TimeIndexed):
     renderer : `Renderer`
         A component for rendering the environment.
     kwargs : keyword arguments
-        Additional keyword arguments needed to create the environment.
+        Additional keyword arguments needed to create the environment. In live
+        mode, a `scheduler` can be given to decide when the bars are fetched.
     """
     agent_id: str = None
     episode_id: str = None
@@ -94,11 +96,15 @@ class TradingEnv(gym.Env, TimeIndexed):
             self.ccxt = CCXTExchange(
                 exchange='binance',
                 credentials=credentials,
+                scheduler=kwargs.get('scheduler', None),
             )
         
         with open("./crypto-v2/indicators.txt", "r") as file:
             indicators_list = eval(file.readline())
-        TAlib_Indicator = TAlibIndicator(indicators_list, self._window_size)
+        if IncrementalTAIndicator.supports(indicators_list):
+            TAlib_Indicator = IncrementalTAIndicator(indicators_list, self._window_size)
+        else:
+            TAlib_Indicator = TAlibIndicator(indicators_list, self._window_size)
         self.feature_pipeline = FeaturePipeline(
             steps=[TAlib_Indicator]
         )
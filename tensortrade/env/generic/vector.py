@@ -0,0 +1,501 @@
+# Copyright 2020 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+import os
+import traceback
+import threading
+import multiprocessing as mp
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from tensortrade.env.generic.environment import TradingEnv
+
+
+class VecTradingEnv:
+    """A batch of independent trading environments that are stepped together.
+
+    Every sub-environment has its own portfolio, feed and components, so the
+    environments only share the batch they are stepped in. The observations of
+    the sub-environments are written into a preallocated array of shape
+    `(num_envs, *observation_space.shape)`, and the rewards and done flags are
+    returned as arrays, which lets an agent run inference on the whole batch at
+    once.
+
+    A sub-environment that finishes an episode is reset automatically. The
+    observation it finished with is kept in its info under
+    `terminal_observation` and the first observation of its new episode is
+    returned in its place.
+
+    Parameters
+    ----------
+    env_fns : `List[Callable[[], TradingEnv]]`
+        The functions creating each of the sub-environments. Each function must
+        create a new environment with its own portfolio and feed.
+    copy : bool, default True
+        Whether to return a copy of the batch of observations. If False, the
+        same array is returned by every call and overwritten by the next one.
+
+    Attributes
+    ----------
+    envs : `List[TradingEnv]`
+        The sub-environments.
+    num_envs : int
+        The number of sub-environments.
+    observation_space : `Space`
+        The observation space of a single sub-environment.
+    action_space : `Space`
+        The action space of a single sub-environment.
+    """
+
+    def __init__(self,
+                 env_fns: 'List[Callable[[], TradingEnv]]',
+                 copy: bool = True) -> None:
+        if len(env_fns) == 0:
+            raise ValueError("At least one environment is needed.")
+
+        self.envs = [fn() for fn in env_fns]
+        self.num_envs = len(self.envs)
+        self.copy = copy
+
+        for env in self.envs:
+            if not env._t_signal:
+                raise ValueError("Only environments stepping on the data feed can be vectorized.")
+
+        self.observation_space = self.envs[0].observation_space
+        self.action_space = self.envs[0].action_space
+
+        self.observations = np.zeros(
+            (self.num_envs,) + self.observation_space.shape,
+            dtype=self.observation_space.dtype
+        )
+        self.rewards = np.zeros(self.num_envs, dtype=np.float64)
+        self.dones = np.zeros(self.num_envs, dtype=bool)
+
+    def _batch(self) -> 'np.ndarray':
+        return self.observations.copy() if self.copy else self.observations
+
+    def reset(self) -> 'np.ndarray':
+        """Resets all the sub-environments.
+
+        Returns
+        -------
+        `np.ndarray`
+            The first observations of the sub-environments.
+        """
+        for i, env in enumerate(self.envs):
+            self.observations[i] = env.reset()
+        return self._batch()
+
+    def step(self, actions: 'Sequence[Any]') -> 'Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]':
+        """Makes one step through each of the sub-environments.
+
+        Parameters
+        ----------
+        actions : `Sequence[Any]`
+            The action to perform on each of the sub-environments.
+
+        Returns
+        -------
+        `np.ndarray`
+            The observations of the sub-environments after the actions being
+            performed.
+        `np.ndarray`
+            The computed rewards of the sub-environments.
+        `np.ndarray`
+            Whether or not the episodes of the sub-environments are complete.
+        `List[dict]`
+            The information gathered by the sub-environments.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(
+                "Expected {} actions, received {}.".format(self.num_envs, len(actions))
+            )
+
+        infos = []
+        for i, env in enumerate(self.envs):
+            obs, reward, done, info = env.step(actions[i])
+            if done:
+                info["terminal_observation"] = obs
+                obs = env.reset()
+            self.observations[i] = obs
+            self.rewards[i] = reward
+            self.dones[i] = done
+            infos += [info]
+
+        return self._batch(), self.rewards.copy(), self.dones.copy(), infos
+
+    def render(self, index: int = 0, **kwargs) -> None:
+        """Renders one of the sub-environments.
+
+        Parameters
+        ----------
+        index : int, default 0
+            The index of the sub-environment to render.
+        """
+        self.envs[index].render(**kwargs)
+
+    def close(self) -> None:
+        """Closes all the sub-environments."""
+        for env in self.envs:
+            env.close()
+
+
+_RESET = 0
+_STEP = 1
+_CLOSE = 2
+
+
+def _attach(buffers: 'Dict[str, Tuple[SharedMemory, tuple, str]]') -> 'Dict[str, np.ndarray]':
+    return {
+        name: np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        for name, (shm, shape, dtype) in buffers.items()
+    }
+
+
+def _worker(remote: 'mp.connection.Connection',
+            parent_remote: 'mp.connection.Connection',
+            env_fns: 'List[Callable[[], TradingEnv]]',
+            indices: 'List[int]',
+            barrier: 'mp.synchronize.Barrier') -> None:
+    """Runs sub-environments of a `SubprocVecTradingEnv` in a worker process.
+
+    The worker waits on the barrier for the parent to post a command, runs it on
+    its sub-environments reading the actions from and writing the results to
+    the shared arrays, then sends back the infos of its sub-environments, or
+    the traceback of the error it failed with. It exits when the parent breaks
+    the barrier.
+    """
+    parent_remote.close()
+
+    try:
+        envs = [fn() for fn in env_fns]
+    except BaseException:
+        remote.send(("error", traceback.format_exc()))
+        return
+
+    remote.send(("spaces", (envs[0].observation_space, envs[0].action_space)))
+    buffers = remote.recv()
+    if buffers is None:
+        return
+
+    arrays = _attach(buffers)
+    command, actions = arrays["command"], arrays["actions"]
+    observations, terminal = arrays["observations"], arrays["terminal"]
+    rewards, dones = arrays["rewards"], arrays["dones"]
+    scalar = actions.ndim == 1
+
+    running = True
+    while running:
+        # The parent may take any time to post the next command, so the wait
+        # is not timed; the barrier is broken when the wait of the parent
+        # times out.
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            break
+
+        try:
+            if command[0] == _STEP:
+                infos = []
+                for i, env in zip(indices, envs):
+                    action = actions[i].item() if scalar else actions[i].copy()
+                    obs, reward, done, info = env.step(action)
+                    if done:
+                        terminal[i] = obs
+                        obs = env.reset()
+                    observations[i] = obs
+                    rewards[i] = reward
+                    dones[i] = done
+                    infos += [info]
+                result = ("ok", infos)
+            elif command[0] == _RESET:
+                for i, env in zip(indices, envs):
+                    observations[i] = env.reset()
+                result = ("ok", None)
+            else:
+                for env in envs:
+                    env.close()
+                result = ("ok", None)
+                running = False
+        except BaseException:
+            result = ("error", traceback.format_exc())
+
+        remote.send(result)
+
+    del arrays, command, actions, observations, terminal, rewards, dones
+    for shm, _, _ in buffers.values():
+        shm.close()
+    remote.close()
+
+
+class SubprocVecTradingEnv:
+    """A batch of trading environments that are stepped in worker processes.
+
+    The sub-environments are split between the worker processes, which create
+    and own them. The actions, observations, rewards and done flags are kept in
+    `multiprocessing.shared_memory` arrays, so a step only releases the workers
+    through a barrier and waits for them to finish; the observations are never
+    sent through a pipe. Only the infos of the sub-environments, which are
+    small, are sent back to the parent.
+
+    Apart from running in parallel it behaves like `VecTradingEnv`, including
+    the automatic reset of finished sub-environments.
+
+    Parameters
+    ----------
+    env_fns : `List[Callable[[], TradingEnv]]`
+        The functions creating each of the sub-environments. They are called in
+        the worker processes, so they must be picklable if the start method is
+        not `fork`.
+    num_workers : int, optional
+        The number of worker processes. Defaults to the number of
+        sub-environments, capped to the number of CPUs.
+    copy : bool, default True
+        Whether to return a copy of the batch of observations. If False, the
+        shared array is returned by every call and overwritten by the next one.
+    start_method : str, optional
+        The start method of the worker processes. Defaults to the start method
+        of `multiprocessing`.
+    timeout : float, default 60
+        The number of seconds to wait for the workers to take a command and to
+        finish it. If a worker dies or does not answer in time, the workers are
+        stopped and an exception with the traceback of the failed worker, if
+        any, is raised instead of waiting forever.
+
+    Attributes
+    ----------
+    num_envs : int
+        The number of sub-environments.
+    observation_space : `Space`
+        The observation space of a single sub-environment.
+    action_space : `Space`
+        The action space of a single sub-environment.
+    """
+
+    def __init__(self,
+                 env_fns: 'List[Callable[[], TradingEnv]]',
+                 num_workers: int = None,
+                 copy: bool = True,
+                 start_method: str = None,
+                 timeout: float = 60) -> None:
+        # Shared memory needs Python 3.8, so it is only imported when a batch
+        # of worker processes is created.
+        from multiprocessing import resource_tracker
+        from multiprocessing.shared_memory import SharedMemory
+
+        if len(env_fns) == 0:
+            raise ValueError("At least one environment is needed.")
+
+        self.num_envs = len(env_fns)
+        self.copy = copy
+        self.timeout = timeout
+        self.closed = False
+
+        num_workers = num_workers or min(self.num_envs, os.cpu_count() or 1)
+        num_workers = min(num_workers, self.num_envs)
+        chunks = [c.tolist() for c in np.array_split(np.arange(self.num_envs), num_workers)]
+
+        # The workers must share the resource tracker of the parent, otherwise
+        # each of them tracks the shared arrays on its own and unlinks them
+        # when it exits.
+        resource_tracker.ensure_running()
+
+        ctx = mp.get_context(start_method)
+        self._barrier = ctx.Barrier(num_workers + 1)
+        self._remotes = []
+        self._processes = []
+        self._buffers = {}
+
+        for indices in chunks:
+            remote, worker_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_worker,
+                args=(worker_remote, remote, [env_fns[i] for i in indices], indices, self._barrier),
+                daemon=True
+            )
+            process.start()
+            worker_remote.close()
+            self._remotes += [remote]
+            self._processes += [process]
+
+        spaces = self._receive("Failed to create the environments")
+
+        self.observation_space, self.action_space = spaces[0][1]
+
+        obs_shape = (self.num_envs,) + self.observation_space.shape
+        shapes = {
+            "command": ((1,), np.int64),
+            "actions": ((self.num_envs,) + self.action_space.shape, self.action_space.dtype),
+            "observations": (obs_shape, self.observation_space.dtype),
+            "terminal": (obs_shape, self.observation_space.dtype),
+            "rewards": ((self.num_envs,), np.float64),
+            "dones": ((self.num_envs,), bool)
+        }
+        for name, (shape, dtype) in shapes.items():
+            dtype = np.dtype(dtype)
+            size = max(1, int(np.prod(shape)) * dtype.itemsize)
+            self._buffers[name] = (SharedMemory(create=True, size=size), shape, dtype.str)
+
+        for remote in self._remotes:
+            remote.send(self._buffers)
+
+        arrays = _attach(self._buffers)
+        self._command = arrays["command"]
+        self._actions = arrays["actions"]
+        self.observations = arrays["observations"]
+        self._terminal = arrays["terminal"]
+        self._rewards = arrays["rewards"]
+        self._dones = arrays["dones"]
+
+    def _fail(self, message: str, errors: 'List[str]') -> None:
+        # Collects the tracebacks already sent by the other workers and the exit
+        # codes of the dead ones before stopping them all. The barrier is not
+        # aborted, since waking a worker that died waiting on it blocks forever,
+        # so the workers still waiting on it are terminated instead.
+        for remote in self._remotes:
+            try:
+                while remote.poll():
+                    status, payload = remote.recv()
+                    if status == "error":
+                        errors += [payload]
+            except (EOFError, OSError):
+                pass
+
+        for i, process in enumerate(self._processes):
+            if not process.is_alive():
+                errors += ["Worker {} exited with code {}.".format(i, process.exitcode)]
+
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+        self._terminate()
+        raise Exception(message + ":\n" + "\n".join(errors))
+
+    def _receive(self, message: str) -> 'List[tuple]':
+        results = []
+        for i, remote in enumerate(self._remotes):
+            try:
+                if not remote.poll(self.timeout):
+                    self._fail(message, ["Worker {} timed out.".format(i)])
+                results += [remote.recv()]
+            except (EOFError, OSError):
+                self._fail(message, [])
+
+        errors = [payload for status, payload in results if status == "error"]
+        if errors:
+            self._fail(message, errors)
+        return results
+
+    def _run(self, command: int) -> 'List[dict]':
+        message = "An environment failed in a worker process"
+        if not all(process.is_alive() for process in self._processes):
+            self._fail(message, [])
+
+        self._command[0] = command
+        try:
+            self._barrier.wait(self.timeout)
+        except threading.BrokenBarrierError:
+            self._fail(message, [])
+
+        results = self._receive(message)
+
+        infos = []
+        for _, payload in results:
+            infos += payload or []
+        return infos
+
+    def _batch(self) -> 'np.ndarray':
+        return self.observations.copy() if self.copy else self.observations
+
+    def reset(self) -> 'np.ndarray':
+        """Resets all the sub-environments.
+
+        Returns
+        -------
+        `np.ndarray`
+            The first observations of the sub-environments.
+        """
+        self._run(_RESET)
+        return self._batch()
+
+    def step(self, actions: 'Sequence[Any]') -> 'Tuple[np.ndarray, np.ndarray, np.ndarray, List[dict]]':
+        """Makes one step through each of the sub-environments.
+
+        Parameters
+        ----------
+        actions : `Sequence[Any]`
+            The action to perform on each of the sub-environments.
+
+        Returns
+        -------
+        `np.ndarray`
+            The observations of the sub-environments after the actions being
+            performed.
+        `np.ndarray`
+            The computed rewards of the sub-environments.
+        `np.ndarray`
+            Whether or not the episodes of the sub-environments are complete.
+        `List[dict]`
+            The information gathered by the sub-environments.
+        """
+        if len(actions) != self.num_envs:
+            raise ValueError(
+                "Expected {} actions, received {}.".format(self.num_envs, len(actions))
+            )
+
+        self._actions[:] = actions
+        infos = self._run(_STEP)
+
+        for i in np.flatnonzero(self._dones):
+            infos[i]["terminal_observation"] = self._terminal[i].copy()
+
+        return self._batch(), self._rewards.copy(), self._dones.copy(), infos
+
+    def _release(self) -> None:
+        for name in ["_command", "_actions", "observations", "_terminal", "_rewards", "_dones"]:
+            if hasattr(self, name):
+                delattr(self, name)
+        for shm, _, _ in self._buffers.values():
+            shm.close()
+            shm.unlink()
+        self._buffers = {}
+
+    def _terminate(self) -> None:
+        for remote in self._remotes:
+            try:
+                remote.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=1)
+            if process.is_alive():
+                process.terminate()
+        for remote in self._remotes:
+            remote.close()
+        self._release()
+        self.closed = True
+
+    def close(self) -> None:
+        """Closes all the sub-environments and stops the worker processes."""
+        if self.closed:
+            return
+
+        self._run(_CLOSE)
+        for process in self._processes:
+            process.join()
+        for remote in self._remotes:
+            remote.close()
+
+        self._release()
+        self.closed = True
@@ -1,4 +1,6 @@
 import importlib
 
+from .incremental import IncrementalTAIndicator
+
 if importlib.util.find_spec("talib") is not None:
     from .talib_indicator import TAlibIndicator
@@ -0,0 +1,547 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import math
+
+from collections import deque
+from typing import List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from tensortrade.features import FeatureTransformer
+
+
+nan = float("nan")
+
+
+def _is_zero(value: float) -> bool:
+    return -1e-8 < value < 1e-8
+
+
+class IncrementalIndicator:
+    """A technical indicator that is updated one bar at a time.
+
+    The indicators keep the state they need to compute their next value from
+    the previous one, so updating them with a new bar takes constant time. They
+    follow the computations of TA-Lib, in the same order, so they give the same
+    values as the TA-Lib function of the same name over the whole history,
+    including `nan` over the warm-up period.
+    """
+
+    outputs = 1
+
+    def update(self, *values: float) -> 'Union[float, Tuple[float, ...]]':
+        """Updates the indicator with the values of a new bar.
+
+        Parameters
+        ----------
+        *values : float
+            The values of the bar, in the order of the arguments of the TA-Lib
+            function.
+
+        Returns
+        -------
+        `Union[float, Tuple[float, ...]]`
+            The value of the indicator for the bar, or a tuple of values if the
+            indicator has several outputs.
+        """
+        raise NotImplementedError()
+
+    def reset(self) -> None:
+        """Resets the indicator to its state before the first bar."""
+        raise NotImplementedError()
+
+
+class SMA(IncrementalIndicator):
+    """Simple moving average.
+
+    Parameters
+    ----------
+    timeperiod : int, default 30
+        The number of bars to average over.
+    """
+
+    def __init__(self, timeperiod: int = 30) -> None:
+        self.timeperiod = timeperiod
+        self.reset()
+
+    def update(self, value: float) -> float:
+        self.history.append(value)
+        self.total += value
+        if len(self.history) < self.timeperiod:
+            return nan
+
+        average = self.total / self.timeperiod
+        self.total -= self.history.popleft()
+        return average
+
+    def reset(self) -> None:
+        self.history = deque()
+        self.total = 0.0
+
+
+class EMA(IncrementalIndicator):
+    """Exponential moving average, seeded with the simple moving average of
+    the first `timeperiod` bars.
+
+    Parameters
+    ----------
+    timeperiod : int, default 30
+        The period of the average, giving a smoothing factor of
+        `2 / (timeperiod + 1)`.
+    """
+
+    def __init__(self, timeperiod: int = 30) -> None:
+        self.timeperiod = timeperiod
+        self.k = 2.0 / (timeperiod + 1)
+        self.reset()
+
+    def update(self, value: float) -> float:
+        if self.count < self.timeperiod:
+            self.total += value
+            self.count += 1
+            if self.count < self.timeperiod:
+                return nan
+            self.value = self.total / self.timeperiod
+            return self.value
+
+        self.value = ((value - self.value) * self.k) + self.value
+        return self.value
+
+    def reset(self) -> None:
+        self.total = 0.0
+        self.count = 0
+        self.value = nan
+
+
+_MA_TYPES = {0: SMA, 1: EMA}
+
+
+def _moving_average(timeperiod: int, matype: int) -> 'IncrementalIndicator':
+    if matype not in _MA_TYPES:
+        raise ValueError("Unsupported moving average type: {}.".format(matype))
+    return _MA_TYPES[matype](timeperiod)
+
+
+class RSI(IncrementalIndicator):
+    """Relative strength index, with Wilder's smoothing of gains and losses.
+
+    Parameters
+    ----------
+    timeperiod : int, default 14
+        The smoothing period.
+    """
+
+    def __init__(self, timeperiod: int = 14) -> None:
+        self.timeperiod = timeperiod
+        self.reset()
+
+    def update(self, value: float) -> float:
+        if self.previous is None:
+            self.previous = value
+            return nan
+
+        change = value - self.previous
+        self.previous = value
+
+        if self.count < self.timeperiod:
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.count += 1
+            if self.count < self.timeperiod:
+                return nan
+            self.loss /= self.timeperiod
+            self.gain /= self.timeperiod
+        else:
+            self.loss *= self.timeperiod - 1
+            self.gain *= self.timeperiod - 1
+            if change < 0:
+                self.loss -= change
+            else:
+                self.gain += change
+            self.loss /= self.timeperiod
+            self.gain /= self.timeperiod
+
+        total = self.gain + self.loss
+        return 100 * (self.gain / total) if not _is_zero(total) else 0.0
+
+    def reset(self) -> None:
+        self.previous = None
+        self.gain = 0.0
+        self.loss = 0.0
+        self.count = 0
+
+
+class MACD(IncrementalIndicator):
+    """Moving average convergence/divergence.
+
+    Both exponential moving averages start at the bar where the slow one has
+    enough history, as they do in TA-Lib.
+
+    Parameters
+    ----------
+    fastperiod : int, default 12
+        The period of the fast moving average.
+    slowperiod : int, default 26
+        The period of the slow moving average.
+    signalperiod : int, default 9
+        The period of the moving average of the signal line.
+    """
+
+    outputs = 3
+
+    def __init__(self,
+                 fastperiod: int = 12,
+                 slowperiod: int = 26,
+                 signalperiod: int = 9) -> None:
+        if slowperiod < fastperiod:
+            fastperiod, slowperiod = slowperiod, fastperiod
+        self.fastperiod = fastperiod
+        self.slowperiod = slowperiod
+        self.signalperiod = signalperiod
+        self.reset()
+
+    def update(self, value: float) -> 'Tuple[float, float, float]':
+        if self.history is not None:
+            self.history.append(value)
+            if len(self.history) < self.slowperiod:
+                return nan, nan, nan
+
+            for v in list(self.history)[-self.fastperiod:]:
+                self.fast.update(v)
+            for v in self.history:
+                self.slow.update(v)
+            self.history = None
+        else:
+            self.fast.update(value)
+            self.slow.update(value)
+
+        macd = self.fast.value - self.slow.value
+        signal = self.signal.update(macd)
+        if math.isnan(signal):
+            return nan, nan, nan
+        return macd, signal, macd - signal
+
+    def reset(self) -> None:
+        self.history = deque(maxlen=self.slowperiod)
+        self.fast = EMA(self.fastperiod)
+        self.slow = EMA(self.slowperiod)
+        self.signal = EMA(self.signalperiod)
+
+
+class BBANDS(IncrementalIndicator):
+    """Bollinger bands.
+
+    Parameters
+    ----------
+    timeperiod : int, default 5
+        The number of bars of the moving average and the standard deviation.
+    nbdevup : float, default 2
+        The number of standard deviations of the upper band.
+    nbdevdn : float, default 2
+        The number of standard deviations of the lower band.
+    matype : int, default 0
+        The type of the moving average, 0 for simple and 1 for exponential.
+    """
+
+    outputs = 3
+
+    def __init__(self,
+                 timeperiod: int = 5,
+                 nbdevup: float = 2,
+                 nbdevdn: float = 2,
+                 matype: int = 0) -> None:
+        self.timeperiod = timeperiod
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self.matype = matype
+        _moving_average(timeperiod, matype)
+        self.reset()
+
+    def update(self, value: float) -> 'Tuple[float, float, float]':
+        middle = self.average.update(value)
+
+        self.history.append(value)
+        self.total += value
+        self.squares += value * value
+        if len(self.history) < self.timeperiod:
+            return nan, nan, nan
+
+        if self.matype == 0:
+            variance = self.squares / self.timeperiod - middle * middle
+        else:
+            mean = self.total / self.timeperiod
+            variance = self.squares / self.timeperiod - mean * mean
+
+        first = self.history.popleft()
+        self.total -= first
+        self.squares -= first * first
+
+        deviation = math.sqrt(variance) if not variance < 1e-8 else 0.0
+        return middle + deviation * self.nbdevup, middle, middle - deviation * self.nbdevdn
+
+    def reset(self) -> None:
+        self.average = _moving_average(self.timeperiod, self.matype)
+        self.history = deque()
+        self.total = 0.0
+        self.squares = 0.0
+
+
+class STOCH(IncrementalIndicator):
+    """Stochastic oscillator.
+
+    Parameters
+    ----------
+    fastk_period : int, default 5
+        The number of bars of the highest high and the lowest low.
+    slowk_period : int, default 3
+        The period of the moving average of the fast %K.
+    slowk_matype : int, default 0
+        The type of the moving average of the fast %K.
+    slowd_period : int, default 3
+        The period of the moving average of the slow %K.
+    slowd_matype : int, default 0
+        The type of the moving average of the slow %K.
+    """
+
+    outputs = 2
+
+    def __init__(self,
+                 fastk_period: int = 5,
+                 slowk_period: int = 3,
+                 slowk_matype: int = 0,
+                 slowd_period: int = 3,
+                 slowd_matype: int = 0) -> None:
+        self.fastk_period = fastk_period
+        self.slowk_period = slowk_period
+        self.slowk_matype = slowk_matype
+        self.slowd_period = slowd_period
+        self.slowd_matype = slowd_matype
+        self.reset()
+
+    def update(self, high: float, low: float, close: float) -> 'Tuple[float, float]':
+        self.highs.append(high)
+        self.lows.append(low)
+        if len(self.highs) < self.fastk_period:
+            return nan, nan
+
+        lowest = min(self.lows)
+        diff = (max(self.highs) - lowest) / 100.0
+        fastk = (close - lowest) / diff if diff != 0.0 else 0.0
+
+        slowk = self.slowk.update(fastk)
+        if math.isnan(slowk):
+            return nan, nan
+
+        slowd = self.slowd.update(slowk)
+        if math.isnan(slowd):
+            return nan, nan
+        return slowk, slowd
+
+    def reset(self) -> None:
+        self.highs = deque(maxlen=self.fastk_period)
+        self.lows = deque(maxlen=self.fastk_period)
+        self.slowk = _moving_average(self.slowk_period, self.slowk_matype)
+        self.slowd = _moving_average(self.slowd_period, self.slowd_matype)
+
+
+class ATR(IncrementalIndicator):
+    """Average true range, with Wilder's smoothing.
+
+    Parameters
+    ----------
+    timeperiod : int, default 14
+        The smoothing period.
+    """
+
+    def __init__(self, timeperiod: int = 14) -> None:
+        self.timeperiod = timeperiod
+        self.reset()
+
+    def update(self, high: float, low: float, close: float) -> float:
+        previous, self.close = self.close, close
+        if previous is None:
+            return nan
+
+        true_range = max(high - low, abs(previous - high), abs(previous - low))
+        if self.timeperiod <= 1:
+            return true_range
+
+        if self.count < self.timeperiod:
+            self.total += true_range
+            self.count += 1
+            if self.count < self.timeperiod:
+                return nan
+            self.value = self.total / self.timeperiod
+            return self.value
+
+        self.value *= self.timeperiod - 1
+        self.value += true_range
+        self.value /= self.timeperiod
+        return self.value
+
+    def reset(self) -> None:
+        self.close = None
+        self.total = 0.0
+        self.count = 0
+        self.value = nan
+
+
+_INDICATORS = {
+    "SMA": SMA,
+    "EMA": EMA,
+    "RSI": RSI,
+    "MACD": MACD,
+    "BBANDS": BBANDS,
+    "STOCH": STOCH,
+    "ATR": ATR
+}
+
+_COLUMNS = {
+    "MACD": ["macd", "macd_signal", "macd_hist"],
+    "BBANDS": ["bb_upper", "bb_middle", "bb_lower"],
+    "STOCH": ["slowk", "slowd"]
+}
+
+
+class IncrementalTAIndicator(FeatureTransformer):
+    """Adds one or more technical indicators to a data frame of bars, updating
+    them only with the bars they have not seen yet.
+
+    It is a drop-in replacement of `TAlibIndicator` for the indicators it
+    implements (SMA, EMA, RSI, MACD, BBANDS, STOCH and ATR): it takes the same
+    configuration and produces the same columns and values. Instead of
+    recomputing every indicator over the whole history of bars on each call,
+    it keeps the state of the indicators and the last `window_size` rows of
+    their values, so a call only costs the bars appended since the previous
+    one.
+
+    The data frame passed in must only ever grow with new bars, identified by
+    their `date`, until the transformer is reset.
+
+    Parameters
+    ----------
+    indicators : `List`
+        The indicators to compute, each given as a name and a dictionary with
+        the columns passed as `args` and the keyword arguments as `params`.
+        A name may have a suffix after a `-` to configure the same indicator
+        several times. The columns of an indicator with several outputs, such
+        as `macd`, `macd_signal` and `macd_hist`, are then suffixed the same
+        way, e.g. `macd-fast` for `MACD-FAST`.
+    window_size : int
+        The number of last rows to return.
+    """
+
+    def __init__(self,
+                 indicators: List,
+                 window_size: int,
+                 **kwargs) -> None:
+        self._indicator_names = [
+            indicator[0].upper() for indicator in indicators
+        ]
+        self._indicator_args = {indicator[0]: indicator[1]['args'] for indicator in indicators}
+        self._indicator_params = {indicator[0]: indicator[1]['params'] for indicator in indicators}
+
+        self._indicators = []
+        self._columns = []
+        for name in self._indicator_names:
+            kind = name.split('-')[0]
+            if kind not in _INDICATORS:
+                raise ValueError("Unsupported incremental indicator: {}.".format(name))
+            self._indicators += [_INDICATORS[kind](**self._indicator_params[name])]
+            suffix = name[len(kind):].lower()
+            self._columns += [c + suffix for c in _COLUMNS.get(kind, [])] or [name]
+
+        self._window_size = window_size
+        self.reset()
+
+    @staticmethod
+    def supports(indicators: List) -> bool:
+        """Checks if all the configured indicators can be computed incrementally.
+
+        Parameters
+        ----------
+        indicators : `List`
+            The indicators, configured as for `TAlibIndicator`.
+
+        Returns
+        -------
+        bool
+            Whether all the indicators are supported.
+        """
+        try:
+            IncrementalTAIndicator(indicators, 1)
+        except (ValueError, TypeError):
+            return False
+        return True
+
+    def reset(self) -> None:
+        for indicator in self._indicators:
+            indicator.reset()
+        self._rows = deque(maxlen=self._window_size)
+        self._last_date = None
+
+    def update(self, bar: dict) -> 'List[float]':
+        """Updates the indicators with a new bar.
+
+        Parameters
+        ----------
+        bar : dict
+            The values of the bar by column.
+
+        Returns
+        -------
+        `List[float]`
+            The values of the indicator columns for the bar.
+        """
+        row = []
+        for name, indicator in zip(self._indicator_names, self._indicators):
+            value = indicator.update(*[bar[arg] for arg in self._indicator_args[name]])
+            if indicator.outputs == 1:
+                row += [value]
+            else:
+                row += list(value)
+        self._rows.append(row)
+        return row
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame:
+        columns = ['date', 'open', 'high', 'low', 'close', 'volume']
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X, columns=columns)
+
+        # The new bars are at the end of the frame, so only they are visited.
+        dates = X['date'].to_numpy()
+        start = len(dates)
+        if self._last_date is None:
+            start = 0
+        else:
+            while start > 0 and dates[start - 1] > self._last_date:
+                start -= 1
+
+        if start < len(dates):
+            new = X.iloc[start:]
+            bars = {c: new[c].to_numpy(dtype=np.float64) for c in columns[1:]}
+            for i in range(len(new)):
+                self.update({c: values[i] for c, values in bars.items()})
+            self._last_date = dates[-1]
+
+        X = X.iloc[-self._window_size:]
+        values = np.array(list(self._rows)[-len(X):], dtype=np.float64).reshape(len(X), len(self._columns))
+
+        data = {c: X[c].to_numpy() for c in columns}
+        for j, column in enumerate(self._columns):
+            data[column] = values[:, j]
+        return pd.DataFrame(data, index=X.index)
@@ -1,3 +1,4 @@
+from typing import List
 
 import numpy as np
 
@@ -27,6 +28,13 @@ class CumSum(Stream[float]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0].astype(float)
+        missing = np.isnan(array)
+        c_sum = np.cumsum(np.where(missing, 0, array))
+        c_sum[missing] = np.nan
+        return c_sum
+
 
 class CumProd(Stream[float]):
     """A stream operator that creates a cumulative product of values.
@@ -50,6 +58,13 @@ class CumProd(Stream[float]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0].astype(float)
+        missing = np.isnan(array)
+        c_prod = np.cumprod(np.where(missing, 1, array))
+        c_prod[missing] = np.nan
+        return c_prod
+
 
 class CumMin(Stream[float]):
     """A stream operator that creates a cumulative minimum of values.
@@ -88,6 +103,15 @@ class CumMin(Stream[float]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0].astype(float)
+        if not self.skip_na:
+            return np.minimum.accumulate(array)
+        missing = np.isnan(array)
+        c_min = np.minimum.accumulate(np.where(missing, np.inf, array))
+        c_min[missing] = np.nan
+        return c_min
+
 
 class CumMax(Stream[float]):
     """A stream operator that creates a cumulative maximum of values.
@@ -126,6 +150,15 @@ class CumMax(Stream[float]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0].astype(float)
+        if not self.skip_na:
+            return np.maximum.accumulate(array)
+        missing = np.isnan(array)
+        c_max = np.maximum.accumulate(np.where(missing, -np.inf, array))
+        c_max[missing] = np.nan
+        return c_max
+
 
 @Float.register(["cumsum"])
 def cumsum(s: "Stream[float]") -> "Stream[float]":
@@ -297,6 +297,8 @@ class EWM(Stream[List[float]]):
     .. [1] https://github.com/pandas-dev/pandas/blob/d9fff2792bf16178d4e450fe7384244e50635733/pandas/core/window/ewm.py#L65
     """
 
+    windowed = True
+
     def __init__(
             self,
             com: float = None,
@@ -354,6 +356,9 @@ class EWM(Stream[List[float]]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return inputs[0].astype(float)
+
     def mean(self) -> "Stream[float]":
         """Computes the exponential weighted moving average.
 
@@ -33,6 +33,34 @@ class ExpandingNode(Stream[float]):
     def has_next(self):
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        expanding = self.inputs[0]
+        observed = ~np.isnan(inputs[0])
+
+        # The aggregation only changes when a new value joins the history.
+        counts = np.cumsum(observed)
+        output = self._accumulate(inputs[0][observed])[counts]
+        output[counts < expanding.min_periods] = np.nan
+        return output
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        """Computes the aggregation of every prefix of the history.
+
+        Parameters
+        ----------
+        history : `np.ndarray`
+            The non-missing values of the underlying stream.
+
+        Returns
+        -------
+        `np.ndarray`
+            The aggregation of the first `k` values of the history at index `k`.
+        """
+        results = np.full(len(history) + 1, np.nan)
+        for k in range(max(self.inputs[0].min_periods, 0), len(history) + 1):
+            results[k] = self.func(list(history[:k]))
+        return results
+
 
 class ExpandingCount(ExpandingNode):
     """A stream operator that counts the number of non-missing values."""
@@ -41,35 +69,193 @@ class ExpandingCount(ExpandingNode):
         super().__init__(lambda w: (~np.isnan(w)).sum())
 
     def forward(self) -> float:
-        return self.func(self.inputs[0].value)
+        return self.inputs[0].observed
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return np.cumsum(~np.isnan(inputs[0])).astype(float)
+
+
+class ExpandingSum(ExpandingNode):
+    """A stream operator that keeps a running sum of the history of a stream."""
+
+    def __init__(self) -> None:
+        super().__init__(np.sum)
+        self.total = 0.0
+
+    def forward(self) -> float:
+        expanding = self.inputs[0]
+        if expanding.entered is not None:
+            self.total += expanding.entered
+        if expanding.observed < expanding.min_periods:
+            return np.nan
+        return self.total
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        return np.concatenate([[0.0], np.cumsum(history)])
+
+    def reset(self) -> None:
+        self.total = 0.0
+        super().reset()
+
+
+class ExpandingMean(ExpandingSum):
+    """A stream operator that computes the mean of the history of a stream
+    from a running sum."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.func = np.mean
+
+    def forward(self) -> float:
+        total = super().forward()
+        if total != total or self.inputs[0].observed == 0:
+            return np.nan
+        return total / self.inputs[0].observed
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        return np.concatenate([[np.nan], np.cumsum(history) / np.arange(1, len(history) + 1)])
+
+
+class ExpandingVar(ExpandingNode):
+    """A stream operator that computes the sample variance of the history of a
+    stream with Welford's online algorithm."""
+
+    def __init__(self) -> None:
+        super().__init__(lambda x: np.var(x, ddof=1))
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def forward(self) -> float:
+        expanding = self.inputs[0]
+        if expanding.entered is not None:
+            delta = expanding.entered - self.mean
+            self.mean += delta / expanding.observed
+            self.m2 += delta * (expanding.entered - self.mean)
+        if expanding.observed < max(expanding.min_periods, 2):
+            return np.nan
+        return self.m2 / (expanding.observed - 1)
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        results = np.full(len(history) + 1, np.nan)
+        mean, m2 = 0.0, 0.0
+        for k, value in enumerate(history, start=1):
+            delta = value - mean
+            mean += delta / k
+            m2 += delta * (value - mean)
+            if k > 1:
+                results[k] = m2 / (k - 1)
+        return results
+
+    def reset(self) -> None:
+        self.mean = 0.0
+        self.m2 = 0.0
+        super().reset()
+
+
+class ExpandingStd(ExpandingVar):
+    """A stream operator that computes the sample standard deviation of the
+    history of a stream with Welford's online algorithm."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.func = lambda x: np.std(x, ddof=1)
+
+    def forward(self) -> float:
+        return np.sqrt(super().forward())
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        return np.sqrt(super()._accumulate(history))
+
+
+class ExpandingMin(ExpandingNode):
+    """A stream operator that keeps a running minimum of the history of a
+    stream."""
+
+    def __init__(self) -> None:
+        super().__init__(np.min)
+        self.ufunc = np.minimum
+        self.extremum = np.nan
+
+    def forward(self) -> float:
+        expanding = self.inputs[0]
+        if expanding.entered is not None:
+            if self.extremum != self.extremum:
+                self.extremum = expanding.entered
+            else:
+                self.extremum = self.ufunc(self.extremum, expanding.entered)
+        if expanding.observed < expanding.min_periods:
+            return np.nan
+        return self.extremum
+
+    def _accumulate(self, history: "np.ndarray") -> "np.ndarray":
+        return np.concatenate([[np.nan], self.ufunc.accumulate(history)])
+
+    def reset(self) -> None:
+        self.extremum = np.nan
+        super().reset()
+
+
+class ExpandingMax(ExpandingMin):
+    """A stream operator that keeps a running maximum of the history of a
+    stream."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.func = np.max
+        self.ufunc = np.maximum
 
 
 class Expanding(Stream[List[float]]):
     """A stream that generates the entire history of a stream at each time step.
 
+    Only the number of non-missing values seen so far and the last one of them
+    are tracked by default, which is all the online aggregations need. The
+    history itself is only kept once an aggregation that needs it (e.g.
+    `median` or `agg`) is created, otherwise the stream generates `None`.
+
     Parameters
     ----------
     min_periods : int, default 1
         The number of periods to wait before producing values from the aggregation
         function.
+
+    Attributes
+    ----------
+    observed : int
+        The number of non-missing values seen so far.
+    entered : float, optional
+        The value that joined the history at the last step, if any.
+    keep_history : bool
+        Whether the history of the stream is kept.
     """
 
     generic_name = "expanding"
+    windowed = True
 
     def __init__(self, min_periods: int = 1) -> None:
         super().__init__()
         self.min_periods = min_periods
+        self.keep_history = False
         self.history = []
+        self.observed = 0
+        self.entered = None
 
     def forward(self) -> "List[float]":
         v = self.inputs[0].value
+        self.entered = None
         if not np.isnan(v):
-            self.history += [v]
-        return self.history
+            self.entered = v
+            self.observed += 1
+            if self.keep_history:
+                self.history += [v]
+        return self.history if self.keep_history else None
 
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return inputs[0].astype(float)
+
     def agg(self, func: Callable[[List[float]], float]) -> "Stream[float]":
         """Computes an aggregation of a stream's history.
 
@@ -84,6 +270,7 @@ class Expanding(Stream[List[float]]):
             A stream producing aggregations of the stream history at each time
             step.
         """
+        self.keep_history = True
         return ExpandingNode(func)(self).astype("float")
 
     def count(self) -> "Stream[float]":
@@ -104,7 +291,7 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding sum stream.
         """
-        return self.agg(np.sum).astype("float")
+        return ExpandingSum()(self).astype("float")
 
     def mean(self) -> "Stream[float]":
         """Computes an expanding mean fo the underlying stream.
@@ -114,7 +301,7 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding mean stream.
         """
-        return self.agg(np.mean).astype("float")
+        return ExpandingMean()(self).astype("float")
 
     def var(self) -> "Stream[float]":
         """Computes an expanding variance fo the underlying stream.
@@ -124,7 +311,7 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding variance stream.
         """
-        return self.agg(lambda x: np.var(x, ddof=1)).astype("float")
+        return ExpandingVar()(self).astype("float")
 
     def median(self) -> "Stream[float]":
         """Computes an expanding median fo the underlying stream.
@@ -144,7 +331,7 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding standard deviation stream.
         """
-        return self.agg(lambda x: np.std(x, ddof=1)).astype("float")
+        return ExpandingStd()(self).astype("float")
 
     def min(self) -> "Stream[float]":
         """Computes an expanding minimum fo the underlying stream.
@@ -154,7 +341,7 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding minimum stream.
         """
-        return self.agg(np.min).astype("float")
+        return ExpandingMin()(self).astype("float")
 
     def max(self) -> "Stream[float]":
         """Computes an expanding maximum fo the underlying stream.
@@ -164,10 +351,12 @@ class Expanding(Stream[List[float]]):
         `Stream[float]`
             An expanding maximum stream.
         """
-        return self.agg(np.max).astype("float")
+        return ExpandingMax()(self).astype("float")
 
     def reset(self) -> None:
         self.history = []
+        self.observed = 0
+        self.entered = None
         super().reset()
 
 
@@ -2,6 +2,9 @@
 rolling.py contains functions and classes for rolling stream operations.
 """
 
+import bisect
+
+from collections import deque
 from typing import List, Callable
 
 import numpy as np
@@ -16,7 +19,8 @@ class RollingNode(Stream[float]):
     Parameters
     ----------
     func : `Callable[[List[float]], float]`
-        A function that aggregates a rolling window.
+        A function that aggregates a rolling window. The window is given as an
+        array with the most recent value first.
     """
 
     def __init__(self, func: "Callable[[List[float]], float]"):
@@ -35,6 +39,49 @@ class RollingNode(Stream[float]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        # The window is restored by the rolling stream this node reads from.
+        return 0
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        rolling = self.inputs[0]
+        output = self._aggregate(inputs[0], rolling.window)
+
+        observed = np.cumsum(~np.isnan(inputs[0]))
+        output[observed < rolling.min_periods] = np.nan
+        return output
+
+    def _aggregate(self, array: "np.ndarray", window: int) -> "np.ndarray":
+        """Applies the aggregation function to the window ending at every step.
+
+        Parameters
+        ----------
+        array : `np.ndarray`
+            The values of the underlying stream.
+        window : int
+            The size of the rolling window.
+
+        Returns
+        -------
+        `np.ndarray`
+            The aggregation of the window at every step.
+        """
+        size = len(array)
+        output = np.empty(size, dtype=float)
+
+        # Windows are given to the function with the most recent value first.
+        head = min(window - 1, size)
+        for i in range(head):
+            output[i] = self.func(array[i::-1])
+
+        if size >= window:
+            windows = np.lib.stride_tricks.sliding_window_view(array, window)[:, ::-1]
+            try:
+                output[head:] = self.func(windows, axis=1)
+            except TypeError:
+                output[head:] = [self.func(w) for w in windows]
+        return output
+
     def reset(self) -> None:
         self.n = 0
         super().reset()
@@ -49,13 +96,268 @@ class RollingCount(RollingNode):
 
     def forward(self):
         rolling = self.inputs[0]
-        history = rolling.value
-        return self.func(history)
+        return rolling.size - rolling.window_nan
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return self._aggregate(inputs[0], self.inputs[0].window)
+
+
+class RollingSum(RollingNode):
+    """A stream operator that keeps a running sum of the rolling window.
+
+    The sum of the finite values in the window is updated as values enter and
+    leave the window, and it is recomputed from the window once every `window`
+    steps to keep rounding errors from building up.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(np.nansum if skip_na else np.sum)
+        self.skip_na = skip_na
+        self.total = 0.0
+        self.steps = 0
+
+    def update(self, rolling: "Rolling") -> None:
+        """Updates the state of the aggregation with the last step of the window.
+
+        Parameters
+        ----------
+        rolling : `Rolling`
+            The rolling window being aggregated.
+        """
+        self.steps += 1
+        if self.steps % rolling.window == 0:
+            window = rolling.value
+            self.rebuild(window[np.isfinite(window)])
+            return
+
+        if np.isfinite(rolling.entered):
+            self.add(rolling.entered)
+        if rolling.exited is not None and np.isfinite(rolling.exited):
+            self.remove(rolling.exited)
+
+    def add(self, value: float) -> None:
+        self.total += value
+
+    def remove(self, value: float) -> None:
+        self.total -= value
+
+    def rebuild(self, values: "np.ndarray") -> None:
+        self.total = values.sum()
+
+    def aggregate(self, rolling: "Rolling") -> float:
+        """Computes the aggregation of the window from the current state.
+
+        Parameters
+        ----------
+        rolling : `Rolling`
+            The rolling window being aggregated.
+
+        Returns
+        -------
+        float
+            The aggregation of the window.
+        """
+        return self.total
+
+    def forward(self) -> float:
+        rolling = self.inputs[0]
+        self.update(rolling)
+
+        if rolling.n - rolling.nan < rolling.min_periods:
+            return np.nan
+        if rolling.window_inf > 0:
+            return self.func(rolling.value)
+        if not self.skip_na and rolling.window_nan > 0:
+            return np.nan
+        return self.aggregate(rolling)
+
+    def reset(self) -> None:
+        self.total = 0.0
+        self.steps = 0
+        super().reset()
+
+
+class RollingMean(RollingSum):
+    """A stream operator that computes the mean of the rolling window from a
+    running sum.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(skip_na)
+        self.func = np.nanmean if skip_na else np.mean
+
+    def aggregate(self, rolling: "Rolling") -> float:
+        count = rolling.size - rolling.window_nan
+        if count == 0:
+            return np.nan
+        return self.total / count
+
+
+class RollingVar(RollingSum):
+    """A stream operator that computes the sample variance of the rolling
+    window using Welford's algorithm, adding and removing values as they enter
+    and leave the window.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(skip_na)
+        self.func = (lambda x: np.nanvar(x, ddof=1)) if skip_na else (lambda x: np.var(x, ddof=1))
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def remove(self, value: float) -> None:
+        if self.count == 1:
+            self.count, self.mean, self.m2 = 0, 0.0, 0.0
+            return
+        self.count -= 1
+        delta = value - self.mean
+        self.mean -= delta / self.count
+        self.m2 = max(self.m2 - delta * (value - self.mean), 0.0)
+
+    def rebuild(self, values: "np.ndarray") -> None:
+        self.count = len(values)
+        self.mean = values.mean() if self.count > 0 else 0.0
+        self.m2 = ((values - self.mean) ** 2).sum()
+
+    def aggregate(self, rolling: "Rolling") -> float:
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    def reset(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        super().reset()
+
+
+class RollingMin(RollingNode):
+    """A stream operator that computes the minimum of the rolling window with a
+    monotonic queue.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(np.nanmin if skip_na else np.min)
+        self.skip_na = skip_na
+        self.queue = deque()
+
+    def dominates(self, v1: float, v2: float) -> bool:
+        return v1 <= v2
+
+    def forward(self) -> float:
+        rolling = self.inputs[0]
+        value = rolling.entered
+
+        if value == value:
+            while self.queue and self.dominates(value, self.queue[-1][1]):
+                self.queue.pop()
+            self.queue.append((rolling.n, value))
+
+        while self.queue and self.queue[0][0] <= rolling.n - rolling.window:
+            self.queue.popleft()
+
+        if rolling.n - rolling.nan < rolling.min_periods:
+            return np.nan
+        if not self.queue or (not self.skip_na and rolling.window_nan > 0):
+            return np.nan
+        return self.queue[0][1]
+
+    def reset(self) -> None:
+        self.queue = deque()
+        super().reset()
+
+
+class RollingMax(RollingMin):
+    """A stream operator that computes the maximum of the rolling window with a
+    monotonic queue.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(skip_na)
+        self.func = np.nanmax if skip_na else np.max
+
+    def dominates(self, v1: float, v2: float) -> bool:
+        return v1 >= v2
+
+
+class RollingMedian(RollingNode):
+    """A stream operator that computes the median of the rolling window from a
+    sorted copy of the window that is updated as values enter and leave it.
+
+    Parameters
+    ----------
+    skip_na : bool
+        Whether missing values are ignored or make the aggregation missing.
+    """
+
+    def __init__(self, skip_na: bool) -> None:
+        super().__init__(np.nanmedian if skip_na else np.median)
+        self.skip_na = skip_na
+        self.sorted = []
+
+    def forward(self) -> float:
+        rolling = self.inputs[0]
+
+        if rolling.entered == rolling.entered:
+            bisect.insort(self.sorted, rolling.entered)
+        if rolling.exited is not None and rolling.exited == rolling.exited:
+            del self.sorted[bisect.bisect_left(self.sorted, rolling.exited)]
+
+        if rolling.n - rolling.nan < rolling.min_periods:
+            return np.nan
+        if not self.sorted or (not self.skip_na and rolling.window_nan > 0):
+            return np.nan
+
+        mid = len(self.sorted) // 2
+        if len(self.sorted) % 2 == 1:
+            return self.sorted[mid]
+        return (self.sorted[mid - 1] + self.sorted[mid]) / 2
+
+    def reset(self) -> None:
+        self.sorted = []
+        super().reset()
 
 
 class Rolling(Stream[List[float]]):
     """A stream that generates a rolling window of values from a stream.
 
+    The window is kept in a preallocated ring buffer. Every value is written
+    twice, `window` positions apart, so that the current window is always a
+    contiguous slice of the buffer and can be given out without copying. The
+    window is generated with the most recent value first.
+
     Parameters
     ----------
     window : int
@@ -63,9 +365,24 @@ class Rolling(Stream[List[float]]):
     min_periods : int, default 1
         The number of periods to wait before producing values from the aggregation
         function.
+
+    Attributes
+    ----------
+    entered : float
+        The value that entered the window at the last step.
+    exited : float, optional
+        The value that left the window at the last step, if any.
+    size : int
+        The number of values in the window.
+    window_nan : int
+        The number of missing values in the window.
+    window_inf : int
+        The number of infinite values in the window.
     """
 
     generic_name = "rolling"
+    windowed = True
+    cumulative = True
 
     def __init__(self,
                  window: int,
@@ -78,23 +395,60 @@ class Rolling(Stream[List[float]]):
         self.n = 0
         self.nan = 0
 
-        self.history = []
+        self.buffer = np.full(2 * window, np.nan)
+        self.position = 0
+        self.size = 0
+        self.window_nan = 0
+        self.window_inf = 0
 
-    def forward(self) -> "List[float]":
+        self.entered = None
+        self.exited = None
+
+    def forward(self) -> "np.ndarray":
         node = self.inputs[0]
+        value = node.value
 
         self.n += 1
-        self.nan += int(node.value != node.value)
+        self.nan += int(value != value)
+
+        self.exited = self.buffer[self.position] if self.size == self.window else None
+        if self.exited is not None:
+            self.window_nan -= int(self.exited != self.exited)
+            self.window_inf -= int(self.exited in (np.inf, -np.inf))
+        else:
+            self.size += 1
 
-        self.history.insert(0, node.value)
+        self.entered = value
+        self.window_nan += int(value != value)
+        self.window_inf += int(value in (np.inf, -np.inf))
 
-        if len(self.history) > self.window:
-            self.history.pop()
-        return self.history
+        end = self.position + self.window
+        self.buffer[self.position] = value
+        self.buffer[end] = value
+        self.position = (self.position + 1) % self.window
+
+        return self.buffer[end - self.size + 1:end + 1][::-1]
 
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return self.window - 1
+
+    def prefix(self, inputs: "List[np.ndarray]") -> "np.ndarray":
+        # `min_periods` is checked against the values observed since the start,
+        # which the window alone does not give back.
+        observed = np.cumsum(~np.isnan(inputs[0].astype(float)))
+        return np.concatenate([[0], observed])
+
+    def restore(self, prefix: "np.ndarray", start: int) -> None:
+        start = min(start, len(prefix) - 1)
+        self.n = start
+        self.nan = start - int(prefix[start])
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return inputs[0].astype(float)
+
     def agg(self, func: "Callable[[List[float]], float]") -> "Stream[float]":
         """Computes an aggregation of a rolling window of values.
 
@@ -128,8 +482,7 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling sum stream.
         """
-        func = np.nansum if self.min_periods < self.window else np.sum
-        return self.agg(func).astype("float")
+        return RollingSum(self.min_periods < self.window)(self).astype("float")
 
     def mean(self) -> "Stream[float]":
         """Computes a rolling mean from the underlying stream.
@@ -139,8 +492,7 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling mean stream.
         """
-        func = np.nanmean if self.min_periods < self.window else np.mean
-        return self.agg(func).astype("float")
+        return RollingMean(self.min_periods < self.window)(self).astype("float")
 
     def var(self) -> "Stream[float]":
         """Computes a rolling variance from the underlying stream.
@@ -150,10 +502,7 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling variance stream.
         """
-        def func1(x): return np.nanvar(x, ddof=1)
-        def func2(x): return np.var(x, ddof=1)
-        func = func1 if self.min_periods < self.window else func2
-        return self.agg(func).astype("float")
+        return RollingVar(self.min_periods < self.window)(self).astype("float")
 
     def median(self) -> "Stream[float]":
         """Computes a rolling median from the underlying stream.
@@ -163,8 +512,7 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling median stream.
         """
-        func = np.nanmedian if self.min_periods < self.window else np.median
-        return self.agg(func).astype("float")
+        return RollingMedian(self.min_periods < self.window)(self).astype("float")
 
     def std(self) -> "Stream[float]":
         """Computes a rolling standard deviation from the underlying stream.
@@ -184,8 +532,7 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling minimum stream.
         """
-        func = np.nanmin if self.min_periods < self.window else np.min
-        return self.agg(func).astype("float")
+        return RollingMin(self.min_periods < self.window)(self).astype("float")
 
     def max(self) -> "Stream[float]":
         """Computes a rolling maximum from the underlying stream.
@@ -195,13 +542,18 @@ class Rolling(Stream[List[float]]):
         `Stream[float]`
             A rolling maximum stream.
         """
-        func = np.nanmax if self.min_periods < self.window else np.max
-        return self.agg(func).astype("float")
+        return RollingMax(self.min_periods < self.window)(self).astype("float")
 
     def reset(self) -> None:
         self.n = 0
         self.nan = 0
-        self.history = []
+        self.buffer[:] = np.nan
+        self.position = 0
+        self.size = 0
+        self.window_nan = 0
+        self.window_inf = 0
+        self.entered = None
+        self.exited = None
         super().reset()
 
 
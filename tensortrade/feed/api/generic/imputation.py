@@ -2,6 +2,8 @@
 imputation.py contains classes for imputation stream operations.
 """
 
+from typing import List
+
 import numpy as np
 
 from tensortrade.feed.core.base import Stream, T
@@ -25,6 +27,20 @@ class ForwardFill(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0]
+        if array.dtype.kind not in "biuf" or size == 0:
+            return super().vectorize(inputs, size)
+
+        # A value is taken when it is finite or when the previous one was falsy.
+        taken = np.isfinite(array)
+        taken[0] = True
+        taken[1:] |= (array[:-1] == 0)
+
+        index = np.where(taken, np.arange(size), 0)
+        np.maximum.accumulate(index, out=index)
+        return array[index]
+
 
 class FillNa(Stream[T]):
     """A stream operator that computes the padded imputation of a stream.
@@ -36,6 +52,7 @@ class FillNa(Stream[T]):
     """
 
     generic_name = "fillna"
+    elementwise = True
 
     def __init__(self, fill_value: T):
         super().__init__()
@@ -49,3 +66,14 @@ class FillNa(Stream[T]):
 
     def has_next(self) -> bool:
         return True
+
+    def evaluate(self, value: T) -> T:
+        if np.isnan(value):
+            return self.fill_value
+        return value
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0]
+        if array.dtype.kind not in "biuf":
+            return super().vectorize(inputs, size)
+        return np.where(np.isnan(array), self.fill_value, array)
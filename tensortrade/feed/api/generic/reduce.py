@@ -7,7 +7,7 @@ from typing import List, Callable
 
 import numpy as np
 
-from tensortrade.feed.core.base import Stream, T
+from tensortrade.feed.core.base import Stream, T, as_array
 
 
 class Aggregate(Stream[T]):
@@ -20,6 +20,7 @@ class Aggregate(Stream[T]):
     """
 
     generic_name = "reduce"
+    elementwise = True
 
     def __init__(self, func: Callable[[List[T]], T]):
         super().__init__()
@@ -31,6 +32,14 @@ class Aggregate(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def evaluate(self, *values: T) -> T:
+        return self.func(list(values))
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        if self.func in (np.sum, np.min, np.max, np.prod):
+            return self.func(np.vstack(inputs), axis=0)
+        return as_array([self.func(list(row)) for row in zip(*inputs)])
+
 
 class Reduce(Stream[list]):
     """A stream for reducing multiple streams of the same type.
@@ -50,6 +59,9 @@ class Reduce(Stream[list]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return 0
+
     def agg(self, func: "Callable[[List[T]], T]") -> "Stream[T]":
         """Computes the aggregation of the input streams.
 
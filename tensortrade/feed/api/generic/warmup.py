@@ -2,6 +2,8 @@
 warmup.py contains classes for warm up stream operations.
 """
 
+from typing import List
+
 import numpy as np
 
 from tensortrade.feed.core.base import Stream, T
@@ -31,6 +33,15 @@ class WarmUp(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return self.periods
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        dtype = float if inputs[0].dtype.kind in "biuf" else object
+        array = inputs[0].astype(dtype)
+        array[:self.periods] = np.nan
+        return array
+
     def reset(self) -> None:
         self.count = 0
 
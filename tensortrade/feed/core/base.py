@@ -2,6 +2,7 @@
 import inspect
 
 from abc import abstractmethod
+from collections import deque
 from typing import (
     Generic,
     Iterable,
@@ -10,9 +11,13 @@ from typing import (
     Any,
     Callable,
     List,
+    Optional,
     Tuple
 )
 
+import numpy as np
+import pandas as pd
+
 from tensortrade.core import Observable
 from tensortrade.feed.core.accessors import CachedAccessor
 from tensortrade.feed.core.mixins import DataTypeMixin
@@ -131,6 +136,9 @@ class Stream(Generic[T], Named, Observable):
     _mixins: "Dict[str, DataTypeMixin]" = {}
     _accessors: "List[CachedAccessor]" = []
     generic_name: str = "stream"
+    windowed: bool = False
+    elementwise: bool = False
+    cumulative: bool = False
 
     def __new__(cls, *args, **kwargs):
         dtype = kwargs.get("dtype")
@@ -192,6 +200,112 @@ class Stream(Generic[T], Named, Observable):
         """
         raise NotImplementedError()
 
+    def evaluate(self, *values: "Any") -> T:
+        """Computes the value of an elementwise stream from the values of its
+        inputs.
+
+        Only streams that are stateless and `elementwise` implement this method,
+        which allows them to be fused together when compiling a `DataFeed`.
+
+        Parameters
+        ----------
+        *values : positional arguments
+            The current value of each of the input streams.
+
+        Returns
+        -------
+        `T`
+            The value of the stream.
+        """
+        raise NotImplementedError()
+
+    def lookback(self) -> "Optional[int]":
+        """Gets the number of past steps needed to restore the state of the
+        stream.
+
+        Running a freshly reset stream over this many steps of its inputs puts
+        it in the same state as running it over all of them, which is what
+        `DataFeed.seek` relies on. Stateless streams need no past steps, while
+        streams whose state depends on their whole history (or streams that do
+        not know) return None.
+
+        Returns
+        -------
+        `Optional[int]`
+            The number of past steps needed, or None if it is unbounded.
+        """
+        return 0 if self.elementwise else None
+
+    def prefix(self, inputs: "List[np.ndarray]") -> "np.ndarray":
+        """Summarizes the history of the inputs before every step.
+
+        Only `cumulative` streams implement this method. Besides the state that
+        their lookback restores, they keep counts over their whole history
+        (e.g. the number of values a rolling window observed since the start),
+        which `restore` sets from this summary when a `DataFeed` seeks.
+
+        Parameters
+        ----------
+        inputs : `List[np.ndarray]`
+            The values of each of the input streams at every step.
+
+        Returns
+        -------
+        `np.ndarray`
+            The summary of the steps before every step, and after the last one.
+        """
+        raise NotImplementedError()
+
+    def restore(self, prefix: "np.ndarray", start: int) -> None:
+        """Restores the counts of a freshly reset `cumulative` stream as they
+        were right before `start`.
+
+        Parameters
+        ----------
+        prefix : `np.ndarray`
+            The summary computed by `prefix`.
+        start : int
+            The step the stream is going to be run from.
+        """
+        raise NotImplementedError()
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        """Computes all the values of the stream at once from the values of
+        its inputs.
+
+        The default implementation steps `forward` over the input arrays, which
+        is valid for any operator that only reads the current value of its
+        inputs. Operators that have a whole-array kernel override this method.
+        Streams without inputs cannot be computed ahead of time by default and
+        are left to run step by step.
+
+        Parameters
+        ----------
+        inputs : `List[np.ndarray]`
+            The values of each of the input streams, in the order of `inputs`.
+        size : int
+            The number of steps to compute.
+
+        Returns
+        -------
+        `np.ndarray`
+            The value of the stream at every step.
+
+        Raises
+        ------
+        NotImplementedError
+            Raised if the stream cannot be computed ahead of time.
+        """
+        if not self.inputs:
+            raise NotImplementedError()
+
+        values = []
+        for i in range(size):
+            for s, array in zip(self.inputs, inputs):
+                s.value = array[i]
+            values += [self.forward()]
+        return as_array(values)
+
     def astype(self, dtype: str) -> "Stream[T]":
         """Converts the data type to `dtype`.
 
@@ -266,6 +380,26 @@ class Stream(Generic[T], Named, Observable):
         """
         return Group()(*streams)
 
+    @staticmethod
+    def stack(streams: "List[Stream[float]]",
+              dtype: "np.dtype" = np.float64) -> "Stream[np.ndarray]":
+        """Creates a stream that stacks the values of streams into an array.
+
+        Parameters
+        ----------
+        streams : `List[Stream[float]]`
+            Numeric streams to be stacked together.
+        dtype : `np.dtype`, default np.float64
+            The data type of the generated arrays.
+
+        Returns
+        -------
+        `Stream[np.ndarray]`
+            A stream of arrays with the value of each stream in its column, as
+            given by the `columns` of the stream.
+        """
+        return Stack(dtype=dtype)(*streams)
+
     @staticmethod
     def sensor(obj: "Any",
                func: "Callable[[Any], T]",
@@ -357,6 +491,10 @@ class Stream(Generic[T], Named, Observable):
                 edges: "List[Tuple[Stream, Stream]]") -> "List[Tuple[Stream, Stream]]":
         """Gathers all the edges relating back to this particular node.
 
+        The graph is walked depth first without recursion and visited streams
+        are tracked by identity, so gathering takes linear time in the size of
+        the graph.
+
         Parameters
         ----------
         stream : `Stream`
@@ -372,14 +510,20 @@ class Stream(Generic[T], Named, Observable):
         `List[Tuple[Stream, Stream]]`
             The updated list of edges after inspecting `stream`.
         """
-        if stream not in vertices:
-            vertices += [stream]
+        visited = {id(v) for v in vertices}
+        stack = [stream]
 
-            for s in stream.inputs:
-                edges += [(s, stream)]
+        while stack:
+            node = stack.pop()
+            if id(node) in visited:
+                continue
+            visited.add(id(node))
+            vertices += [node]
 
-            for s in stream.inputs:
-                Stream._gather(s, vertices, edges)
+            for s in node.inputs:
+                edges += [(s, node)]
+
+            stack.extend(reversed(node.inputs))
 
         return edges
 
@@ -387,6 +531,11 @@ class Stream(Generic[T], Named, Observable):
     def toposort(edges: "List[Tuple[Stream, Stream]]") -> "List[Stream]":
         """Sorts the order in which streams should be run.
 
+        Streams are ordered with Kahn's algorithm in linear time. Among the
+        streams that are ready to run, the one found first in `edges` runs
+        first, so the order is deterministic. Streams without any outgoing
+        edge (e.g. the feed itself) are not part of the order.
+
         Parameters
         ----------
         edges : `List[Tuple[Stream, Stream]]`
@@ -397,25 +546,38 @@ class Stream(Generic[T], Named, Observable):
         `List[Stream]`
             The list of streams sorted with respect to the order in which they
             should be run.
-        """
-        src = set([s for s, t in edges])
-        tgt = set([t for s, t in edges])
 
-        starting = list(src.difference(tgt))
-        process = starting.copy()
+        Raises
+        ------
+        Exception
+            Raised if the streams connected by `edges` contain a cycle.
+        """
+        nodes = {}
+        targets = {}
+        indegree = {}
 
-        while len(starting) > 0:
-            start = starting.pop()
+        for s, t in edges:
+            nodes.setdefault(id(s), s)
+            nodes.setdefault(id(t), t)
+            targets.setdefault(id(s), []).append(t)
+            indegree[id(t)] = indegree.get(id(t), 0) + 1
 
-            edges = list(filter(lambda e: e[0] != start, edges))
+        ready = deque(v for k, v in nodes.items() if k not in indegree)
+        process = []
 
-            src = set([s for s, t in edges])
-            tgt = set([t for s, t in edges])
+        while ready:
+            start = ready.popleft()
+            if id(start) not in targets:
+                continue
+            process += [start]
 
-            starting += [v for v in src.difference(tgt) if v not in starting]
+            for t in targets[id(start)]:
+                indegree[id(t)] -= 1
+                if indegree[id(t)] == 0:
+                    ready.append(t)
 
-            if start not in process:
-                process += [start]
+        if any(count > 0 for count in indegree.values()):
+            raise Exception("Streams cannot be sorted because they contain a cycle.")
 
         return process
 
@@ -495,9 +657,41 @@ class Stream(Generic[T], Named, Observable):
         return instance
 
 
+def as_array(values: "List[T]") -> "np.ndarray":
+    """Converts a list of stream values into a one dimensional array.
+
+    Values that do not fit into a flat numeric array (e.g. lists or tuples)
+    are kept as they are in an array of objects.
+
+    Parameters
+    ----------
+    values : `List[T]`
+        The values generated by a stream.
+
+    Returns
+    -------
+    `np.ndarray`
+        A one dimensional array holding `values`.
+    """
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        array = None
+
+    if array is None or array.ndim != 1:
+        array = np.empty(len(values), dtype=object)
+        for i, v in enumerate(values):
+            array[i] = v
+    return array
+
+
 class IterableStream(Stream[T]):
     """A private class used the `Stream` class for creating data sources.
 
+    Sources backed by a sequence (a list, a tuple, a one dimensional array or a
+    series) are read through an index, so they can be reset and repositioned
+    in constant time. Other iterables are read through an iterator.
+
     Parameters
     ----------
     source : `Iterable[T]`
@@ -512,24 +706,30 @@ class IterableStream(Stream[T]):
         super().__init__(dtype=dtype)
         self.is_gen = False
         self.iterable = None
+        self.values = None
+        self.index = 0
 
         if inspect.isgeneratorfunction(source):
             self.gen_fn = source
             self.is_gen = True
-            self.generator = self.gen_fn()
         else:
             self.iterable = source
-            self.generator = iter(source)
+            if isinstance(source, pd.Series):
+                self.values = source.array
+            elif isinstance(source, (list, tuple)) or (isinstance(source, np.ndarray) and source.ndim == 1):
+                self.values = source
 
-        self.stop = False
-        
-        try:
-            self.current = next(self.generator)
-        except StopIteration:
-            self.stop = True
+        self.reset()
 
     def forward(self) -> T:
+        if self.values is not None:
+            v = self.values[self.index]
+            self.index += 1
+            self.stop = self.index >= len(self.values)
+            return v
+
         v = self.current
+        self.index += 1
         try:
             self.current = next(self.generator)
         except StopIteration:
@@ -539,17 +739,52 @@ class IterableStream(Stream[T]):
     def has_next(self):
         return not self.stop
 
+    def lookback(self) -> int:
+        return 0
+
+    def seek(self, index: int) -> None:
+        """Positions the source so that the next value generated is the one at
+        `index`.
+
+        Parameters
+        ----------
+        index : int
+            The position of the next value to generate.
+        """
+        if self.values is not None:
+            self.index = min(index, len(self.values))
+            self.stop = self.index >= len(self.values)
+            return
+
+        if index < self.index:
+            self.reset()
+        while self.index < index and not self.stop:
+            self.forward()
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        if self.is_gen or not hasattr(self.iterable, "__len__"):
+            raise NotImplementedError()
+
+        dtype = getattr(self.iterable, "dtype", None)
+        if dtype is not None and dtype.kind in "biuf" and self.iterable.ndim == 1:
+            array = np.asarray(self.iterable)
+        else:
+            array = as_array(list(self.iterable))
+        return array[:size]
+
     def reset(self):
-        if self.is_gen:
-            self.generator = self.gen_fn()
+        self.index = 0
+
+        if self.values is not None:
+            self.stop = len(self.values) == 0
         else:
-            self.generator = iter(self.iterable)
-        self.stop = False
+            self.generator = self.gen_fn() if self.is_gen else iter(self.iterable)
+            self.stop = False
 
-        try:
-            self.current = next(self.generator)
-        except StopIteration:
-            self.stop = True
+            try:
+                self.current = next(self.generator)
+            except StopIteration:
+                self.stop = True
         super().reset()
 
 
@@ -573,6 +808,52 @@ class Group(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return 0
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        raise NotImplementedError()
+
+
+class Stack(Stream[np.ndarray]):
+    """A stream that writes the values of other streams into an array.
+
+    The array is allocated once and overwritten at each step, so consumers
+    that keep a row around have to copy it.
+
+    Parameters
+    ----------
+    dtype : `np.dtype`, default np.float64
+        The data type of the generated arrays.
+    """
+
+    generic_name = "stack"
+
+    def __init__(self, dtype: "np.dtype" = np.float64) -> None:
+        super().__init__()
+        self.array_dtype = np.dtype(dtype)
+
+    def __call__(self, *inputs) -> "Stack":
+        self.inputs = inputs
+        self.columns = {s.name: i for i, s in enumerate(inputs)}
+        self.row = np.zeros(len(inputs), dtype=self.array_dtype)
+        return self
+
+    def forward(self) -> "np.ndarray":
+        self.row[:] = [s.value for s in self.inputs]
+        return self.row
+
+    def has_next(self) -> bool:
+        return True
+
+    def lookback(self) -> int:
+        return 0
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        if len(inputs) == 0:
+            return np.zeros((size, 0), dtype=self.array_dtype)
+        return np.column_stack(inputs).astype(self.array_dtype)
+
 
 class Sensor(Stream[T]):
     """A stream that watches and generates from a particular object."""
@@ -590,11 +871,15 @@ class Sensor(Stream[T]):
     def has_next(self):
         return True
 
+    def lookback(self) -> int:
+        return 0
+
 
 class Constant(Stream[T]):
     """A stream that generates a constant value."""
 
     generic_name = "constant"
+    elementwise = True
 
     def __init__(self, value, dtype: str = None):
         super().__init__(dtype=dtype)
@@ -606,6 +891,12 @@ class Constant(Stream[T]):
     def has_next(self):
         return True
 
+    def evaluate(self):
+        return self.constant
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return as_array([self.constant]).repeat(size)
+
 
 class Placeholder(Stream[T]):
     """A stream that acts as a placeholder for data to be provided at later date.
@@ -625,5 +916,8 @@ class Placeholder(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return 0
+
     def reset(self) -> None:
         self.value = None
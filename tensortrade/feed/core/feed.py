@@ -1,8 +1,75 @@
+import types
+from collections import deque
+from typing import Any, List, Optional, Tuple, Union
 
+import numpy as np
 
-from typing import List
+from tensortrade.feed.core.base import Stream, T, Placeholder, IterableStream, Group, Stack
+from tensortrade.feed.core.mixins import DataTypeMixin
+from tensortrade.feed.core.operators import Fused
+from tensortrade.feed.core.profiler import Profiler
 
-from tensortrade.feed.core.base import Stream, T, Placeholder
+
+def _kind(stream: "Stream") -> type:
+    """Gets the class of a stream without the data type mixins it was
+    extended with.
+
+    Parameters
+    ----------
+    stream : `Stream`
+        The stream to get the class of.
+
+    Returns
+    -------
+    type
+        The class that defines the behavior of the stream.
+    """
+    cls = type(stream)
+    while len(cls.__bases__) == 2 and issubclass(cls.__bases__[1], DataTypeMixin):
+        cls = cls.__bases__[0]
+    return cls
+
+
+def _freeze(value: "Any", classes: dict) -> "Any":
+    """Converts a parameter of a stream into a hashable key.
+
+    Parameters
+    ----------
+    value : `Any`
+        The parameter to convert.
+    classes : dict
+        The equivalence class of each stream that has already been hashed.
+
+    Returns
+    -------
+    `Any`
+        A hashable key that is equal for parameters that behave the same.
+    """
+    if isinstance(value, Stream):
+        return "stream", classes.get(id(value), id(value))
+    if isinstance(value, types.FunctionType):
+        try:
+            closure = tuple(c.cell_contents for c in value.__closure__ or ())
+        except ValueError:
+            return "object", id(value)
+        return (
+            "function",
+            value.__code__,
+            id(value.__globals__),
+            _freeze(value.__defaults__, classes),
+            _freeze(closure, classes)
+        )
+    if isinstance(value, np.ndarray):
+        return "array", value.dtype.str, value.shape, value.tobytes()
+    if isinstance(value, (list, tuple, deque)):
+        return (type(value).__name__,) + tuple(_freeze(v, classes) for v in value)
+    if isinstance(value, dict):
+        return ("dict",) + tuple((k, _freeze(v, classes)) for k, v in value.items())
+    try:
+        hash(value)
+    except TypeError:
+        return "object", id(value)
+    return value
 
 
 class DataFeed(Stream[dict]):
@@ -12,49 +79,602 @@ class DataFeed(Stream[dict]):
     ----------
     streams : `List[Stream]`
         A list of streams to be used in the data feed.
+    mode : str, default "stream"
+        The mode used to compile the feed. See `compile` for the available
+        modes.
+    optimize : bool, default False
+        Whether to optimize the stream graph when compiling the feed.
+    output : {"dict", "array"}, default "dict"
+        The format of the data generated by the feed. With "dict" each step
+        generates a dictionary of the values of the streams keyed by their
+        names. With "array" each step writes the values into a preallocated
+        row, and the column of each stream is given by `columns`. Groups are
+        flattened, with their streams named `<group>:/<stream>`.
+    output_dtype : `np.dtype`, default np.float64
+        The data type of the rows generated with the "array" output.
     """
 
-    def __init__(self, streams: "List[Stream]") -> None:
+    def __init__(self,
+                 streams: "List[Stream]",
+                 mode: str = "stream",
+                 optimize: bool = False,
+                 output: str = "dict",
+                 output_dtype: "np.dtype" = np.float64) -> None:
         super().__init__()
 
+        if output not in ["dict", "array"]:
+            raise ValueError("Invalid output format: {}.".format(output))
+
         self.process = None
         self.compiled = False
+        self.mode = mode
+        self.optimize = optimize
+        self.report = None
+        self.output = output
+        self.output_dtype = np.dtype(output_dtype)
+        self.columns = None
+        self.profiler = None
+        self._out = None
+        self._prefixes = {}
 
         if streams:
             self.__call__(*streams)
 
-    def compile(self) -> None:
+    def compile(self, mode: str = None, optimize: bool = None) -> None:
         """Compiles all the given stream together.
 
         Organizes the order in which streams should be run to get valid output.
+
+        In "stream" mode every stream is run once per step. In "vectorized"
+        mode every stream that can be derived from finite sources is computed
+        ahead of time over whole arrays, and each step only reads the
+        precomputed values. Streams that depend on live data (e.g. sensors and
+        placeholders) keep running step by step.
+
+        When optimizing, streams that are structurally the same (same type,
+        parameters and inputs) are merged into one, and the consumers of a
+        duplicate are rewired to the stream it was merged into. Streams that no
+        longer contribute to any output of the feed are then dropped. Outputs,
+        streams with listeners and streams read by name (e.g. by a group) are
+        never merged away. Finally, groups of stateless elementwise streams are
+        fused into a single stream. A stream is only fused into the stream that
+        consumes it if it is not an output of the feed, has no other consumers
+        and no listeners, so every stream that can be observed from outside of
+        the group keeps its name and its value.
+
+        What the optimization did is recorded in `report`, a dictionary with the
+        names of the streams that were merged (as pairs of the duplicate and the
+        stream it was merged into), pruned and fused.
+
+        Parameters
+        ----------
+        mode : {"stream", "vectorized"}, optional
+            The compilation mode. Defaults to the mode of the feed.
+        optimize : bool, optional
+            Whether to optimize the stream graph. Defaults to the setting of the
+            feed.
+
+        Raises
+        ------
+        ValueError
+            Raised if `mode` is not a valid compilation mode.
         """
+        mode = mode or self.mode
+        if mode not in ["stream", "vectorized"]:
+            raise ValueError("Invalid compilation mode: {}.".format(mode))
+
+        if optimize is None:
+            optimize = self.optimize
+
         edges = self.gather()
 
         self.process = self.toposort(edges)
+        self.mode = mode
+        self.optimize = optimize
+        self._prefixes = {}
+
+        if optimize:
+            self.report = {"merged": [], "pruned": [], "fused": []}
+            edges = self._eliminate(edges)
+            self.process = self._fuse(edges)
+
+        if mode == "vectorized":
+            self._vectorize()
+
+        if self.output == "array":
+            leaves = self._flatten(self.inputs, "")
+            self.columns = {name: i for i, (name, _) in enumerate(leaves)}
+            self.row = np.zeros(len(leaves), dtype=self.output_dtype)
+            self._leaves = [s for _, s in leaves]
+
         self.compiled = True
         self.reset()
 
+    @staticmethod
+    def _flatten(streams: "List[Stream]", prefix: str) -> "List[Tuple[str, Stream]]":
+        """Flattens groups of streams into the columns of the array output.
+
+        Parameters
+        ----------
+        streams : `List[Stream]`
+            The streams to flatten.
+        prefix : str
+            The prefix of the names of the columns.
+
+        Returns
+        -------
+        `List[Tuple[str, Stream]]`
+            The name and stream of each column.
+        """
+        leaves = []
+        for s in streams:
+            if isinstance(s, (Group, Stack)):
+                leaves += DataFeed._flatten(s.inputs, prefix + s.name + ":/")
+            else:
+                leaves += [(prefix + s.name, s)]
+        return leaves
+
+    def _eliminate(self, edges: "List[Tuple[Stream, Stream]]") -> "List[Tuple[Stream, Stream]]":
+        """Merges structurally equal streams and prunes the streams that do not
+        contribute to the outputs of the feed anymore.
+
+        Parameters
+        ----------
+        edges : `List[Tuple[Stream, Stream]]`
+            The edges of the stream graph.
+
+        Returns
+        -------
+        `List[Tuple[Stream, Stream]]`
+            The edges of the optimized stream graph.
+        """
+        # Parameters are compared in their initial state.
+        for s in self.process:
+            s.reset()
+
+        pinned = {id(s) for s in self.inputs}
+        pinned.update(id(s) for s, t in edges if isinstance(t, (Group, Stack, DataFeed)))
+
+        classes = {}
+        keys = {}
+        members = []
+        for s in self.process:
+            if s.inputs or s.elementwise:
+                params = tuple(
+                    (k, _freeze(v, classes)) for k, v in sorted(vars(s).items())
+                    if k not in ("name", "value", "inputs", "listeners")
+                )
+                key = (_kind(s), params, tuple(classes[id(i)] for i in s.inputs))
+            else:
+                key = (_kind(s), id(s))
+
+            index = keys.setdefault(key, len(keys))
+            if index == len(members):
+                members += [[]]
+            members[index] += [s]
+            classes[id(s)] = index
+
+        replaced = {}
+        for group in members:
+            kept = [s for s in group if id(s) in pinned or s.listeners]
+            target = kept[0] if kept else group[0]
+            for s in group:
+                if s is not target and s not in kept:
+                    replaced[id(s)] = target
+                    self.report["merged"] += [(s.name, target.name)]
+
+        if not replaced:
+            return edges
+
+        for s in self.process:
+            if any(id(i) in replaced for i in s.inputs):
+                s.inputs = type(s.inputs)(replaced.get(id(i), i) for i in s.inputs)
+
+        edges = self.gather()
+        process = self.toposort(edges)
+
+        remaining = {id(s) for s in process}
+        self.report["pruned"] += [s.name for s in self.process if id(s) not in remaining]
+        self.process = process
+
+        return edges
+
+    def _fuse(self, edges: "List[Tuple[Stream, Stream]]") -> "List[Stream]":
+        """Fuses groups of stateless elementwise streams of the processing order.
+
+        Parameters
+        ----------
+        edges : `List[Tuple[Stream, Stream]]`
+            The edges of the stream graph.
+
+        Returns
+        -------
+        `List[Stream]`
+            The processing order with each fused group replaced by a single
+            `Fused` stream.
+        """
+        outputs = {id(s) for s in self.inputs}
+        consumers = {}
+        for s, t in edges:
+            consumers.setdefault(id(s), {})[id(t)] = t
+
+        def absorbable(s: "Stream") -> bool:
+            if not s.elementwise or id(s) in outputs or s.listeners:
+                return False
+            targets = list(consumers.get(id(s), {}).values())
+            return len(targets) == 1 and targets[0].elementwise
+
+        absorbed = {id(s) for s in self.process if absorbable(s)}
+        order = {id(s): i for i, s in enumerate(self.process)}
+
+        process = []
+        for s in self.process:
+            if id(s) in absorbed:
+                continue
+            if not s.elementwise:
+                process += [s]
+                continue
+
+            group = {}
+            stack = [s]
+            while stack:
+                node = stack.pop()
+                for i in node.inputs:
+                    if id(i) in absorbed and id(i) not in group:
+                        group[id(i)] = i
+                        stack += [i]
+
+            if not group:
+                process += [s]
+                continue
+
+            members = sorted(group.values(), key=lambda m: order[id(m)]) + [s]
+            process += [Fused(s, members)]
+            self.report["fused"] += [s.name]
+
+        return process
+
+    def _vectorize(self) -> None:
+        """Computes the values of every stream that does not depend on live data
+        and decides which streams still have to be run at each step."""
+        # Consumers of a fused group still refer to its tail.
+        aliases = {id(s.tail): s for s in self.process if isinstance(s, Fused)}
+
+        def resolve(s: "Stream") -> "Stream":
+            return aliases.get(id(s), s)
+
+        columns = {}
+
+        for s in self.process:
+            if isinstance(s, IterableStream):
+                try:
+                    columns[s] = s.vectorize([], None)
+                except NotImplementedError:
+                    pass
+
+        if len(columns) == 0:
+            raise Exception("A vectorized feed requires at least one finite source.")
+
+        size = min(len(c) for c in columns.values())
+
+        for s in self.process:
+            if s in columns:
+                columns[s] = columns[s][:size]
+            elif all(resolve(i) in columns for i in s.inputs):
+                try:
+                    columns[s] = s.vectorize([columns[resolve(i)] for i in s.inputs], size)
+                except NotImplementedError:
+                    pass
+
+        # Precomputed values are only kept for streams read by the outputs of
+        # the feed or by streams that still run at each step. The column of a
+        # windowed stream does not hold its values, so it has to run instead.
+        needed = {resolve(s) for s in self.inputs}
+        for s in reversed(self.process):
+            if s in columns and s in needed and s.windowed:
+                del columns[s]
+            if s not in columns:
+                needed.update(resolve(i) for i in s.inputs)
+
+        for s in self.process:
+            s.reset()
+
+        self._size = size
+        self._cursor = 0
+        self._replay = [(s, columns[s]) for s in self.process if s in columns and s in needed]
+        self._live = [s for s in self.process if s not in columns]
+
+    def profile(self, enabled: bool = True, allocations: bool = False) -> "Profiler":
+        """Enables or disables the profiling of the streams of the feed.
+
+        Parameters
+        ----------
+        enabled : bool, default True
+            Whether to profile the feed.
+        allocations : bool, default False
+            Whether to count the memory blocks allocated by each stream.
+
+        Returns
+        -------
+        `Profiler`
+            The profiler recording the steps of the feed, or None if profiling
+            is disabled.
+        """
+        if not enabled:
+            self.profiler = None
+        elif self.profiler is None or self.profiler.allocations != allocations:
+            self.profiler = Profiler(allocations=allocations)
+        return self.profiler
+
     def run(self) -> None:
         """Runs all the streams in processing order."""
         if not self.compiled:
             self.compile()
 
-        for s in self.process:
-            s.run()
+        if self.profiler is not None:
+            self._profile()
+            return
 
+        self._step()
         super().run()
 
-    def forward(self) -> dict:
+    def _step(self) -> None:
+        """Runs the streams of the feed for one step without generating the
+        output of the feed."""
+        if self.mode == "vectorized":
+            for s, column in self._replay:
+                s.value = column[self._cursor]
+                for listener in s.listeners:
+                    listener.on_next(s.value)
+            for s in self._live:
+                s.run()
+            self._cursor += 1
+        else:
+            for s in self.process:
+                s.run()
+
+    def _history(self, stream: "Stream") -> "np.ndarray":
+        """Computes the values of a stream at every step ahead of time.
+
+        Parameters
+        ----------
+        stream : `Stream`
+            The stream to compute the values of.
+
+        Returns
+        -------
+        `np.ndarray`
+            The values of the stream at every step.
+
+        Raises
+        ------
+        NotImplementedError
+            Raised if the stream cannot be computed ahead of time.
+        """
+        aliases = {id(s.tail): s for s in self.process if isinstance(s, Fused)}
+
+        def resolve(s: "Stream") -> "Stream":
+            return aliases.get(id(s), s)
+
+        ancestors = {resolve(stream)}
+        for s in reversed(self.process):
+            if s in ancestors:
+                ancestors.update(resolve(i) for i in s.inputs)
+        ancestors = [s for s in self.process if s in ancestors]
+
+        # Computing the values steps the streams without a kernel, so their
+        # current values are put back afterwards.
+        values = {s: s.value for s in ancestors}
+        columns = {}
+        try:
+            for s in ancestors:
+                if not s.inputs:
+                    columns[s] = s.vectorize([], None)
+
+            size = min(len(c) for c in columns.values())
+            for s in ancestors:
+                if s.inputs:
+                    columns[s] = s.vectorize([columns[resolve(i)] for i in s.inputs], size)
+                else:
+                    columns[s] = columns[s][:size]
+        finally:
+            for s, value in values.items():
+                s.value = value
+
+        return columns[resolve(stream)]
+
+    def _prefix(self, stream: "Stream") -> "Optional[np.ndarray]":
+        """Gets the summary of the history of a `cumulative` stream before
+        every step.
+
+        Parameters
+        ----------
+        stream : `Stream`
+            The cumulative stream.
+
+        Returns
+        -------
+        `Optional[np.ndarray]`
+            The summary computed by `Stream.prefix`, or None if the inputs of
+            the stream cannot be computed ahead of time.
+        """
+        if id(stream) not in self._prefixes:
+            try:
+                inputs = [self._history(i) for i in stream.inputs]
+                self._prefixes[id(stream)] = stream.prefix(inputs)
+            except NotImplementedError:
+                self._prefixes[id(stream)] = None
+        return self._prefixes[id(stream)]
+
+    def lookback(self) -> "Optional[int]":
+        """Gets the number of past steps needed to restore the state of all the
+        streams of the feed.
+
+        Returns
+        -------
+        `Optional[int]`
+            The number of past steps needed, or None if some stream depends on
+            its whole history.
+        """
+        if not self.compiled:
+            self.compile()
+
+        # Precomputed values are exact, so only the streams that still run at
+        # each step have to be restored.
+        if self.mode == "vectorized":
+            streams = self._live
+            needed = {id(s): 0 for s, _ in self._replay}
+        else:
+            streams = self.process
+            needed = {}
+
+        for s in streams:
+            lookback = s.lookback()
+            if s.cumulative and self._prefix(s) is None:
+                lookback = None
+            lookbacks = [needed.get(id(i), 0) for i in s.inputs]
+            if lookback is None or None in lookbacks:
+                needed[id(s)] = None
+            else:
+                needed[id(s)] = lookback + max(lookbacks, default=0)
+            if isinstance(s, Fused):
+                needed[id(s.tail)] = needed[id(s)]
+
+        if None in needed.values():
+            return None
+        return max(needed.values(), default=0)
+
+    def seek(self, index: int, warmup: int = None) -> None:
+        """Positions the feed so that the next data point it generates is the
+        one at `index`.
+
+        The sources of the feed are positioned at the start of a warm-up window
+        ending right before `index`, and the streams are run over that window
+        to restore their state without generating the output of the feed. By
+        default the window is as long as the lookback of the feed, so lagged
+        and rolling streams are restored exactly. The counts that rolling
+        streams keep since the start are set from a summary of their inputs,
+        computed once. When some stream depends on its whole history (e.g.
+        exponentially weighted or expanding streams), or the inputs of a rolling
+        stream cannot be computed ahead of time, the feed is replayed from the
+        start unless a shorter `warmup` is given, in which case their state is
+        approximated from the window. The error of an exponentially weighted
+        mean then shrinks as `(1 - alpha) ** warmup`.
+
+        Parameters
+        ----------
+        index : int
+            The position of the next data point to generate.
+        warmup : int, optional
+            The length of the warm-up window. Defaults to the lookback of the
+            feed.
+
+        Raises
+        ------
+        ValueError
+            Raised if `index` is negative.
+        """
+        if index < 0:
+            raise ValueError("Cannot seek to a negative position: {}.".format(index))
+
+        if not self.compiled:
+            self.compile()
+
+        if warmup is None:
+            warmup = self.lookback()
+        start = 0 if warmup is None else max(0, index - warmup)
+
+        self.reset()
+
+        streams = self._live if self.mode == "vectorized" else self.process
+        for s in streams:
+            if isinstance(s, IterableStream):
+                s.seek(start)
+            elif s.cumulative:
+                prefix = self._prefix(s)
+                if prefix is not None:
+                    s.restore(prefix, start)
+
+        if self.mode == "vectorized":
+            self._cursor = start
+            if not self._live:
+                self._cursor = min(index, self._size)
+                return
+
+        for _ in range(index - start):
+            if not self.has_next():
+                break
+            self._step()
+
+    def _profile(self) -> None:
+        """Runs all the streams in processing order while profiling them."""
+        profiler = self.profiler
+        profiler.start()
+
+        # Replaying precomputed values is counted in the time of the step
+        # but not in the time of any stream.
+        if self.mode == "vectorized":
+            for s, column in self._replay:
+                s.value = column[self._cursor]
+                for listener in s.listeners:
+                    listener.on_next(s.value)
+            profiler.run(self._live)
+            self._cursor += 1
+        else:
+            profiler.run(self.process)
+
+        # The feed itself is measured as well, since generating its output and
+        # notifying its listeners can be costly.
+        profiler.measure(self, super().run)
+
+        profiler.stop()
+
+    def forward(self) -> "Union[dict, np.ndarray]":
+        if self.output == "array":
+            row = self.row if self._out is None else self._out
+            row[:] = [s.value for s in self._leaves]
+            return row
         return {s.name: s.value for s in self.inputs}
 
-    def next(self) -> dict:
+    def next(self, out: "np.ndarray" = None) -> "Union[dict, np.ndarray]":
+        """Generates the next data point of the feed.
+
+        Parameters
+        ----------
+        out : `np.ndarray`, optional
+            A buffer to write the row into with the "array" output. By default
+            the row is written into `row`, which is overwritten at each step.
+
+        Returns
+        -------
+        `Union[dict, np.ndarray]`
+            The next data point of the feed.
+        """
+        if not self.compiled:
+            self.compile()
+
+        self._out = out
         self.run()
+        self._out = None
         return self.value
 
     def has_next(self) -> bool:
+        if not self.compiled:
+            self.compile()
+
+        if self.mode == "vectorized":
+            return self._cursor < self._size and all(s.has_next() for s in self._live)
         return all(s.has_next() for s in self.process)
 
     def reset(self) -> None:
+        if self.mode == "vectorized":
+            self._cursor = 0
+            for s, _ in self._replay:
+                s.value = None
+            for s in self._live:
+                s.reset()
+            return
+
         for s in self.process:
             s.reset()
 
@@ -77,11 +697,7 @@ class PushFeed(DataFeed):
 
         self.compile()
 
-        edges = self.gather()
-        src = set([s for s, t in edges])
-        tgt = set([t for s, t in edges])
-
-        self.start = [s for s in src.difference(tgt) if isinstance(s, Placeholder)]
+        self.start = [s for s in self.process if not s.inputs and isinstance(s, Placeholder)]
 
     @property
     def is_loaded(self):
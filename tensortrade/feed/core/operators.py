@@ -1,10 +1,10 @@
 
-from typing import Callable, TypeVar
+from typing import Callable, TypeVar, List
 
 
 import numpy as np
 
-from tensortrade.feed.core.base import Stream, T
+from tensortrade.feed.core.base import Stream, T, as_array
 
 
 K = TypeVar("K")
@@ -22,6 +22,8 @@ class Apply(Stream[K]):
         The data type of the values after function is applied.
     """
 
+    elementwise = True
+
     def __init__(self,
                  func: Callable[[T], K],
                  dtype: str = None) -> None:
@@ -35,6 +37,14 @@ class Apply(Stream[K]):
     def has_next(self) -> bool:
         return True
 
+    def evaluate(self, value: T) -> K:
+        return self.func(value)
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        if isinstance(self.func, np.ufunc) and inputs[0].dtype.kind in "biuf":
+            return self.func(inputs[0])
+        return as_array([self.func(v) for v in inputs[0]])
+
 
 class Lag(Stream[T]):
     """An operator stream that returns the lagged value of a given stream.
@@ -70,6 +80,18 @@ class Lag(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def lookback(self) -> int:
+        return self.lag
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0]
+        if self.lag == 0:
+            return array
+        dtype = float if array.dtype.kind in "biuf" else object
+        lagged = np.full(size, np.nan, dtype=dtype)
+        lagged[self.lag:] = array[:-self.lag]
+        return lagged
+
     def reset(self) -> None:
         self.runs = 0
         self.history = []
@@ -105,6 +127,17 @@ class Accumulator(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        if isinstance(self.func, np.ufunc) and inputs[0].dtype.kind in "biuf":
+            return self.func.accumulate(inputs[0])
+
+        values = []
+        past = None
+        for v in inputs[0]:
+            past = v if past is None else self.func(past, v)
+            values += [past]
+        return as_array(values)
+
     def reset(self) -> None:
         self.past = None
 
@@ -113,6 +146,7 @@ class Copy(Stream[T]):
     """A stream operator that copies the values of a given stream."""
 
     generic_name = "copy"
+    elementwise = True
 
     def __init__(self) -> None:
         super().__init__()
@@ -123,6 +157,12 @@ class Copy(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def evaluate(self, value: T) -> T:
+        return value
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        return inputs[0]
+
 
 class Freeze(Stream[T]):
     """A stream operator that freezes the value of a given stream and generates
@@ -143,6 +183,17 @@ class Freeze(Stream[T]):
     def has_next(self) -> bool:
         return True
 
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        array = inputs[0]
+        if array.dtype.kind not in "biuf":
+            return super().vectorize(inputs, size)
+
+        frozen = array.copy()
+        first = np.flatnonzero(array)
+        if len(first) > 0:
+            frozen[first[0]:] = array[first[0]]
+        return frozen
+
     def reset(self) -> None:
         self.freeze_value = None
 
@@ -160,6 +211,7 @@ class BinOp(Stream[T]):
     """
 
     generic_name = "bin_op"
+    elementwise = True
 
     def __init__(self,
                  op: Callable[[T, T], T],
@@ -172,3 +224,94 @@ class BinOp(Stream[T]):
 
     def has_next(self) -> bool:
         return True
+
+    def evaluate(self, left: T, right: T) -> T:
+        return self.op(left, right)
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        left, right = inputs
+        if isinstance(self.op, np.ufunc) and left.dtype.kind in "biuf" and right.dtype.kind in "biuf":
+            return self.op(left, right)
+        return as_array([self.op(a, b) for a, b in zip(left, right)])
+
+
+class Fused(Stream[T]):
+    """A stream operator that runs a group of stateless elementwise streams as
+    a single stream.
+
+    The group is made of a `tail` stream together with the streams that only
+    feed into it. Their functions are composed once, so each step costs a
+    single call instead of running every stream of the group. The value of the
+    fused stream is the value of `tail`, so the tail keeps its name and its
+    consumers keep reading it as before.
+
+    Parameters
+    ----------
+    tail : `Stream[T]`
+        The stream whose value is generated by the group.
+    members : `List[Stream]`
+        The streams of the group in processing order, ending with `tail`.
+    """
+
+    generic_name = "fused"
+
+    def __init__(self, tail: "Stream[T]", members: "List[Stream]") -> None:
+        self.tail = tail
+        super().__init__(name=tail.name, dtype=tail.dtype)
+        self.listeners = tail.listeners
+        self.members = members
+
+        ids = {id(m) for m in members}
+        leaves = {}
+        for m in members:
+            for s in m.inputs:
+                if id(s) not in ids:
+                    leaves.setdefault(id(s), s)
+        self.inputs = list(leaves.values())
+
+        functions = {}
+        for m in members:
+            getters = [functions.get(id(s)) or self._getter(s) for s in m.inputs]
+            functions[id(m)] = self._compose(m.evaluate, getters)
+        self.function = functions[id(tail)]
+
+    @property
+    def value(self) -> T:
+        return self.tail.value
+
+    @value.setter
+    def value(self, value: T) -> None:
+        self.tail.value = value
+
+    @staticmethod
+    def _getter(stream: "Stream") -> "Callable[[], T]":
+        return lambda: stream.value
+
+    @staticmethod
+    def _compose(evaluate: "Callable[..., T]",
+                 getters: "List[Callable[[], T]]") -> "Callable[[], T]":
+        if len(getters) == 0:
+            constant = evaluate()
+            return lambda: constant
+        if len(getters) == 1:
+            g = getters[0]
+            return lambda: evaluate(g())
+        if len(getters) == 2:
+            g1, g2 = getters
+            return lambda: evaluate(g1(), g2())
+        return lambda: evaluate(*[g() for g in getters])
+
+    def forward(self) -> T:
+        return self.function()
+
+    def has_next(self) -> bool:
+        return True
+
+    def lookback(self) -> int:
+        return 0
+
+    def vectorize(self, inputs: "List[np.ndarray]", size: int) -> "np.ndarray":
+        arrays = {id(s): array for s, array in zip(self.inputs, inputs)}
+        for m in self.members:
+            arrays[id(m)] = m.vectorize([arrays[id(s)] for s in m.inputs], size)
+        return arrays[id(self.tail)]
@@ -11,7 +11,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Callable
+import time
+from typing import Callable, List
 from decimal import Decimal
 
 from tensortrade.core import Component, TimedIdentifiable
@@ -35,12 +36,15 @@ class ExchangeOptions:
         The maximum price an exchange can have.
     is_live : bool, default False
         Whether live orders should be submitted to the exchange.
+    quote_ttl : float, default 1.0
+        The number of seconds a live quote is reused for.
     """
     def __init__(self,
                  commission: float = 0.003,
                  min_trade_size: float = 1e-6, max_trade_size: float = 1e6,
                  min_trade_price: float = 1e-8, max_trade_price: float = 1e8,
-                 is_live: bool = False):
+                 is_live: bool = False,
+                 quote_ttl: float = 1.0):
         
         self.commission = commission
         
@@ -51,6 +55,7 @@ class ExchangeOptions:
         self.max_trade_price = max_trade_price
         
         self.is_live = is_live
+        self.quote_ttl = quote_ttl
 
 
 class Exchange(Component, TimedIdentifiable):
@@ -78,6 +83,7 @@ class Exchange(Component, TimedIdentifiable):
         self._service = service
         self.options = options if options else ExchangeOptions()
         self._price_streams = {}
+        self._quotes = {}
         
         if not(t_signal):
             from tensortrade.oms.services.execution.ccxt import CCXTExchange
@@ -118,6 +124,49 @@ class Exchange(Component, TimedIdentifiable):
         """
         return list(self._price_streams.values())
 
+    def _quantize(self, trading_pair: "TradingPair", price: "Decimal") -> "Decimal":
+        if price == 0:
+            raise ValueError("Price of trading pair {} is 0. Please check your input data to make sure there always is "
+                             "a valid (nonzero) price.".format(trading_pair))
+
+        price = price.quantize(Decimal(10) ** -trading_pair.base.precision)
+        if price == 0:
+            raise ValueError("Price quantized in base currency precision ({}) would amount to 0 {}. "
+                             "Please consider defining a custom instrument with a higher precision."
+                             .format(trading_pair.base.precision, trading_pair.base))
+        return price
+
+    def _quote(self, trading_pair: "TradingPair", t_signal: bool) -> "List":
+        """Gets the cached quote of a trading pair, refreshing it if needed.
+
+        A simulated quote is reused as long as the price stream of the pair
+        keeps the value it was made from, i.e. until the feed moves to the next
+        step or is reset. A live quote is reused for `quote_ttl` seconds.
+
+        Returns
+        -------
+        `List`
+            The stamp the quote was made at, the price and the inverse price,
+            which is only computed once asked for.
+        """
+        name = str(trading_pair)
+        quote = self._quotes.get((name, t_signal))
+
+        if t_signal:
+            value = self._price_streams[name].value
+            if quote is not None and quote[0] == value:
+                return quote
+            quote = [value, self._quantize(trading_pair, Decimal(value)), None]
+        else:
+            now = time.monotonic()
+            if quote is not None and now - quote[0] < self.options.quote_ttl:
+                return quote
+            price = Decimal(self.ccxt.quote_price(trading_pair))
+            quote = [now, self._quantize(trading_pair, price), None]
+
+        self._quotes[(name, t_signal)] = quote
+        return quote
+
     def quote_price(self, trading_pair: "TradingPair", t_signal: bool) -> "Decimal":
         """The quote price of a trading pair on the exchange, denoted in the
         core instrument.
@@ -132,30 +181,27 @@ class Exchange(Component, TimedIdentifiable):
         `Decimal`
             The quote price of the specified trading pair, denoted in the core instrument.
         """
-        if t_signal:
-            price = Decimal(self._price_streams[str(trading_pair)].value)
-            if price == 0:
-                raise ValueError("Price of trading pair {} is 0. Please check your input data to make sure there always is "
-                                 "a valid (nonzero) price.".format(trading_pair))
-
-            price = price.quantize(Decimal(10) ** -trading_pair.base.precision)
-            if price == 0:
-                raise ValueError("Price quantized in base currency precision ({}) would amount to 0 {}. "
-                                 "Please consider defining a custom instrument with a higher precision."
-                                 .format(trading_pair.base.precision, trading_pair.base))
-        
-        else:
-            price = Decimal(self.ccxt.quote_price(trading_pair))
-            if price == 0:
-                raise ValueError("Price of trading pair {} is 0. Please check your input data to make sure there always is "
-                                 "a valid (nonzero) price.".format(trading_pair))
-
-            price = price.quantize(Decimal(10) ** -trading_pair.base.precision)
-            if price == 0:
-                raise ValueError("Price quantized in base currency precision ({}) would amount to 0 {}. "
-                                 "Please consider defining a custom instrument with a higher precision."
-                                 .format(trading_pair.base.precision, trading_pair.base))
-        return price
+        return self._quote(trading_pair, t_signal)[1]
+
+    def inverse_quote_price(self, trading_pair: "TradingPair", t_signal: bool) -> "Decimal":
+        """The inverse of the quote price of a trading pair on the exchange,
+        denoted in the quote instrument.
+
+        Parameters
+        ----------
+        trading_pair : `TradingPair`
+            The trading pair to get the inverse quote price for.
+
+        Returns
+        -------
+        `Decimal`
+            The inverse quote price of the specified trading pair.
+        """
+        quote = self._quote(trading_pair, t_signal)
+        if quote[2] is None:
+            quantization = Decimal(10) ** -trading_pair.quote.precision
+            quote[2] = Decimal(quote[1] ** Decimal(-1)).quantize(quantization)
+        return quote[2]
     
     def is_pair_tradable(self, trading_pair: 'TradingPair') -> bool:
         """Whether or not the specified trading pair is tradable on this
@@ -31,14 +31,14 @@ class ExchangePair:
     @property
     def inverse_price(self) -> "Decimal":
         """The inverse price of the trading pair. (`Decimal, read-only)"""
-        quantization = Decimal(10) ** -self.pair.quote.precision
-        return Decimal(self.price ** Decimal(-1)).quantize(quantization)
+        t_signal = True
+        return self.exchange.inverse_quote_price(self.pair, t_signal)
     
     @property
     def inverse_price_online(self) -> "Decimal":
         """The inverse price of the trading pair. (`Decimal, read-only)"""
-        quantization = Decimal(10) ** -self.pair.quote.precision
-        return Decimal(self.price_online ** Decimal(-1)).quantize(quantization)
+        t_signal = False
+        return self.exchange.inverse_quote_price(self.pair, t_signal)
 
     def __hash__(self):
         return hash(str(self))
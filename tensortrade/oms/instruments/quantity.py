@@ -14,7 +14,7 @@
 
 import operator
 
-from typing import Union, Tuple, Callable, TypeVar
+from typing import Union, Tuple, Callable, TypeVar, Optional
 from numbers import Number
 from decimal import Decimal, ROUND_DOWN
 from functools import total_ordering
@@ -28,6 +28,17 @@ from tensortrade.core.exceptions import (
 
 T = TypeVar("T")
 
+_UNKNOWN = object()
+_EXACT_OPS = (operator.add, operator.sub, operator.iadd, operator.isub)
+_QUANTA = {}
+
+
+def _quantum(precision: int) -> Decimal:
+    quantum = _QUANTA.get(precision)
+    if quantum is None:
+        quantum = _QUANTA[precision] = Decimal(10) ** -precision
+    return quantum
+
 
 @total_ordering
 class Quantity:
@@ -43,24 +54,83 @@ class Quantity:
         The path order_id that this quantity is allocated for and associated
         with.
 
+    Attributes
+    ----------
+    fixed_point : bool
+        Whether quantities whose sizes are whole numbers of the smallest unit
+        of their instrument are added, subtracted, compared and quantized as
+        integers counts of that unit. The results are the same as with
+        `Decimal` arithmetic, only faster. Set it to False on the class to do
+        all the arithmetic with `Decimal`.
+
     Raises
     ------
     InvalidNegativeQuantity
         Raised if the `size` of the quantity being created is negative.
     """
 
+    fixed_point = True
+
     def __init__(self, instrument: 'Instrument', size: Union[Decimal, Number], path_id: str = None):
         if size < 0:
-            if abs(size) > Decimal(10)**(-instrument.precision):
+            if abs(size) > _quantum(instrument.precision):
                 raise InvalidNegativeQuantity(size)
             else:
                 size = 0
 
         self.instrument = instrument
-        self.size = size if isinstance(size, Decimal) else Decimal(size)
+        self._size = size if isinstance(size, Decimal) else Decimal(size)
+        self._units = _UNKNOWN
         self.path_id = path_id
 
-        
+    @classmethod
+    def _from_units(cls, instrument: 'Instrument', units: int, path_id: str = None) -> "Quantity":
+        """Creates a quantity from a number of the smallest unit of its
+        instrument, with the same rules as creating it from a size."""
+        if units < 0:
+            if units < -1:
+                raise InvalidNegativeQuantity(Decimal(units).scaleb(-instrument.precision))
+            units = 0
+
+        quantity = cls.__new__(cls)
+        quantity.instrument = instrument
+        quantity._size = None
+        quantity._units = units
+        quantity.path_id = path_id
+        return quantity
+
+    @property
+    def size(self) -> Decimal:
+        """The number of units of the instrument. (`Decimal`)"""
+        if self._size is None:
+            self._size = Decimal(self._units).scaleb(-self.instrument.precision)
+        return self._size
+
+    @size.setter
+    def size(self, size: Union[Decimal, Number]) -> None:
+        self._size = size if isinstance(size, Decimal) else Decimal(size)
+        self._units = _UNKNOWN
+
+    @property
+    def units(self) -> "Optional[int]":
+        """The size as a number of the smallest unit of the instrument, or
+        `None` if the size is not a whole number of it. (int, read-only)"""
+        if self._units is _UNKNOWN:
+            scaled = self._size.scaleb(self.instrument.precision)
+            if scaled.is_finite() and scaled == scaled.to_integral_value():
+                self._units = int(scaled)
+            else:
+                self._units = None
+        return self._units
+
+    def _copy(self, path_id: str = None) -> "Quantity":
+        quantity = Quantity.__new__(Quantity)
+        quantity.instrument = self.instrument
+        quantity._size = self._size
+        quantity._units = self._units
+        quantity.path_id = path_id
+        return quantity
+
     @property
     def is_locked(self) -> bool:
         """If quantity is locked for an order. (bool, read-only)"""
@@ -79,7 +149,7 @@ class Quantity:
         `Quantity`
             A locked quantity for an order path.
         """
-        return Quantity(self.instrument, self.size, path_id)
+        return self._copy(path_id)
 
     def convert(self, exchange_pair: "ExchangePair") -> "Quantity":
         """Converts the quantity into the value of another instrument based
@@ -112,7 +182,7 @@ class Quantity:
         `Quantity`
             The free version of the quantity.
         """
-        return Quantity(self.instrument, self.size)
+        return self._copy()
 
     def quantize(self) -> "Quantity":
         """Computes the quantization of current quantity in terms of the instrument's
@@ -123,8 +193,10 @@ class Quantity:
         `Quantity`
             The quantized quantity.
         """
+        if Quantity.fixed_point and self.units is not None:
+            return Quantity._from_units(self.instrument, self._units, self.path_id)
         return Quantity(self.instrument,
-                        self.size.quantize(Decimal(10)**-self.instrument.precision),
+                        self.size.quantize(_quantum(self.instrument.precision)),
                         self.path_id)
 
     def as_float(self) -> float:
@@ -168,7 +240,7 @@ class Quantity:
 
         max_trade_size = Decimal(options.max_trade_size)
         contained_size = max_trade_size / price
-        contained_size = contained_size.quantize(Decimal(10)**-self.instrument.precision, rounding=ROUND_DOWN)
+        contained_size = contained_size.quantize(_quantum(self.instrument.precision), rounding=ROUND_DOWN)
         return Quantity(self.instrument, contained_size, self.path_id)
 
     @staticmethod
@@ -204,7 +276,7 @@ class Quantity:
             If the operation is not valid.
         """
         if isinstance(left, Quantity) and isinstance(right, Quantity):
-            if left.instrument != right.instrument:
+            if left.instrument is not right.instrument and left.instrument != right.instrument:
                 raise IncompatibleInstrumentOperation(left, right)
 
             if (left.path_id and right.path_id) and (left.path_id != right.path_id):
@@ -254,7 +326,10 @@ class Quantity:
         bool
             The result of performing `op` on with `left` and `right`.
         """
+        fixed = Quantity.fixed_point and isinstance(left, Quantity) and isinstance(right, Quantity)
         left, right = Quantity.validate(left, right)
+        if fixed and left.units is not None and right.units is not None:
+            return op(left._units, right._units)
         boolean = op(left.size, right.size)
         return boolean
 
@@ -278,7 +353,11 @@ class Quantity:
         `Quantity`
             The result of performing `op` on with `left` and `right`.
         """
+        fixed = (op in _EXACT_OPS and Quantity.fixed_point
+                 and isinstance(left, Quantity) and isinstance(right, Quantity))
         left, right = Quantity.validate(left, right)
+        if fixed and left.units is not None and right.units is not None:
+            return Quantity._from_units(left.instrument, op(left._units, right._units), left.path_id)
         size = op(left.size, right.size)
         return Quantity(left.instrument, size, left.path_id)
 
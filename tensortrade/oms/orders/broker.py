@@ -11,18 +11,29 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License
-from typing import List, Dict
+import heapq
+
+from itertools import count
+from typing import List, Dict, Tuple
 from collections import OrderedDict
 
 from tensortrade.core.base import TimeIndexed
 from tensortrade.oms.orders.order import Order, OrderStatus
 from tensortrade.oms.orders.order_listener import OrderListener
+from tensortrade.oms.orders.triggers import TriggerIndex
 
 
 class Broker(OrderListener, TimeIndexed):
     """A broker for handling the execution of orders on multiple exchanges.
     Orders are kept in a virtual order book until they are ready to be executed.
 
+    The orders waiting to be executed are indexed by id, and the orders that
+    can expire are kept in a heap by their end, so that an update only costs
+    the number of open orders, however many orders were executed before. The
+    orders whose criteria are bounded by price levels, like stops and limits,
+    are also indexed by these levels and only checked once the price crosses
+    one of them. The other orders are checked at every update.
+
     Attributes
     ----------
     unexecuted : `List[Order]`
@@ -37,9 +48,25 @@ class Broker(OrderListener, TimeIndexed):
     """
 
     def __init__(self):
-        self.unexecuted = []
-        self.executed = {}
-        self.trades = OrderedDict()
+        self.reset()
+
+    @property
+    def unexecuted(self) -> 'List[Order]':
+        return [order for _, order in self._unexecuted.values()]
+
+    def _pending(self) -> 'List[Order]':
+        pending = dict(self._untriggered)
+        pending.update(self._triggers.candidates())
+        return [order for _, order in sorted(pending.values(), key=lambda p: p[0])]
+
+    def _discard(self, order: "Order") -> None:
+        del self._unexecuted[order.id]
+        self._untriggered.pop(order.id, None)
+        self._triggers.remove(order)
+
+    def _track_expiry(self, order: "Order") -> None:
+        if order.end:
+            heapq.heappush(self._expiries, (order.end, next(self._sequence), order))
 
     def submit(self, order: "Order") -> None:
         """Submits an order to the broker.
@@ -51,7 +78,11 @@ class Broker(OrderListener, TimeIndexed):
         order : `Order`
             The order to be submitted.
         """
-        self.unexecuted += [order]
+        seq = next(self._sequence)
+        self._unexecuted[order.id] = (seq, order)
+        if not self._triggers.add(order, seq):
+            self._untriggered[order.id] = (seq, order)
+        self._track_expiry(order)
 
     def cancel(self, order: "Order") -> None:
         """Cancels an order.
@@ -64,8 +95,8 @@ class Broker(OrderListener, TimeIndexed):
         if order.status == OrderStatus.CANCELLED:
             raise Warning(f"Order {order.id} has already been cancelled.")
 
-        if order in self.unexecuted:
-            self.unexecuted.remove(order)
+        if self._unexecuted.get(order.id, (None, None))[1] is order:
+            self._discard(order)
 
         order.cancel()
 
@@ -79,20 +110,26 @@ class Broker(OrderListener, TimeIndexed):
         Then the broker will find any orders that are active, but expired, and
         proceed to cancel them.
         """
-        executed_ids = []
-        for order in self.unexecuted:
-            if order.is_executable:
-                executed_ids.append(order.id)
-                self.executed[order.id] = order
-
-                order.attach(self)
-                order.execute(t_signal)
-        
-        for order_id in executed_ids:
-            self.unexecuted.remove(self.executed[order_id])
-
-        for order in self.unexecuted + list(self.executed.values()):
-            if order.is_active and order.is_expired:
+        # Orders submitted while executing others are checked in the same
+        # update.
+        checked = set()
+        orders = self._pending()
+        while orders:
+            for order in orders:
+                checked.add(order.id)
+                if order.id in self._unexecuted and order.is_executable:
+                    self._discard(order)
+                    self.executed[order.id] = order
+
+                    order.attach(self)
+                    order.execute(t_signal)
+            orders = [o for o in self._pending() if o.id not in checked]
+
+        # The orders are popped as they expire, whether they were executed or
+        # not. The ones that are no longer active are only dropped.
+        while self._expiries and self._expiries[0][2].is_expired:
+            _, _, order = heapq.heappop(self._expiries)
+            if order.is_active:
                 self.cancel(order)
 
     def on_fill(self, order: "Order", trade: "Trade", t_signal: bool) -> None:
@@ -115,6 +152,7 @@ class Broker(OrderListener, TimeIndexed):
                 if next_order:
                     if next_order.is_executable:
                         self.executed[next_order.id] = next_order
+                        self._track_expiry(next_order)
 
                         next_order.attach(self)
                         next_order.execute(t_signal)
@@ -123,6 +161,10 @@ class Broker(OrderListener, TimeIndexed):
 
     def reset(self) -> None:
         """Resets the broker."""
-        self.unexecuted = []
+        self._unexecuted: 'Dict[str, Tuple[int, Order]]' = {}
+        self._untriggered: 'Dict[str, Tuple[int, Order]]' = {}
+        self._triggers = TriggerIndex()
+        self._expiries: 'List[Tuple[int, int, Order]]' = []
+        self._sequence = count()
         self.executed = {}
         self.trades = OrderedDict()
@@ -154,7 +154,7 @@ def hidden_limit_order(side: "TradeSide",
         portfolio=portfolio,
         price=limit_price,
         t_signal=t_signal,
-        criteria=Limit(limit_price=limit_price),
+        criteria=Limit(limit_price=limit_price, t_signal=t_signal),
         start=start,
         end=end,
     )
@@ -16,10 +16,11 @@
 import operator
 
 from abc import abstractmethod, ABCMeta
-from typing import Callable, Union, TypeVar
+from typing import Callable, List, Optional, Union, TypeVar
 from enum import Enum
 
 from tensortrade.oms.orders import TradeSide, Order
+from tensortrade.oms.orders.triggers import Trigger, triggers_of
 from tensortrade.oms.exchanges import Exchange
 
 
@@ -44,6 +45,24 @@ class Criteria(object, metaclass=ABCMeta):
         """
         raise NotImplementedError
 
+    def triggers(self, order: 'Order') -> 'Optional[List[Trigger]]':
+        """Gets the price levels one of which must be crossed for the criteria
+        to be satisfied by `order`, so the order can be indexed by them instead
+        of being checked at every step.
+
+        Parameters
+        ----------
+        order : `Order`
+            An order.
+
+        Returns
+        -------
+        `List[Trigger]`, optional
+            The price levels, or `None` if the criteria cannot be bounded by
+            price levels.
+        """
+        return None
+
     def __call__(self, order: 'Order', exchange: 'Exchange') -> bool:
         if not exchange.is_pair_tradable(order.pair):
             return False
@@ -96,6 +115,20 @@ class CriteriaBinOp(Criteria):
 
         return self.op(left, right)
 
+    def triggers(self, order: 'Order') -> 'Optional[List[Trigger]]':
+        left = triggers_of(self.left, order)
+        right = triggers_of(self.right, order)
+
+        # Both sides are satisfied if a conjunction is, so either bounds it.
+        if self.op is operator.and_:
+            return left if left is not None else right
+
+        # At least one side is satisfied if a disjunction is.
+        if self.op in (operator.or_, operator.xor) and left is not None and right is not None:
+            return left + right
+
+        return None
+
     def __str__(self) -> str:
         is_left_op = isinstance(self.left, CriteriaBinOp)
         is_right_op = isinstance(self.right, CriteriaBinOp)
@@ -141,19 +174,29 @@ class Limit(Criteria):
     ----------
     limit_price : float
         The quote price to check for execution.
+    t_signal : bool, default True
+        Whether to check the price of the simulation or the online price.
     """
 
-    def __init__(self, limit_price: float) -> None:
+    def __init__(self, limit_price: float, t_signal: bool = True) -> None:
         self.limit_price = limit_price
+        self._t_signal = t_signal
 
     def check(self, order: 'Order', exchange: 'Exchange') -> bool:
-        price = exchange.quote_price(order.pair)
+        price = exchange.quote_price(order.pair, self._t_signal)
 
         buy_satisfied = (order.side == TradeSide.BUY and price <= self.limit_price)
         sell_satisfied = (order.side == TradeSide.SELL and price >= self.limit_price)
 
         return buy_satisfied or sell_satisfied
 
+    def triggers(self, order: 'Order') -> 'Optional[List[Trigger]]':
+        if order.side == TradeSide.BUY:
+            return [Trigger(self.limit_price, False, self._t_signal)]
+        if order.side == TradeSide.SELL:
+            return [Trigger(self.limit_price, True, self._t_signal)]
+        return None
+
     def __str__(self) -> str:
         return f"<Limit: price={self.limit_price}>"
 
@@ -201,6 +244,15 @@ class Stop(Criteria):
             
         return (is_take_profit or is_stop_loss) and percent >= self.percent
 
+    def triggers(self, order: 'Order') -> 'Optional[List[Trigger]]':
+        price = order.price if self._t_signal else getattr(order, "price_online", None)
+        if price is None or price <= 0:
+            return None
+
+        if self.direction == StopDirection.UP:
+            return [Trigger(float(price) * (1 + self.percent), True, self._t_signal)]
+        return [Trigger(float(price) * (1 - self.percent), False, self._t_signal)]
+
     def __str__(self):
         return f"<Stop: direction={self.direction}, percent={self.percent}>"
 
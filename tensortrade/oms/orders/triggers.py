@@ -0,0 +1,165 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from typing import Dict, List, Optional, Tuple
+
+
+Trigger = namedtuple('Trigger', ['price', 'above', 't_signal'])
+Trigger.__doc__ = """A price level an order criteria can only be satisfied
+beyond, at or above it if `above` is true and at or below it otherwise, with
+the price quoted for `t_signal`."""
+
+
+def triggers_of(criteria: 'Callable[[Order, Exchange], bool]', order: 'Order') -> 'Optional[List[Trigger]]':
+    """Gets the price levels one of which must be crossed for a criteria to be
+    satisfied by an order.
+
+    Parameters
+    ----------
+    criteria : `Callable[[Order, Exchange], bool]`
+        The criteria of the order.
+    order : `Order`
+        The order.
+
+    Returns
+    -------
+    `List[Trigger]`, optional
+        The price levels, or `None` if the criteria cannot be bounded by price
+        levels.
+    """
+    triggers = getattr(type(criteria), "triggers", None)
+    if triggers is None:
+        return None
+    return triggers(criteria, order)
+
+
+class _Book:
+
+    def __init__(self, exchange_pair: 'ExchangePair', t_signal: bool) -> None:
+        self.exchange_pair = exchange_pair
+        self.t_signal = t_signal
+        self.above = []
+        self.below = []
+
+    def __len__(self) -> int:
+        return len(self.above) + len(self.below)
+
+
+class TriggerIndex:
+    """An index of pending orders by the price levels that trigger them.
+
+    The levels are kept sorted for each exchange pair, so finding the orders
+    whose levels were crossed by the current price costs a bisection per pair
+    and the number of these orders, instead of evaluating the criteria of
+    every pending order.
+
+    Parameters
+    ----------
+    tolerance : float, default 1e-9
+        The relative margin by which a level is considered crossed early, so
+        rounding never hides an order whose criteria is satisfied. The criteria
+        of the orders found is still evaluated in full.
+    """
+
+    def __init__(self, tolerance: float = 1e-9) -> None:
+        self.tolerance = tolerance
+        self._books: 'Dict[Tuple[ExchangePair, bool], _Book]' = {}
+        self._entries: 'Dict[str, List[Tuple[_Book, list, tuple]]]' = {}
+
+    def __contains__(self, order: 'Order') -> bool:
+        return order.id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, order: 'Order', seq: int) -> bool:
+        """Indexes an order by the levels of its criteria.
+
+        Parameters
+        ----------
+        order : `Order`
+            The order to index.
+        seq : int
+            The sequence number of the order, ordering the orders found.
+
+        Returns
+        -------
+        bool
+            Whether the order was indexed. Orders without criteria, or with a
+            criteria that cannot be bounded by price levels, are not.
+        """
+        if order.criteria is None:
+            return False
+
+        triggers = triggers_of(order.criteria, order)
+        if not triggers:
+            return False
+
+        entries = []
+        for trigger in triggers:
+            key = (order.exchange_pair, trigger.t_signal)
+            book = self._books.get(key)
+            if book is None:
+                book = self._books[key] = _Book(order.exchange_pair, trigger.t_signal)
+
+            levels = book.above if trigger.above else book.below
+            entry = (float(trigger.price), seq, order)
+            insort(levels, entry)
+            entries += [(book, levels, entry)]
+
+        self._entries[order.id] = entries
+        return True
+
+    def remove(self, order: 'Order') -> None:
+        """Removes an order from the index, if it is indexed.
+
+        Parameters
+        ----------
+        order : `Order`
+            The order to remove.
+        """
+        for book, levels, entry in self._entries.pop(order.id, []):
+            i = bisect_left(levels, entry[:2])
+            del levels[i]
+            if len(book) == 0:
+                del self._books[(book.exchange_pair, book.t_signal)]
+
+    def candidates(self) -> 'Dict[str, Tuple[int, Order]]':
+        """Finds the orders with a level crossed by the current prices.
+
+        Returns
+        -------
+        `Dict[str, Tuple[int, Order]]`
+            The sequence number and the order of each order found, by id.
+        """
+        found = {}
+        for book in self._books.values():
+            exchange_pair = book.exchange_pair
+            price = float(exchange_pair.exchange.quote_price(exchange_pair.pair, book.t_signal))
+
+            n = bisect_right(book.above, (price * (1 + self.tolerance), float("inf")))
+            for _, seq, order in book.above[:n]:
+                found[order.id] = (seq, order)
+
+            m = bisect_left(book.below, (price * (1 - self.tolerance), float("-inf")))
+            for _, seq, order in book.below[m:]:
+                found[order.id] = (seq, order)
+
+        return found
+
+    def reset(self) -> None:
+        """Removes all the orders from the index."""
+        self._books = {}
+        self._entries = {}
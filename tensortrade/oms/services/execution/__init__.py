@@ -1,4 +1,5 @@
 from . import simulated 
+from . import matching
 # from . import ccxt 
 # from . import robinhood 
 # from . import interactive_brokers
@@ -0,0 +1,182 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def parse_ohlcv(ohlcv: list) -> 'pd.DataFrame':
+    """Parses the candles returned by a CCXT exchange.
+
+    Parameters
+    ----------
+    ohlcv : list
+        The candles, each a list of a timestamp in milliseconds, the open,
+        high, low, close and volume.
+
+    Returns
+    -------
+    `pd.DataFrame`
+        The candles, with their timestamps converted to dates.
+    """
+    candles = pd.DataFrame(ohlcv, columns=CandleBuffer.columns)
+    candles['date'] = pd.to_datetime(candles['date'], unit='ms')
+    return candles
+
+
+class CandleBuffer:
+    """A fixed-capacity, time-indexed buffer of OHLCV candles.
+
+    The candles are kept in preallocated arrays twice the size of the capacity,
+    each candle being written at its position in the ring and at the same
+    position one capacity further. The last candles are therefore always
+    contiguous in memory and can be read as a view without copying them, while
+    merging a batch of candles only costs the size of the batch.
+
+    Parameters
+    ----------
+    capacity : int
+        The maximum number of candles kept. Older candles are overwritten.
+
+    Attributes
+    ----------
+    size : int
+        The number of candles in the buffer.
+    """
+
+    columns = ['date', 'open', 'high', 'low', 'close', 'volume']
+
+    def __init__(self, capacity: int) -> None:
+        if capacity < 1:
+            raise ValueError("The capacity must be positive.")
+
+        self.capacity = capacity
+        self._dates = np.zeros(2 * capacity, dtype='datetime64[ms]')
+        self._values = np.zeros((2 * capacity, len(self.columns) - 1), dtype=np.float64)
+        self.reset()
+
+    @property
+    def last_date(self) -> 'np.datetime64':
+        """The date of the last candle, or `None` if the buffer is empty. (`np.datetime64`, read-only)"""
+        if self.size == 0:
+            return None
+        return self._dates[self._head + self.capacity - 1]
+
+    def merge(self, dates: 'np.ndarray', values: 'np.ndarray') -> int:
+        """Merges a batch of candles, keeping only the ones that are newer than
+        the last candle of the buffer.
+
+        Parameters
+        ----------
+        dates : `np.ndarray`
+            The dates of the candles, in ascending order.
+        values : `np.ndarray`
+            The open, high, low, close and volume of the candles, one row per
+            candle.
+
+        Returns
+        -------
+        int
+            The number of candles added.
+        """
+        dates = np.asarray(dates, dtype='datetime64[ms]')
+        values = np.asarray(values, dtype=np.float64)
+
+        if self.size > 0:
+            start = np.searchsorted(dates, self.last_date, side='right')
+            dates, values = dates[start:], values[start:]
+
+        added = len(dates)
+        if added > self.capacity:
+            dates, values = dates[-self.capacity:], values[-self.capacity:]
+
+        n = len(dates)
+        if n > 0:
+            positions = (self._head + np.arange(n)) % self.capacity
+            self._dates[positions] = dates
+            self._dates[positions + self.capacity] = dates
+            self._values[positions] = values
+            self._values[positions + self.capacity] = values
+
+            self._head = (self._head + n) % self.capacity
+            self.size = min(self.size + n, self.capacity)
+
+        return added
+
+    def merge_frame(self, candles: 'pd.DataFrame') -> int:
+        """Merges a data frame of candles with the columns of the buffer.
+
+        Parameters
+        ----------
+        candles : `pd.DataFrame`
+            The candles to merge, in ascending order of date.
+
+        Returns
+        -------
+        int
+            The number of candles added.
+        """
+        return self.merge(
+            candles['date'].to_numpy(dtype='datetime64[ms]'),
+            candles[self.columns[1:]].to_numpy(dtype=np.float64)
+        )
+
+    def view(self, k: int = None) -> 'Tuple[np.ndarray, np.ndarray]':
+        """Gets the last candles without copying them.
+
+        The arrays are views of the buffer, so they are overwritten by later
+        merges.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of last candles. Defaults to all the candles.
+
+        Returns
+        -------
+        `np.ndarray`
+            The dates of the candles.
+        `np.ndarray`
+            The open, high, low, close and volume of the candles.
+        """
+        k = self.size if k is None else min(k, self.size)
+        end = self._head + self.capacity
+        return self._dates[end - k:end], self._values[end - k:end]
+
+    def frame(self, k: int = None) -> 'pd.DataFrame':
+        """Gets the last candles as a data frame.
+
+        The price and volume columns are backed by the buffer when pandas does
+        not need to copy them.
+
+        Parameters
+        ----------
+        k : int, optional
+            The number of last candles. Defaults to all the candles.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The candles, with the columns of the buffer.
+        """
+        dates, values = self.view(k)
+        frame = pd.DataFrame(values, columns=self.columns[1:], copy=False)
+        frame.insert(0, 'date', dates)
+        return frame
+
+    def reset(self) -> None:
+        """Empties the buffer."""
+        self._head = 0
+        self.size = 0
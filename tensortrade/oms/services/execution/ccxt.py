@@ -21,14 +21,33 @@ from typing import List, Union
 from ccxt import BadRequest
 
 from tensortrade.oms.exchanges import Exchange
+from tensortrade.oms.services.execution.candles import CandleBuffer, parse_ohlcv
+from tensortrade.oms.services.execution.scheduler import BarScheduler
 from tensortrade.oms.instruments import TradingPair, BTC, USDT, XRP
 
 
 class CCXTExchange():
-    """An exchange for trading on CCXT-supported cryptocurrency exchanges."""
+    """An exchange for trading on CCXT-supported cryptocurrency exchanges.
+
+    Parameters
+    ----------
+    exchange : `Union[ccxt.Exchange, str]`
+        The CCXT exchange, or the name of one. Any client implementing the
+        `fetch_ohlcv`, `fetch_ticker` and `load_markets` methods of CCXT can be
+        used in place of a CCXT exchange.
+    credentials : dict, optional
+        The API key and secret of the account.
+    capacity : int, default 1000
+        The maximum number of candles kept for the observations.
+    scheduler : `BarScheduler`, optional
+        The scheduler deciding when to fetch the candles. Defaults to a
+        scheduler of the timeframe of the exchange.
+    """
     def __init__(self, 
                  exchange: Union[ccxt.Exchange, str],
-                 credentials: dict):
+                 credentials: dict = None,
+                 capacity: int = 1000,
+                 scheduler: BarScheduler = None):
         self._exchange_str = exchange
         self._exchange = getattr(
             ccxt, self._exchange_str
@@ -37,8 +56,9 @@ class CCXTExchange():
         
         self._exchange.enableRateLimit = True
         
-        self._exchange.apiKey = credentials['apiKey']
-        self._exchange.secret = credentials['secret']
+        if credentials:
+            self._exchange.apiKey = credentials['apiKey']
+            self._exchange.secret = credentials['secret']
         self._base_instrument = USDT; self._quote_instrument = BTC
         
         #self._BTC_USDT_PAIR = TradingPair(USDT, BTC)
@@ -49,11 +69,13 @@ class CCXTExchange():
             self.pair_to_symbol(pair) for pair in self._observation_pairs
         ]
         self._timeframe = '5m'
-        self._Obs_DB = pd.DataFrame([], columns=['date', 'open', 'high', 'low', 'close', 'volume'])
+        self.scheduler = scheduler or BarScheduler(self._timeframe)
+        self._candles = CandleBuffer(capacity)
             
         self._last_raw = self.UTC_Time()
         observations = self.fetch_ohlcv(window_size=24)
-        self._ft = observations.loc[len(observations)-1, 'date']
+        self._candles.merge_frame(observations)
+        self._ft = observations['date'].iloc[-1]
 
         self._exchange.load_markets()
         
@@ -64,56 +86,76 @@ class CCXTExchange():
         return datetime.strptime(now_utc, "%Y-%m-%d %H:%M:%S")
     
     
-    def fetch_ohlcv(self, window_size):
-        self.ohlcv = self._exchange.fetch_ohlcv(
-            str(self._observation_symbols[0]),
-            timeframe=self._timeframe,
-            limit=window_size+1,
-        )
-        
-        observations = pd.DataFrame.from_records(self.ohlcv)
-        observations.columns = ['date', 'open', 'high', 'low', 'close', 'volume']
-        for i in range(0, len(observations)):
-            observations.loc[i, 'date'] = datetime.utcfromtimestamp(
-                observations.loc[i, 'date']/1000
-            )
-        
-        while observations.loc[len(observations)-1, 'date'] == self._last_raw:
+    def parse_ohlcv(self, ohlcv: list) -> pd.DataFrame:
+        """Parses the candles returned by the exchange.
+
+        Parameters
+        ----------
+        ohlcv : list
+            The candles, each a list of a timestamp in milliseconds, the open,
+            high, low, close and volume.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The candles, with their timestamps converted to dates.
+        """
+        return parse_ohlcv(ohlcv)
+
+    def fetch_ohlcv(self, window_size: int, since: int = None) -> pd.DataFrame:
+        """Fetches the last closed candles of the exchange.
+
+        The candles are fetched until the exchange has started a new candle,
+        which closes the candles before it, backing off between the attempts
+        as set by the scheduler.
+
+        Parameters
+        ----------
+        window_size : int
+            The number of closed candles to fetch.
+        since : int, optional
+            The timestamp in milliseconds of the first candle to fetch. If
+            given, only the candles from this timestamp on are fetched.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The closed candles.
+        """
+        def fetch():
             self.ohlcv = self._exchange.fetch_ohlcv(
                 str(self._observation_symbols[0]),
                 timeframe=self._timeframe,
+                since=since,
                 limit=window_size+1,
             )
-            
-            observations = pd.DataFrame.from_records(self.ohlcv)
-            observations.columns = ['date', 'open', 'high', 'low', 'close', 'volume']
-            for i in range(0, len(observations)):
-                observations.loc[i, 'date'] = datetime.utcfromtimestamp(
-                    observations.loc[i, 'date']/1000
-                )
-        self._last_raw = observations.loc[len(observations)-1, 'date']
+            return self.parse_ohlcv(self.ohlcv)
+
+        def ready(observations):
+            return len(observations) > 0 and observations['date'].iloc[-1] != self._last_raw
+
+        observations = self.scheduler.poll(fetch, ready)
+        self._last_raw = observations['date'].iloc[-1]
         observations = observations.iloc[:-1,:]
         return observations
 
     
     def next_observation(self, window_size: int) -> pd.DataFrame:
-        self._ft = self._ft + timedelta(minutes=5)
-        self._ft = datetime.strftime(self._ft, "%Y-%m-%d %H:%M:00")
-        self._ft = datetime.strptime(self._ft, "%Y-%m-%d %H:%M:00")
-        while self._ft > self.UTC_Time():
-            pass     
-            
-        observations = self.fetch_ohlcv(window_size)
-        self._ft = observations.loc[len(observations)-1, 'date']
-
-        self._Obs_DB = pd.concat(
-            [self._Obs_DB, observations],
-            ignore_index=True,
-            sort=False
-        )
-        self._Obs_DB.drop_duplicates(subset=['date'], keep='first', inplace=True)
-        self._Obs_DB = self._Obs_DB.reset_index(drop=True)
-        return self._Obs_DB
+        # Sleeps until the open candle closes instead of polling for it.
+        self.scheduler.wait_for_close(pd.Timestamp(self._last_raw).timestamp())
+
+        # Once the buffer holds a full window, only the candles after the last
+        # known one are requested.
+        since = None
+        if self._candles.size >= window_size:
+            since = int(self._candles.last_date.astype('int64')) + 1
+
+        observations = self.fetch_ohlcv(window_size, since=since)
+        if len(observations) > 0:
+            self._ft = observations['date'].iloc[-1]
+
+        self._candles.merge_frame(observations)
+        return self._candles.frame()
 
     
     def pair_to_symbol(self, 
@@ -0,0 +1,315 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+import asyncio
+import time
+
+from typing import Any, Awaitable, Callable, Dict, List, Union
+
+import ccxt.async_support as ccxt_async
+import pandas as pd
+
+from tensortrade.feed.core import Stream
+from tensortrade.feed.core.feed import PushFeed
+from tensortrade.oms.instruments import TradingPair
+from tensortrade.oms.services.execution.candles import CandleBuffer, parse_ohlcv
+from tensortrade.oms.services.execution.scheduler import BarScheduler
+
+
+class RateLimiter:
+    """A token bucket limiting the rate of the requests made to an exchange.
+
+    The limiter is shared by all the concurrent requests of an exchange, so
+    fetching many symbols at once does not exceed the rate allowed by the
+    exchange.
+
+    Parameters
+    ----------
+    rate : float
+        The number of requests allowed per second.
+    burst : int, default 1
+        The number of requests that can be made at once after being idle.
+    clock : `Callable[[], float]`, optional
+        The function giving the time in seconds. Defaults to `time.monotonic`.
+    sleep : `Callable[[float], Awaitable[None]]`, optional
+        The coroutine function to sleep with. Defaults to `asyncio.sleep`.
+    """
+
+    def __init__(self,
+                 rate: float,
+                 burst: int = 1,
+                 clock: 'Callable[[], float]' = None,
+                 sleep: 'Callable[[float], Awaitable[None]]' = None) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock or time.monotonic
+        self.sleep = sleep or asyncio.sleep
+        self.tokens = float(burst)
+        self.updated = self.clock()
+        self._lock = None
+
+    async def acquire(self) -> None:
+        """Waits until a request can be made."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            now = self.clock()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens < 1:
+                await self.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1.0
+                self.updated = self.clock()
+
+            self.tokens -= 1
+
+    async def __aenter__(self) -> 'RateLimiter':
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        pass
+
+
+class AsyncCCXTExchange:
+    """An exchange fetching the candles and tickers of many symbols of a
+    CCXT-supported cryptocurrency exchange concurrently.
+
+    All the requests go through one asynchronous client, which reuses its
+    connections, and share a rate limiter and a bound on the number of
+    requests in flight. The candles of each symbol are kept in a
+    `CandleBuffer` and, once a full window is buffered, only the new candles
+    are requested.
+
+    Parameters
+    ----------
+    exchange : `Union[ccxt.async_support.Exchange, str]`
+        The asynchronous CCXT exchange, or the name of one. Any client
+        implementing the coroutines `fetch_ohlcv` and `fetch_ticker` of CCXT can
+        be used in place of a CCXT exchange.
+    symbols : `List[str]`
+        The symbols to fetch, e.g. `XRP/USDT`.
+    timeframe : str, default "5m"
+        The timeframe of the candles.
+    credentials : dict, optional
+        The API key and secret of the account.
+    capacity : int, default 1000
+        The maximum number of candles kept for each symbol.
+    rate : float, optional
+        The number of requests allowed per second. Defaults to the rate limit
+        of the client, if it has one.
+    max_concurrency : int, default 10
+        The maximum number of requests in flight.
+    scheduler : `BarScheduler`, optional
+        The scheduler deciding when to fetch the candles. Only its timing is
+        used; the waiting is done with `sleep`.
+    sleep : `Callable[[float], Awaitable[None]]`, optional
+        The coroutine function to sleep with. Defaults to `asyncio.sleep`.
+    """
+
+    def __init__(self,
+                 exchange: 'Union[ccxt_async.Exchange, str]',
+                 symbols: 'List[str]',
+                 timeframe: str = "5m",
+                 credentials: dict = None,
+                 capacity: int = 1000,
+                 rate: float = None,
+                 max_concurrency: int = 10,
+                 scheduler: 'BarScheduler' = None,
+                 sleep: 'Callable[[float], Awaitable[None]]' = None) -> None:
+        if isinstance(exchange, str):
+            exchange = getattr(ccxt_async, exchange)()
+            # The requests are throttled by the shared rate limiter instead.
+            exchange.enableRateLimit = False
+        self._exchange = exchange
+
+        if credentials:
+            self._exchange.apiKey = credentials['apiKey']
+            self._exchange.secret = credentials['secret']
+
+        if rate is None and getattr(self._exchange, "rateLimit", None):
+            rate = 1000 / self._exchange.rateLimit
+
+        self.symbols = list(symbols)
+        self.timeframe = timeframe
+        self.scheduler = scheduler or BarScheduler(timeframe)
+        self.sleep = sleep or asyncio.sleep
+        self.limiter = RateLimiter(rate, sleep=self.sleep) if rate else None
+        self.candles = {symbol: CandleBuffer(capacity) for symbol in self.symbols}
+
+        self._max_concurrency = max_concurrency
+        self._semaphore = None
+        self._last_raw = {symbol: None for symbol in self.symbols}
+
+    @staticmethod
+    def pair_to_symbol(pair: 'TradingPair') -> str:
+        return '{}/{}'.format(pair.quote.symbol, pair.base.symbol)
+
+    async def _request(self, method: str, *args, **kwargs) -> 'Any':
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async with self._semaphore:
+            if self.limiter:
+                await self.limiter.acquire()
+            return await getattr(self._exchange, method)(*args, **kwargs)
+
+    async def fetch_ohlcv(self, symbol: str, window_size: int) -> 'pd.DataFrame':
+        """Fetches the new closed candles of a symbol into its buffer.
+
+        Parameters
+        ----------
+        symbol : str
+            The symbol to fetch.
+        window_size : int
+            The number of closed candles to fetch if the buffer does not hold
+            that many yet.
+
+        Returns
+        -------
+        `pd.DataFrame`
+            The closed candles that were fetched.
+        """
+        buffer = self.candles[symbol]
+
+        since = None
+        if buffer.size >= window_size:
+            since = int(buffer.last_date.astype('int64')) + 1
+
+        delays = self.scheduler.delays()
+        while True:
+            ohlcv = await self._request(
+                'fetch_ohlcv',
+                symbol,
+                timeframe=self.timeframe,
+                since=since,
+                limit=window_size+1
+            )
+            observations = parse_ohlcv(ohlcv)
+            if len(observations) > 0 and observations['date'].iloc[-1] != self._last_raw[symbol]:
+                break
+            await self.sleep(next(delays))
+
+        self._last_raw[symbol] = observations['date'].iloc[-1]
+        observations = observations.iloc[:-1]
+        buffer.merge_frame(observations)
+        return observations
+
+    async def fetch_tickers(self) -> 'Dict[str, dict]':
+        """Fetches the tickers of all the symbols concurrently.
+
+        Returns
+        -------
+        `Dict[str, dict]`
+            The ticker of each symbol.
+        """
+        tickers = await asyncio.gather(*[
+            self._request('fetch_ticker', symbol) for symbol in self.symbols
+        ])
+        return dict(zip(self.symbols, tickers))
+
+    async def quote_price(self, pair: 'TradingPair') -> float:
+        """Fetches the last price of a trading pair.
+
+        Parameters
+        ----------
+        pair : `TradingPair`
+            The trading pair to quote.
+
+        Returns
+        -------
+        float
+            The last price of the pair.
+        """
+        ticker = await self._request('fetch_ticker', self.pair_to_symbol(pair))
+        return float(ticker['close'])
+
+    async def next_bar(self, window_size: int = 1) -> 'Dict[str, pd.DataFrame]':
+        """Waits for the open candles to close and fetches the new candles of
+        all the symbols concurrently.
+
+        Parameters
+        ----------
+        window_size : int, default 1
+            The number of closed candles to fetch for the symbols whose buffer
+            does not hold that many yet.
+
+        Returns
+        -------
+        `Dict[str, pd.DataFrame]`
+            The buffered candles of each symbol.
+        """
+        opened = [t for t in self._last_raw.values() if t is not None]
+        if opened:
+            delay = self.scheduler.until_close(pd.Timestamp(min(opened)).timestamp())
+            if delay > 0:
+                await self.sleep(delay)
+
+        await asyncio.gather(*[
+            self.fetch_ohlcv(symbol, window_size) for symbol in self.symbols
+        ])
+        return {symbol: self.candles[symbol].frame() for symbol in self.symbols}
+
+    def streams(self) -> 'List[Stream[float]]':
+        """Creates the placeholders to build a `PushFeed` on.
+
+        Returns
+        -------
+        `List[Stream[float]]`
+            A placeholder named `<symbol>:<column>` for the open, high, low,
+            close and volume of each symbol.
+        """
+        return [
+            Stream.placeholder(dtype="float").rename("{}:{}".format(symbol, column))
+            for symbol in self.symbols
+            for column in CandleBuffer.columns[1:]
+        ]
+
+    async def push(self, feed: 'PushFeed', window_size: int = 1) -> dict:
+        """Fetches the next bar of all the symbols and pushes its last closed
+        candles to a feed.
+
+        Parameters
+        ----------
+        feed : `PushFeed`
+            A feed built on the placeholders of `streams`.
+        window_size : int, default 1
+            The number of closed candles to fetch for the symbols whose buffer
+            does not hold that many yet.
+
+        Returns
+        -------
+        dict
+            The next data point generated from the feed.
+        """
+        await self.next_bar(window_size)
+
+        data = {}
+        for symbol in self.symbols:
+            _, values = self.candles[symbol].view(1)
+            for j, column in enumerate(CandleBuffer.columns[1:]):
+                data["{}:{}".format(symbol, column)] = float(values[-1, j])
+        return feed.push(data)
+
+    async def close(self) -> None:
+        """Closes the connections of the client."""
+        if hasattr(self._exchange, "close"):
+            await self._exchange.close()
+
+    async def __aenter__(self) -> 'AsyncCCXTExchange':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
@@ -0,0 +1,525 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+import logging
+
+from decimal import Decimal
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+
+from tensortrade.core import Clock
+from tensortrade.feed.core import Stream
+from tensortrade.oms.wallets import Wallet
+from tensortrade.oms.exchanges import ExchangeOptions
+from tensortrade.oms.instruments import Quantity
+from tensortrade.oms.orders import Order, Trade, TradeType, TradeSide
+
+
+class OrderBook:
+    """A level 2 snapshot of the order book of a trading pair.
+
+    The levels are kept in NumPy arrays, the bids by descending price and the
+    asks by ascending price, so walking the book for an order is a cumulative
+    sum and a bisection. Taking liquidity reduces the sizes of the levels in
+    place, which lets the orders of a step share the depth of one snapshot.
+
+    Parameters
+    ----------
+    bids : `np.ndarray`
+        The price and size of each bid level, one row per level.
+    asks : `np.ndarray`
+        The price and size of each ask level, one row per level.
+    """
+
+    def __init__(self, bids: 'np.ndarray', asks: 'np.ndarray') -> None:
+        bids = np.asarray(bids, dtype=np.float64).reshape(-1, 2)
+        asks = np.asarray(asks, dtype=np.float64).reshape(-1, 2)
+
+        bids = bids[np.argsort(-bids[:, 0], kind='stable')]
+        asks = asks[np.argsort(asks[:, 0], kind='stable')]
+
+        self.bid_prices = bids[:, 0].copy()
+        self.bid_sizes = bids[:, 1].copy()
+        self.ask_prices = asks[:, 0].copy()
+        self.ask_sizes = asks[:, 1].copy()
+
+    @classmethod
+    def from_ccxt(cls, book: dict) -> 'OrderBook':
+        """Creates a snapshot from an order book fetched with CCXT.
+
+        Parameters
+        ----------
+        book : dict
+            The order book, with `bids` and `asks` lists of price and size.
+
+        Returns
+        -------
+        `OrderBook`
+            The snapshot of the order book.
+        """
+        return cls([level[:2] for level in book['bids']], [level[:2] for level in book['asks']])
+
+    @classmethod
+    def synthesize(cls,
+                   price: float,
+                   spread: float = 0.001,
+                   levels: int = 20,
+                   tick: float = 0.001,
+                   size: float = 1.0,
+                   growth: float = 0.1) -> 'OrderBook':
+        """Creates a snapshot with synthetic depth around a price.
+
+        Parameters
+        ----------
+        price : float
+            The mid price.
+        spread : float, default 0.001
+            The spread between the best bid and ask, relative to the price.
+        levels : int, default 20
+            The number of levels on each side.
+        tick : float, default 0.001
+            The distance between two levels, relative to the price.
+        size : float, default 1.0
+            The size of the best levels, in the quote instrument.
+        growth : float, default 0.1
+            The rate the size of the levels grows at away from the mid price.
+
+        Returns
+        -------
+        `OrderBook`
+            The synthetic snapshot.
+        """
+        price = float(price)
+        offsets = spread / 2 + tick * np.arange(levels)
+        sizes = size * (1 + growth) ** np.arange(levels)
+
+        bids = np.column_stack([price * (1 - offsets), sizes])
+        asks = np.column_stack([price * (1 + offsets), sizes])
+        return cls(bids, asks)
+
+    @property
+    def mid(self) -> float:
+        """The mid price between the best bid and ask. (float, read-only)"""
+        return (self.best(TradeSide.BUY) + self.best(TradeSide.SELL)) / 2
+
+    def _side(self, side: 'TradeSide') -> 'Tuple[np.ndarray, np.ndarray, np.ndarray]':
+        # The levels an order on `side` takes liquidity from, with the keys
+        # sorting them in ascending order.
+        if side == TradeSide.BUY:
+            return self.ask_prices, self.ask_sizes, self.ask_prices
+        return self.bid_prices, self.bid_sizes, -self.bid_prices
+
+    def take(self,
+             side: 'TradeSide',
+             amount: float,
+             limit: float = None,
+             notional: bool = False) -> 'Tuple[float, float]':
+        """Takes liquidity from the book, level by level.
+
+        Parameters
+        ----------
+        side : `TradeSide`
+            The side of the order taking liquidity. A buy takes the asks and
+            a sell takes the bids.
+        amount : float
+            The amount to take, in the quote instrument, or in the base
+            instrument if `notional`.
+        limit : float, optional
+            The worst price to take liquidity at.
+        notional : bool, default False
+            Whether `amount` is a notional value rather than a size.
+
+        Returns
+        -------
+        float
+            The size taken, in the quote instrument.
+        float
+            The notional value of the size taken, in the base instrument.
+        """
+        prices, sizes, keys = self._side(side)
+
+        n = len(prices)
+        if limit is not None:
+            key = limit if side == TradeSide.BUY else -limit
+            n = np.searchsorted(keys, key, side='right')
+        if n == 0 or amount <= 0:
+            return 0.0, 0.0
+
+        values = sizes[:n] * prices[:n] if notional else sizes[:n]
+        cumulative = np.cumsum(values)
+
+        # The levels before k are taken in full, and level k in part.
+        k = int(np.searchsorted(cumulative, amount, side='left'))
+        taken = sizes[:k].copy()
+        if k < n:
+            rest = amount - (cumulative[k - 1] if k > 0 else 0.0)
+            partial = rest / prices[k] if notional else rest
+            taken = np.append(taken, min(partial, sizes[k]))
+
+        m = len(taken)
+        sizes[:m] -= taken
+        np.maximum(sizes[:m], 0, out=sizes[:m])
+
+        return float(taken.sum()), float(taken @ prices[:m])
+
+    def sizes_at(self, side: 'TradeSide', prices: 'np.ndarray') -> 'np.ndarray':
+        """Gets the sizes displayed at some prices of one side of the book.
+
+        Parameters
+        ----------
+        side : `TradeSide`
+            The side of the book, the bids for a buy and the asks for a sell.
+        prices : `np.ndarray`
+            The prices to look up.
+
+        Returns
+        -------
+        `np.ndarray`
+            The size displayed at each price, or 0 if there is no level at it.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        if side == TradeSide.BUY:
+            levels, sizes, keys, lookup = self.bid_prices, self.bid_sizes, -self.bid_prices, -prices
+        else:
+            levels, sizes, keys, lookup = self.ask_prices, self.ask_sizes, self.ask_prices, prices
+
+        if len(levels) == 0:
+            return np.zeros(len(prices))
+
+        i = np.minimum(np.searchsorted(keys, lookup, side='left'), len(levels) - 1)
+        return np.where(np.isclose(levels[i], prices, rtol=1e-12, atol=0), sizes[i], 0.0)
+
+    def best(self, side: 'TradeSide') -> float:
+        """Gets the best price an order on `side` can take liquidity at.
+
+        Parameters
+        ----------
+        side : `TradeSide`
+            The side of the order.
+
+        Returns
+        -------
+        float
+            The best ask for a buy or the best bid for a sell, or `NaN` if
+            that side of the book is empty.
+        """
+        prices, sizes, _ = self._side(side)
+        available = np.flatnonzero(sizes > 0)
+        return float(prices[available[0]]) if len(available) else float("nan")
+
+
+class _Resting:
+
+    __slots__ = ["order", "base_wallet", "quote_wallet", "options", "clock", "t_signal", "price", "ahead"]
+
+    def __init__(self, order, base_wallet, quote_wallet, options, clock, t_signal, price, ahead):
+        self.order = order
+        self.base_wallet = base_wallet
+        self.quote_wallet = quote_wallet
+        self.options = options
+        self.clock = clock
+        self.t_signal = t_signal
+        self.price = price
+        self.ahead = ahead
+
+
+class MatchingEngine:
+    """An execution service filling orders against the depth of an order book.
+
+    Orders walk the levels of the book of their pair and are filled at the
+    average price of the levels they take, partially if the depth or their
+    limit price does not allow more. All the orders executed in a step are
+    matched against the same snapshot, each taking the liquidity left by the
+    previous ones.
+
+    The snapshots come from streams of `OrderBook`s, or of order books in
+    the format of CCXT, registered with `track`. Pairs without a stream get a
+    synthetic book around the current price at each step.
+
+    The remainder of a limit order that does not cross the book rests at its
+    price behind the size displayed there. At each new snapshot the decrease
+    of the size displayed at that price is taken as traded, moving the order
+    up the queue, and the volume traded past it fills it. A resting order
+    that the book crosses takes liquidity like a new one.
+
+    The engine is used as the `service` of an `Exchange`.
+
+    Parameters
+    ----------
+    **synthetic
+        The keyword arguments of `OrderBook.synthesize` for the pairs without
+        a stream.
+    """
+
+    def __init__(self, **synthetic) -> None:
+        self.synthetic = synthetic
+        self.books: 'Dict[str, OrderBook]' = {}
+        self.resting: 'Dict[str, List[_Resting]]' = {}
+        self._tracked = set()
+        self._synthesized: 'Dict[str, int]' = {}
+
+    def track(self, pair: str, books: 'Stream') -> 'Stream':
+        """Registers the stream of snapshots of a pair.
+
+        Parameters
+        ----------
+        pair : str
+            The trading pair, e.g. `USD/BTC`.
+        books : `Stream`
+            The stream of snapshots, either `OrderBook`s or dicts in the
+            format of CCXT.
+
+        Returns
+        -------
+        `Stream[float]`
+            The stream updating the engine, to include in the data feed, of the
+            mid prices of the snapshots.
+        """
+        self._tracked.add(pair)
+        return books.apply(lambda book: self.update(pair, book).mid, dtype="float").rename("{}:mid".format(pair))
+
+    def update(self, pair: str, book: 'Union[OrderBook, dict]') -> 'OrderBook':
+        """Replaces the snapshot of a pair and matches its resting orders.
+
+        Parameters
+        ----------
+        pair : str
+            The trading pair.
+        book : `Union[OrderBook, dict]`
+            The new snapshot.
+
+        Returns
+        -------
+        `OrderBook`
+            The new snapshot.
+        """
+        if not isinstance(book, OrderBook):
+            book = OrderBook.from_ccxt(book)
+
+        previous = self.books.get(pair)
+        self.books[pair] = book
+
+        if self.resting.get(pair):
+            self._match_resting(pair, previous, book)
+        return book
+
+    def reset(self) -> None:
+        """Drops the snapshots and the resting orders."""
+        self.books = {}
+        self.resting = {}
+        self._synthesized = {}
+
+    def _book(self, pair: str, current_price: float, clock: 'Clock') -> 'OrderBook':
+        if pair in self._tracked and pair in self.books:
+            return self.books[pair]
+
+        if self._synthesized.get(pair) != clock.step:
+            self._synthesized[pair] = clock.step
+            self.books[pair] = OrderBook.synthesize(current_price, **self.synthetic)
+        return self.books[pair]
+
+    def _match_resting(self, pair: str, previous: 'OrderBook', book: 'OrderBook') -> None:
+        resting = [r for r in self.resting[pair] if r.order.is_active]
+
+        for side in (TradeSide.BUY, TradeSide.SELL):
+            queue = [r for r in resting if r.order.side == side]
+            if not queue:
+                continue
+
+            prices = np.array([r.price for r in queue])
+            before = previous.sizes_at(side, prices) if previous else np.zeros(len(queue))
+            traded = np.maximum(before - book.sizes_at(side, prices), 0)
+
+            other = TradeSide.SELL if side == TradeSide.BUY else TradeSide.BUY
+            best, best_other = book.best(side), book.best(other)
+            before_other = previous.best(other) if previous else float("nan")
+
+            for r, volume in zip(queue, traded):
+                r.ahead -= volume
+
+                # The price moved past the order once the queue ahead of it
+                # was gone, so the whole order traded. Only the size displayed
+                # at or beyond the price of the order being consumed shows the
+                # price moved, an order inside the spread does not trade just
+                # because nothing is displayed at its price.
+                if side == TradeSide.BUY:
+                    was_at = before_other >= r.price
+                    now_past = not best_other >= r.price
+                else:
+                    was_at = before_other <= r.price
+                    now_past = not best_other <= r.price
+                through = (was_at and now_past and
+                           self._depth(previous, side, r.price) > self._depth(book, side, r.price))
+                if r.ahead <= 0 and through:
+                    self._fill_resting(r, float("inf"))
+                elif r.ahead < 0:
+                    self._fill_resting(r, -r.ahead)
+                r.ahead = max(r.ahead, 0.0)
+
+                # The book crossed the order.
+                crossed = best <= r.price if side == TradeSide.BUY else best >= r.price
+                if r.order.is_active and crossed:
+                    trade = self._take(book, r.order, r.base_wallet, r.quote_wallet,
+                                       r.options, r.clock, r.t_signal, r.price)
+                    if trade:
+                        r.order.fill(trade, r.t_signal)
+
+        self.resting[pair] = [r for r in resting if r.order.is_active and r.order.remaining.size > 0]
+
+    @staticmethod
+    def _depth(book: 'OrderBook', side: 'TradeSide', price: float) -> float:
+        # The size displayed on the side of the book a resting order on `side`
+        # joins, at its price or better.
+        if side == TradeSide.BUY:
+            return float(book.bid_sizes[book.bid_prices >= price * (1 - 1e-12)].sum())
+        return float(book.ask_sizes[book.ask_prices <= price * (1 + 1e-12)].sum())
+
+    def _fill_resting(self, r: '_Resting', volume: float) -> None:
+        # `volume` is the size traded past the order, in the quote instrument.
+        side = r.order.side
+        remaining = float(r.order.remaining.size)
+        factor = 1 - float(r.options.commission)
+
+        if side == TradeSide.BUY:
+            notional = min(volume * r.price, remaining * factor)
+            size = notional / r.price
+        else:
+            size = min(volume, remaining * factor)
+            notional = size * r.price
+
+        trade = self._trade(r.order, r.base_wallet, r.quote_wallet, r.options, r.clock,
+                            r.t_signal, size, notional)
+        if trade:
+            r.order.fill(trade, r.t_signal)
+
+    def _take(self,
+              book: 'OrderBook',
+              order: 'Order',
+              base_wallet: 'Wallet',
+              quote_wallet: 'Wallet',
+              options: 'ExchangeOptions',
+              clock: 'Clock',
+              t_signal: bool,
+              limit: float = None) -> 'Trade':
+        # The commission is taken from the remaining quantity, so only the
+        # rest of it is matched.
+        remaining = float(order.remaining.size) * (1 - float(options.commission))
+        size, notional = book.take(order.side, remaining, limit, notional=order.is_buy)
+        return self._trade(order, base_wallet, quote_wallet, options, clock, t_signal, size, notional)
+
+    def _trade(self,
+               order: 'Order',
+               base_wallet: 'Wallet',
+               quote_wallet: 'Wallet',
+               options: 'ExchangeOptions',
+               clock: 'Clock',
+               t_signal: bool,
+               size: float,
+               notional: float) -> 'Trade':
+        if size <= 0 or notional <= 0:
+            return None
+
+        pair = order.exchange_pair.pair
+        rate = Decimal(options.commission)
+        if order.is_buy:
+            source, target, reason = base_wallet, quote_wallet, "BUY"
+            quantity = Quantity(pair.base, Decimal(notional), order.path_id)
+        else:
+            source, target, reason = quote_wallet, base_wallet, "SELL"
+            quantity = Quantity(pair.quote, Decimal(size), order.path_id)
+
+        quantity = min(quantity, order.remaining).quantize()
+        commission = (quantity * (rate / (1 - rate))).quantize()
+
+        if commission.size < Decimal(10) ** -quantity.instrument.precision:
+            logging.warning("Commission is less than instrument precision. Canceling order. "
+                            "Consider defining a custom instrument with a higher precision.")
+            order.cancel("COMMISSION IS LESS THAN PRECISION.")
+            return None
+
+        if quantity + commission > order.remaining:
+            commission = order.remaining - quantity
+
+        price = Decimal(notional / size).quantize(Decimal(10) ** -pair.base.precision)
+
+        transfer = Wallet.transfer(
+            source=source,
+            target=target,
+            quantity=quantity,
+            commission=commission,
+            exchange_pair=order.exchange_pair,
+            reason=reason,
+            t_signal=t_signal,
+            price=price
+        )
+
+        return Trade(
+            order_id=order.id,
+            step=clock.step,
+            exchange_pair=order.exchange_pair,
+            side=order.side,
+            trade_type=order.type,
+            quantity=transfer.quantity,
+            price=transfer.price,
+            commission=transfer.commission
+        )
+
+    def __call__(self,
+                 order: 'Order',
+                 base_wallet: 'Wallet',
+                 quote_wallet: 'Wallet',
+                 current_price: float,
+                 options: 'ExchangeOptions',
+                 clock: 'Clock',
+                 t_signal: bool) -> 'Trade':
+        """Executes an order against the book of its pair.
+
+        Parameters
+        ----------
+        order : `Order`
+            The order that is being filled.
+        base_wallet : `Wallet`
+            The wallet of the base instrument.
+        quote_wallet : `Wallet`
+            The wallet of the quote instrument.
+        current_price : float
+            The current price of the exchange pair.
+        options : `ExchangeOptions`
+            The exchange options.
+        clock : `Clock`
+            The clock for the trading process.
+
+        Returns
+        -------
+        `Trade`
+            The trade filling the order, or `None` if nothing was filled.
+        """
+        pair = str(order.pair)
+        book = self._book(pair, current_price, clock)
+
+        limit = None
+        if order.type == TradeType.LIMIT:
+            limit = float(order.price if t_signal else order.price_online)
+
+        trade = self._take(book, order, base_wallet, quote_wallet, options, clock, t_signal, limit)
+
+        filled = trade.quantity + trade.commission if trade else 0 * order.remaining.instrument
+        if limit is not None and order.is_active and filled < order.remaining:
+            side = TradeSide.BUY if order.is_buy else TradeSide.SELL
+            ahead = float(book.sizes_at(side, [limit])[0])
+            self.resting.setdefault(pair, []).append(
+                _Resting(order, base_wallet, quote_wallet, options, clock, t_signal, limit, ahead)
+            )
+
+        return trade
@@ -0,0 +1,178 @@
+# Copyright 2019 The TensorTrade Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+import random
+import time
+
+from typing import Any, Callable, Iterator, Union
+
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_timeframe(timeframe: 'Union[str, float]') -> float:
+    """Converts a timeframe into a number of seconds.
+
+    Parameters
+    ----------
+    timeframe : `Union[str, float]`
+        A timeframe in the notation of CCXT (e.g. `5m`, `1h`), or a number of
+        seconds.
+
+    Returns
+    -------
+    float
+        The number of seconds of the timeframe.
+    """
+    if not isinstance(timeframe, str):
+        return float(timeframe)
+    if len(timeframe) < 2 or timeframe[-1] not in _UNITS:
+        raise ValueError("Invalid timeframe: {}.".format(timeframe))
+    return float(timeframe[:-1]) * _UNITS[timeframe[-1]]
+
+
+class SystemClock:
+    """The clock of the system, measuring time in seconds since the epoch."""
+
+    def time(self) -> float:
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        time.sleep(seconds)
+
+
+class BarScheduler:
+    """Schedules the fetching of bars of a live exchange.
+
+    Instead of polling the exchange until a new bar appears, the scheduler
+    sleeps until the current bar closes plus a settle delay, which gives the
+    exchange the time to publish it. If the bar is still not published, it
+    retries with a jittered exponential backoff.
+
+    Parameters
+    ----------
+    timeframe : `Union[str, float]`, default "5m"
+        The timeframe of the bars, in the notation of CCXT or in seconds.
+    settle : float, default 1.0
+        The number of seconds to wait after the close of a bar.
+    backoff : float, default 0.5
+        The delay in seconds before the first retry, doubled for each of the
+        following ones.
+    max_backoff : float, default 30.0
+        The maximum delay in seconds between two retries.
+    jitter : float, default 0.1
+        The fraction of a delay it is randomly shortened or lengthened by, so
+        that several schedulers do not retry in lockstep.
+    clock : `SystemClock`, optional
+        The clock to read the time from and to sleep with. Any object with
+        `time` and `sleep` methods can be used, which makes the scheduler
+        deterministic to test.
+    rng : `random.Random`, optional
+        The random number generator of the jitter.
+    """
+
+    def __init__(self,
+                 timeframe: 'Union[str, float]' = "5m",
+                 settle: float = 1.0,
+                 backoff: float = 0.5,
+                 max_backoff: float = 30.0,
+                 jitter: float = 0.1,
+                 clock: 'SystemClock' = None,
+                 rng: 'random.Random' = None) -> None:
+        self.interval = parse_timeframe(timeframe)
+        self.settle = settle
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.clock = clock or SystemClock()
+        self.rng = rng or random.Random()
+
+    def next_close(self, bar_open: float) -> float:
+        """Gets the time a bar closes at.
+
+        Parameters
+        ----------
+        bar_open : float
+            The time the bar opened at, in seconds since the epoch.
+
+        Returns
+        -------
+        float
+            The time the bar closes at, in seconds since the epoch.
+        """
+        return bar_open + self.interval
+
+    def until_close(self, bar_open: float) -> float:
+        """Gets the time left until a bar closes, plus the settle delay.
+
+        Parameters
+        ----------
+        bar_open : float
+            The time the bar opened at, in seconds since the epoch.
+
+        Returns
+        -------
+        float
+            The number of seconds to wait, or 0 if the bar is already closed.
+        """
+        return max(0.0, self.next_close(bar_open) + self.settle - self.clock.time())
+
+    def wait_for_close(self, bar_open: float) -> None:
+        """Sleeps until a bar closes, plus the settle delay.
+
+        Parameters
+        ----------
+        bar_open : float
+            The time the bar opened at, in seconds since the epoch.
+        """
+        delay = self.until_close(bar_open)
+        if delay > 0:
+            self.clock.sleep(delay)
+
+    def delays(self) -> 'Iterator[float]':
+        """Generates the delays between the retries.
+
+        Returns
+        -------
+        `Iterator[float]`
+            The jittered, exponentially growing delays, capped to
+            `max_backoff`.
+        """
+        delay = self.backoff
+        while True:
+            yield min(delay, self.max_backoff) * (1 + self.jitter * self.rng.uniform(-1, 1))
+            delay *= 2
+
+    def poll(self,
+             fetch: 'Callable[[], Any]',
+             ready: 'Callable[[Any], bool]') -> 'Any':
+        """Fetches until the result is ready, backing off between the attempts.
+
+        Parameters
+        ----------
+        fetch : `Callable[[], Any]`
+            The function fetching the result.
+        ready : `Callable[[Any], bool]`
+            The function telling if a result is ready.
+
+        Returns
+        -------
+        Any
+            The first result that is ready.
+        """
+        result = fetch()
+        delays = self.delays()
+        while not ready(result):
+            self.clock.sleep(next(delays))
+            result = fetch()
+        return result
@@ -1,7 +1,11 @@
+import os
+import tempfile
 
-from typing import List
+from numbers import Integral
+from typing import Any, Dict, List
 from collections import namedtuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -14,16 +18,90 @@ Transaction = namedtuple('Transaction', [
     'amount',
     'free',
     'locked',
-    'locked_poid'
+    'locked_poid',
+    'instrument'
 ])
 
 
+_RECORD = np.dtype([
+    ('poid', np.int32),
+    ('step', np.int64),
+    ('source', np.int32),
+    ('target', np.int32),
+    ('memo', np.int32),
+    ('amount', np.float64),
+    ('free', np.float64),
+    ('locked', np.float64),
+    ('locked_poid', np.float64),
+    ('instrument', np.int32)
+])
+
+_CODED = ('poid', 'source', 'target', 'memo', 'instrument')
+
+
 class Ledger:
     """A ledger to keep track of transactions that occur in the order
-    management system."""
-
-    def __init__(self):
-        self.transactions: 'List[Transaction]' = []
+    management system.
+
+    The transactions are stored column by column in preallocated chunks of
+    typed arrays. The amounts and balances are kept as floats, the order path
+    ids, sources, targets, memos and instruments as codes of interned strings,
+    and a missing order path id or locked balance as -1 or NaN. Steps that are
+    not integers are kept aside, by the position of their transaction. The ledger
+    grows by whole chunks and, if a spill directory is given, writes each full
+    chunk to a file that is then memory-mapped, so long runs do not keep their
+    whole history in memory.
+
+    Parameters
+    ----------
+    chunk_size : int, default 4096
+        The number of transactions per chunk.
+    spill : str, optional
+        The directory to spill the full chunks to.
+    record : bool, default True
+        Whether to record the transactions. If not, the ledger only counts
+        them, which is enough when only the metrics of the portfolio are
+        needed.
+    """
+
+    def __init__(self, chunk_size: int = 4096, spill: str = None, record: bool = True):
+        if chunk_size < 1:
+            raise ValueError("The chunk size must be positive.")
+
+        self.chunk_size = chunk_size
+        self.spill = spill
+        self.record = record
+        self._chunks: 'List[np.ndarray]' = []
+        self._files: 'List[str]' = []
+        self._codes: 'Dict[str, int]' = {}
+        self._strings: 'List[str]' = []
+        self._steps: 'Dict[int, Any]' = {}
+        self.reset()
+
+    def _code(self, value: object) -> int:
+        if value is None:
+            return -1
+        value = str(value)
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def _flush(self) -> None:
+        chunk = self._chunk
+        if self.spill is not None:
+            os.makedirs(self.spill, exist_ok=True)
+            # The ledgers of forked processes share their ids, so the files are
+            # created with unique names.
+            fd, path = tempfile.mkstemp(suffix=".npy", prefix="ledger-", dir=self.spill)
+            os.close(fd)
+            np.save(path, chunk)
+            self._files += [path]
+            chunk = np.load(path, mmap_mode='r')
+        self._chunks += [chunk]
+        self._chunk = np.empty(self.chunk_size, dtype=_RECORD)
+        self._size = 0
 
     def commit(self,
                wallet: 'Wallet',
@@ -46,22 +124,43 @@ class Ledger:
         memo : str
             A description of the transaction.
         """
+        self.count += 1
+        if not self.record:
+            return
+
+        if self._size == self.chunk_size:
+            self._flush()
+
         poid = quantity.path_id
-        locked_poid_balance = None if poid not in wallet.locked.keys() else wallet.locked[poid]
-
-        transaction = Transaction(
-            poid,
-            wallet.exchange.clock.step,
-            source,
-            target,
-            memo,
-            quantity,
-            wallet.balance,
-            wallet.locked_balance,
-            locked_poid_balance
+        locked = wallet.locked
+        locked_poid_balance = float(locked[poid].size) if poid in locked else np.nan
+
+        step = wallet.exchange.clock.step
+        if not isinstance(step, Integral):
+            self._steps[len(self._chunks) * self.chunk_size + self._size] = step
+            step = -1
+
+        self._chunk[self._size] = (
+            self._code(poid),
+            step,
+            self._code(source),
+            self._code(target),
+            self._code(memo),
+            float(quantity.size),
+            float(wallet.balance.size),
+            float(wallet.locked_balance.size),
+            locked_poid_balance,
+            self._code(quantity.instrument)
         )
+        self._size += 1
+
+    def _records(self) -> 'np.ndarray':
+        return np.concatenate(self._chunks + [self._chunk[:self._size]])
 
-        self.transactions += [transaction]
+    @property
+    def transactions(self) -> 'List[Transaction]':
+        """The recorded transactions. (`List[Transaction]`, read-only)"""
+        return [Transaction(*row) for row in self.as_frame().itertuples(index=False)]
 
     def as_frame(self, sort_by_order_seq: bool = False) -> 'pd.DataFrame':
         """Converts the ledger records into a data frame.
@@ -76,17 +175,44 @@ class Ledger:
         `pd.DataFrame`
             A data frame containing all the records in the ledger.
         """
+        records = self._records()
+
+        # The code -1 of a missing value indexes the trailing None.
+        strings = np.array(self._strings + [None], dtype=object)
+        df = pd.DataFrame({
+            name: strings[records[name]] if name in _CODED else records[name]
+            for name in Transaction._fields
+        })
+
+        if self._steps:
+            steps = records['step'].astype(object)
+            for i, step in self._steps.items():
+                steps[i] = step
+            df['step'] = steps
 
         if not sort_by_order_seq:
-            return pd.DataFrame(self.transactions)
+            return df
 
-        df = pd.DataFrame(self.transactions)
-        frames = []
-        for poid in df.poid.unique():
-            frames += [df.loc[df.poid == poid, :]]
+        # Orders the paths by their first record, keeping the records of each
+        # path in sequence.
+        _, first, inverse = np.unique(records['poid'], return_index=True, return_inverse=True)
+        rank = np.empty_like(first)
+        rank[np.argsort(first)] = np.arange(len(first))
+        order = np.argsort(rank[inverse], kind='stable')
 
-        return pd.concat(frames, ignore_index=True, axis=0)
+        return df.iloc[order].reset_index(drop=True)
 
     def reset(self):
         """Resets the ledger."""
-        self.transactions = []
+        files = self._files
+
+        self.count = 0
+        self._chunks = []
+        self._files = []
+        self._steps = {}
+        self._chunk = np.empty(self.chunk_size, dtype=_RECORD)
+        self._size = 0
+
+        for path in files:
+            if os.path.exists(path):
+                os.remove(path)
@@ -31,6 +31,7 @@ from tensortrade.oms.wallets.ledger import Ledger
 
 
 Transfer = namedtuple("Transfer", ["quantity", "commission", "price"])
+Balances = namedtuple("Balances", ["free", "locked", "total"])
 
 
 class Wallet(Identifiable):
@@ -42,6 +43,13 @@ class Wallet(Identifiable):
         The exchange associated with this wallet.
     balance : `Quantity`
         The initial balance quantity for the wallet.
+
+    Notes
+    -----
+    The locked and total balances, and their values as floats, are cached
+    until the balance or the locked quantities change. Every change goes
+    through `lock`, `unlock`, `deposit`, `withdraw` or `reset`, or through
+    assigning `balance`, all of which invalidate the cache.
     """
 
     ledger = Ledger()
@@ -50,28 +58,60 @@ class Wallet(Identifiable):
         self.exchange = exchange
         self._initial_size = balance.size
         self.instrument = balance.instrument
-        self.balance = balance.quantize()
         self._locked = {}
+        self.balance = balance.quantize()
+
+    @property
+    def balance(self) -> 'Quantity':
+        """The balance of the wallet available for use. (`Quantity`)"""
+        return self._balance
+
+    @balance.setter
+    def balance(self, balance: 'Quantity') -> None:
+        self._balance = balance
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._locked_balance = None
+        self._total_balance = None
+        self._float_balances = None
 
     @property
     def locked_balance(self) -> 'Quantity':
         """The total balance of the wallet locked in orders. (`Quantity`, read-only)"""
-        locked_balance = Quantity(self.instrument, 0)
+        if self._locked_balance is None:
+            locked_balance = Quantity(self.instrument, 0)
+
+            for quantity in self._locked.values():
+                locked_balance += quantity.size
 
-        for quantity in self._locked.values():
-            locked_balance += quantity.size
+            self._locked_balance = locked_balance
 
-        return locked_balance
+        return self._locked_balance
 
     @property
     def total_balance(self) -> 'Quantity':
         """The total balance of the wallet available for use and locked in orders. (`Quantity`, read-only)"""
-        total_balance = self.balance
+        if self._total_balance is None:
+            total_balance = self.balance
 
-        for quantity in self._locked.values():
-            total_balance += quantity.size
+            for quantity in self._locked.values():
+                total_balance += quantity.size
 
-        return total_balance
+            self._total_balance = total_balance
+
+        return self._total_balance
+
+    @property
+    def float_balances(self) -> 'Balances':
+        """The free, locked and total balances of the wallet as floats. (`Balances`, read-only)"""
+        if self._float_balances is None:
+            self._float_balances = Balances(
+                self.balance.as_float(),
+                self.locked_balance.as_float(),
+                self.total_balance.as_float()
+            )
+        return self._float_balances
 
     @property
     def locked(self) -> 'Dict[str, Quantity]':
@@ -280,7 +320,8 @@ class Wallet(Identifiable):
                  commission: 'Quantity',
                  exchange_pair: 'ExchangePair',
                  reason: str,
-                 t_signal: bool) -> 'Transfer':
+                 t_signal: bool,
+                 price: 'Decimal' = None) -> 'Transfer':
         """Transfers funds from one wallet to another.
 
         Parameters
@@ -299,6 +340,13 @@ class Wallet(Identifiable):
             The exchange pair associated with the transfer
         reason : str
             The reason for transferring the funds.
+        t_signal : bool
+            Whether to convert at the price of the simulation or the online
+            price.
+        price : `Decimal`, optional
+            The price to convert at, e.g. the average price of a fill across
+            several levels of an order book. Defaults to the price of the
+            exchange pair.
 
         Returns
         -------
@@ -324,19 +372,20 @@ class Wallet(Identifiable):
         quantity = source.withdraw(quantity, "FILL ORDER")
 
         if t_signal:
+            price = price if price is not None else exchange_pair.price
             if quantity.instrument == exchange_pair.pair.base:
                 instrument = exchange_pair.pair.quote
-                converted_size = quantity.size / exchange_pair.price
+                converted_size = quantity.size / price
             else:
                 instrument = exchange_pair.pair.base
-                converted_size = quantity.size * exchange_pair.price
+                converted_size = quantity.size * price
 
             converted = Quantity(instrument, converted_size, quantity.path_id).quantize()
 
             converted = target.deposit(converted, 'TRADED {} {} @ {}'.format(
                 quantity,
                 exchange_pair,
-                exchange_pair.price
+                price
             ))
 
             lsb2 = source.locked.get(poid).size
@@ -345,22 +394,23 @@ class Wallet(Identifiable):
             q = quantity.size
             c = commission.size
             cv = converted.size
-            p = exchange_pair.inverse_price if pair == exchange_pair.pair else exchange_pair.price
+            p = 1 / price if pair == exchange_pair.pair else price
 
         else:
+            price = price if price is not None else exchange_pair.price_online
             if quantity.instrument == exchange_pair.pair.base:
                 instrument = exchange_pair.pair.quote
-                converted_size = quantity.size / exchange_pair.price_online
+                converted_size = quantity.size / price
             else:
                 instrument = exchange_pair.pair.base
-                converted_size = quantity.size * exchange_pair.price_online
+                converted_size = quantity.size * price
 
             converted = Quantity(instrument, converted_size, quantity.path_id).quantize()
 
             converted = target.deposit(converted, 'TRADED {} {} @ {}'.format(
                 quantity,
                 exchange_pair,
-                exchange_pair.price_online
+                price
             ))
 
             lsb2 = source.locked.get(poid).size
@@ -369,7 +419,7 @@ class Wallet(Identifiable):
             q = quantity.size
             c = commission.size
             cv = converted.size
-            p = exchange_pair.inverse_price_online if pair == exchange_pair.pair else exchange_pair.price_online
+            p = 1 / price if pair == exchange_pair.pair else price
             
         source_quantization = Decimal(10) ** -source.instrument.precision
         target_quantization = Decimal(10) ** -target.instrument.precision
@@ -386,16 +436,13 @@ class Wallet(Identifiable):
             )
             raise Exception("Invalid Transfer: " + equation)
 
-        if t_signal:
-            return Transfer(quantity, commission, exchange_pair.price)
-        else:
-            return Transfer(quantity, commission, exchange_pair.price_online)
+        return Transfer(quantity, commission, price)
 
         
     def reset(self) -> None:
         """Resets the wallet."""
-        self.balance = Quantity(self.instrument, self._initial_size).quantize()
         self._locked = {}
+        self.balance = Quantity(self.instrument, self._initial_size).quantize()
 
     def __str__(self) -> str:
         return '<Wallet: balance={}, locked={}>'.format(self.balance, self.locked_balance)
@@ -1,5 +1,15 @@
 
-from tensortrade.env.default.observers import _create_internal_streams, _create_wallet_source
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from tensortrade.env.default.observers import (
+    _create_internal_streams,
+    _create_wallet_source,
+    IntradayObserver,
+    ObservationHistory
+)
 from tensortrade.feed.core import DataFeed, Stream
 from tensortrade.oms.exchanges import Exchange
 from tensortrade.oms.services.execution.simulated import execute_order
@@ -143,3 +153,109 @@ def test_exchange_with_wallets_feed():
         "binance:/USD:/locked": 400,
         "binance:/USD:/total": 1000
     }
+
+
+def test_intraday_observer_episode_index(tmp_path):
+
+    def build(start="2020-01-01 12:00"):
+        price = Stream.source([7000 + i for i in range(60)], dtype="float").rename("USD-BTC")
+        exchange = Exchange("bitfinex", service=execute_order, t_signal=True)(price)
+        portfolio = Portfolio(USD, [Wallet(exchange, 10000 * USD), Wallet(exchange, 1 * BTC)])
+        timestamps = pd.Series(pd.date_range(start, periods=60, freq="h"))
+        feed = DataFeed([
+            price.lag().rename("lag"),
+            Stream.source(timestamps, dtype="timestamp").rename("timestamp")
+        ])
+        return portfolio, feed, timestamps
+
+    path = str(tmp_path / "episodes.npz")
+
+    portfolio, feed, timestamps = build()
+    observer = IntradayObserver(portfolio, feed, stop_time=dt.time(16, 0), randomize=True, episode_index=path)
+
+    assert observer.num_episodes == 3
+    np.testing.assert_array_equal(observer.episode_starts, [0, 5, 29])
+    np.testing.assert_array_equal(observer.episode_stops, [4, 28, 52])
+
+    starts = set(timestamps[observer.episode_starts])
+    for _ in range(5):
+        observer.reset()
+        observer.observe(None)
+        assert observer.feed.value["timestamp"] in starts
+
+    portfolio, feed, _ = build()
+    observer = IntradayObserver(portfolio, feed, stop_time=dt.time(16, 0), randomize=True, episode_index=path)
+    np.testing.assert_array_equal(observer.episode_starts, [0, 5, 29])
+
+    # A feed of the same size but other timestamps, or another stop time,
+    # rebuilds the index.
+    portfolio, feed, _ = build(start="2020-01-01 13:00")
+    observer = IntradayObserver(portfolio, feed, stop_time=dt.time(16, 0), randomize=True, episode_index=path)
+    np.testing.assert_array_equal(observer.episode_starts, [0, 4, 28])
+
+    portfolio, feed, _ = build(start="2020-01-01 13:00")
+    observer = IntradayObserver(portfolio, feed, stop_time=dt.time(17, 0), randomize=True, episode_index=path)
+    np.testing.assert_array_equal(observer.episode_starts, [0, 5, 29])
+    np.testing.assert_array_equal(observer.episode_stops, [4, 28, 52])
+
+
+def test_intraday_observer_seeks_with_bounded_warmup(monkeypatch):
+
+    size = 24 * 50
+    price = Stream.source([7000 + i for i in range(size)], dtype="float").rename("USD-BTC")
+    exchange = Exchange("bitfinex", service=execute_order, t_signal=True)(price)
+    portfolio = Portfolio(USD, [Wallet(exchange, 10000 * USD), Wallet(exchange, 1 * BTC)])
+
+    rolling = price.rolling(20)
+    timestamps = pd.Series(pd.date_range("2020-01-01 12:00", periods=size, freq="h"))
+    feed = DataFeed([
+        rolling.mean().rename("mean"),
+        price.ewm(span=4).mean().rename("ewm"),
+        Stream.source(timestamps, dtype="timestamp").rename("timestamp")
+    ])
+
+    observer = IntradayObserver(portfolio, feed, stop_time=dt.time(16, 0), randomize=True)
+
+    # The exponentially weighted mean depends on its whole history, so the
+    # warm-up window is the longest window of the feed instead.
+    assert observer.seek_warmup == 20
+
+    steps = []
+    forward = rolling.forward
+
+    def counted():
+        steps[-1] += 1
+        return forward()
+
+    rolling.forward = counted
+
+    for episode in [2, 10, observer.num_episodes - 1]:
+        monkeypatch.setattr("tensortrade.env.default.observers.randrange", lambda n: episode)
+        steps += [0]
+        observer.reset()
+
+    assert steps == [20, 20, 20]
+
+
+def test_observation_history():
+
+    history = ObservationHistory(window_size=3, dtype=np.float32)
+
+    history.push({"a": 1, "b": np.nan})
+    obs = history.observe()
+    assert obs.dtype == np.float32
+    np.testing.assert_array_equal(obs, [[0, 0], [0, 0], [1, 0]])
+
+    row = np.array([2, 3.0])
+    history.push(row)
+    row[:] = [4, np.inf]
+    history.push(row)
+    history.push(np.array([5, 6.0]))
+
+    obs = history.observe()
+    assert obs.flags.c_contiguous
+    np.testing.assert_array_equal(obs, [[2, 3], [4, np.finfo(np.float32).max], [5, 6]])
+
+    history.reset()
+    history.push([7, 8])
+    np.testing.assert_array_equal(history.observe(), [[0, 0], [0, 0], [7, 8]])
@@ -0,0 +1,139 @@
+
+from functools import partial
+
+import numpy as np
+import pytest
+
+import tensortrade.env.default as default
+
+from tensortrade.env.generic import SubprocVecTradingEnv
+from tensortrade.feed import DataFeed, Stream
+from tensortrade.oms.exchanges import Exchange
+from tensortrade.oms.instruments import USD, BTC
+from tensortrade.oms.wallets import Portfolio, Wallet
+from tensortrade.oms.services.execution.simulated import execute_order
+
+
+@pytest.fixture
+def make(tmp_path, monkeypatch):
+    (tmp_path / "crypto-v2").mkdir()
+    (tmp_path / "crypto-v2" / "indicators.txt").write_text("[]")
+    monkeypatch.chdir(tmp_path)
+
+    def make(i):
+        prices = list(100 + np.random.RandomState(i).randn(20 + 10 * i).cumsum())
+
+        price = Stream.source(prices, dtype="float").rename("USD-BTC")
+        exchange = Exchange("sim", service=execute_order, t_signal=True)(price)
+
+        cash = Wallet(exchange, 10000 * USD)
+        asset = Wallet(exchange, 0 * BTC)
+
+        return {
+            "portfolio": Portfolio(USD, [cash, asset]),
+            "action_scheme": default.actions.BSH(cash, asset),
+            "reward_scheme": default.rewards.SimpleProfit(),
+            "feed": DataFeed([Stream.source(prices, dtype="float").rename("close")]),
+            "window_size": 3
+        }
+
+    return make
+
+
+def test_vec_env_matches_envs(make):
+    vec_env = default.create_vec(make, num_envs=3)
+    envs = [default.create(**make(i)) for i in range(3)]
+
+    obs = vec_env.reset()
+    assert obs.shape == (3, 3, 1)
+    assert np.allclose(obs, np.stack([env.reset() for env in envs]))
+
+    for step in range(15):
+        actions = [(step + i) % 2 for i in range(3)]
+        obs, rewards, dones, infos = vec_env.step(actions)
+
+        assert obs.shape == (3, 3, 1)
+        assert rewards.shape == (3,) and dones.shape == (3,)
+        assert len(infos) == 3
+
+        for i, env in enumerate(envs):
+            o, r, d, _ = env.step(actions[i])
+            if d:
+                assert np.allclose(infos[i]["terminal_observation"], o)
+                o = env.reset()
+            assert np.allclose(obs[i], o)
+            assert np.isclose(rewards[i], r)
+            assert dones[i] == d
+
+
+def test_vec_env_auto_resets(make):
+    vec_env = default.create_vec(make, num_envs=2)
+    vec_env.reset()
+
+    done = False
+    while not done:
+        _, _, dones, infos = vec_env.step([0, 0])
+        done = dones[0]
+
+    assert "terminal_observation" in infos[0]
+    assert "terminal_observation" not in infos[1]
+    assert vec_env.envs[0].clock.step == 1
+
+    with pytest.raises(ValueError):
+        vec_env.step([0])
+
+
+def test_subproc_vec_env_matches_vec_env(make):
+    vec_env = default.create_vec(make, num_envs=3)
+    subproc_env = default.create_vec(make, num_envs=3, num_workers=2)
+
+    try:
+        assert np.allclose(subproc_env.reset(), vec_env.reset())
+
+        for step in range(15):
+            actions = [(step + i) % 2 for i in range(3)]
+            obs, rewards, dones, infos = subproc_env.step(actions)
+            expected = vec_env.step(actions)
+
+            assert np.allclose(obs, expected[0])
+            assert np.allclose(rewards, expected[1])
+            assert (dones == expected[2]).all()
+            for info, expected_info in zip(infos, expected[3]):
+                assert info["step"] == expected_info["step"]
+                if "terminal_observation" in expected_info:
+                    assert np.allclose(info["terminal_observation"], expected_info["terminal_observation"])
+    finally:
+        subproc_env.close()
+
+
+def test_subproc_vec_env_raises_when_a_worker_dies(make):
+    subproc_env = SubprocVecTradingEnv(
+        [partial(default.create, **make(i)) for i in range(2)],
+        num_workers=2,
+        timeout=5
+    )
+    subproc_env.reset()
+
+    subproc_env._processes[0].kill()
+    subproc_env._processes[0].join()
+
+    with pytest.raises(Exception, match="exited with code"):
+        subproc_env.step([0, 0])
+
+    assert subproc_env.closed
+    assert not any(process.is_alive() for process in subproc_env._processes)
+
+
+def test_subproc_vec_env_raises_worker_traceback(make):
+    def broken(i):
+        env = default.create(**make(i))
+        env.step = None
+        return env
+
+    subproc_env = SubprocVecTradingEnv([partial(broken, i) for i in range(2)], num_workers=2)
+    subproc_env.reset()
+
+    with pytest.raises(Exception, match="TypeError"):
+        subproc_env.step([0, 0])
+
+    assert subproc_env.closed
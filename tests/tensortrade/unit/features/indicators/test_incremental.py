@@ -0,0 +1,108 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensortrade.features.indicators.incremental import (
+    SMA,
+    EMA,
+    RSI,
+    MACD,
+    BBANDS,
+    STOCH,
+    ATR,
+    IncrementalTAIndicator
+)
+
+talib = pytest.importorskip("talib")
+
+from tensortrade.features.indicators.talib_indicator import TAlibIndicator  # noqa: E402
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.RandomState(1)
+    close = 100 + rng.randn(300).cumsum()
+    return pd.DataFrame({
+        "date": pd.date_range("2020-01-01", periods=300, freq="5min"),
+        "open": close + rng.randn(300) * 0.1,
+        "high": close + rng.rand(300),
+        "low": close - rng.rand(300),
+        "close": close,
+        "volume": rng.rand(300) * 1000
+    })
+
+
+def run(indicator, *args):
+    return np.array([indicator.update(*values) for values in zip(*args)], dtype=np.float64)
+
+
+@pytest.mark.parametrize("matype", [0, 1])
+def test_indicators_match_talib(bars, matype):
+    high, low, close = bars["high"].values, bars["low"].values, bars["close"].values
+
+    expected = {
+        "SMA": (run(SMA(10), close), talib.SMA(close, 10)),
+        "EMA": (run(EMA(10), close), talib.EMA(close, 10)),
+        "RSI": (run(RSI(14), close), talib.RSI(close, 14)),
+        "ATR": (run(ATR(14), high, low, close), talib.ATR(high, low, close, 14)),
+        "MACD": (run(MACD(12, 26, 9), close), np.column_stack(talib.MACD(close, 12, 26, 9))),
+        "BBANDS": (run(BBANDS(20, 2, 1.5, matype), close), np.column_stack(talib.BBANDS(close, 20, 2, 1.5, matype))),
+        "STOCH": (
+            run(STOCH(14, 3, matype, 3, matype), high, low, close),
+            np.column_stack(talib.STOCH(high, low, close, 14, 3, matype, 3, matype))
+        )
+    }
+
+    for name, (values, reference) in expected.items():
+        np.testing.assert_allclose(values, reference, rtol=1e-9, atol=1e-9, err_msg=name)
+
+
+def test_incremental_ta_indicator(bars):
+    indicators = [
+        ["RSI", {"args": ["close"], "params": {"timeperiod": 14}}],
+        ["EMA-50", {"args": ["close"], "params": {"timeperiod": 50}}],
+        ["MACD", {"args": ["close"], "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9}}],
+        ["BBANDS", {"args": ["close"], "params": {"timeperiod": 20}}],
+        ["STOCH", {"args": ["high", "low", "close"], "params": {}}],
+        ["ATR", {"args": ["high", "low", "close"], "params": {"timeperiod": 14}}]
+    ]
+    assert IncrementalTAIndicator.supports(indicators)
+    assert not IncrementalTAIndicator.supports([["ADX", {"args": ["high", "low", "close"], "params": {}}]])
+
+    incremental = IncrementalTAIndicator(indicators, 10)
+    reference = TAlibIndicator(indicators, 10)
+
+    for end in [40, 41, 45, 120, 300]:
+        X = bars.iloc[:end]
+        result = incremental.transform(X)
+        expected = reference.transform(X)
+
+        assert list(result.columns) == list(expected.columns)
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-9, atol=1e-9, check_dtype=False)
+
+    incremental.reset()
+    pd.testing.assert_frame_equal(
+        incremental.transform(bars.iloc[:60]),
+        reference.transform(bars.iloc[:60]),
+        rtol=1e-9, atol=1e-9, check_dtype=False
+    )
+
+
+def test_incremental_ta_indicator_names_outputs(bars):
+    indicators = [
+        ["MACD", {"args": ["close"], "params": {"fastperiod": 12, "slowperiod": 26, "signalperiod": 9}}],
+        ["MACD-FAST", {"args": ["close"], "params": {"fastperiod": 5, "slowperiod": 13, "signalperiod": 4}}]
+    ]
+
+    result = IncrementalTAIndicator(indicators, 10).transform(bars)
+
+    assert list(result.columns[6:]) == [
+        "macd", "macd_signal", "macd_hist",
+        "macd-fast", "macd_signal-fast", "macd_hist-fast"
+    ]
+
+    close = bars["close"].values
+    for columns, params in [(result.columns[6:9], (12, 26, 9)), (result.columns[9:], (5, 13, 4))]:
+        expected = np.column_stack(talib.MACD(close, *params))[-10:]
+        np.testing.assert_allclose(result[columns].values, expected, rtol=1e-9, atol=1e-9)
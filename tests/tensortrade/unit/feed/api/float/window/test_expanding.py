@@ -90,3 +90,20 @@ def test_expanding_max():
         expected = list(pd.Series(array).expanding(**config).max())
 
         assert_op([w], expected)
+
+
+def test_expanding_keeps_history_only_when_needed():
+    s = Stream.source([1, 2, 3, 4], dtype="float")
+
+    e = s.expanding()
+    w = e.mean().rename("w")
+
+    assert_op([w], [1, 1.5, 2, 2.5])
+    assert not e.keep_history
+    assert e.history == []
+
+    e = s.expanding()
+    w = e.median().rename("w")
+
+    assert_op([w], [1, 1.5, 2, 2.5])
+    assert e.keep_history
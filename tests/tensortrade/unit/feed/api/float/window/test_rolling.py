@@ -102,3 +102,16 @@ def test_rolling_max():
         expected = list(pd.Series(array).rolling(**config).max())
 
         assert_op([w], expected)
+
+
+def test_rolling_long_window():
+    rng = np.random.RandomState(0)
+    array = rng.randn(500).cumsum()
+    array[[50, 51, 300]] = np.nan
+
+    for name in ["sum", "mean", "var", "median", "min", "max"]:
+        s = Stream.source(array, dtype="float")
+        w = getattr(s.rolling(window=100, min_periods=100), name)().rename("w")
+        expected = list(getattr(pd.Series(array).rolling(window=100, min_periods=100), name)())
+
+        assert_op([w], expected)
@@ -1,4 +1,6 @@
-
+import numpy as np
+import pandas as pd
+import pytest
 
 from tensortrade.feed.core import Stream, NameSpace
 
@@ -85,6 +87,26 @@ def test_stream_source():
     assert s.forward() == 1
 
 
+def test_stream_source_seek():
+
+    for source in [list(range(10)), np.arange(10), pd.Series(range(10), index=range(10, 20)), range(10)]:
+        s = Stream.source(source)
+
+        s.seek(7)
+        assert s.forward() == 7
+        assert s.has_next()
+
+        s.seek(2)
+        assert s.forward() == 2
+
+        s.seek(9)
+        assert s.forward() == 9
+        assert not s.has_next()
+
+        s.seek(12)
+        assert not s.has_next()
+
+
 def test_placholder():
 
     s = Stream.placeholder(dtype="float")
@@ -92,3 +114,28 @@ def test_placholder():
     s.push(5)
 
     assert s.value == 5
+
+
+def test_toposort():
+
+    s1 = Stream.source([1, 2, 3], dtype="float").rename("s1")
+    s2 = Stream.source([4, 5, 6], dtype="float").rename("s2")
+
+    m = (s1 + s2).rename("m")
+    d = (m - s1).rename("d")
+
+    edges = d.gather()
+    process = Stream.toposort(edges)
+
+    assert process == [s1, s2, m]
+    assert process == Stream.toposort(d.gather())
+
+
+def test_toposort_with_cycle():
+
+    s1 = Stream.source([1, 2, 3], dtype="float")
+    s2 = s1 + 1
+    s1(s2)
+
+    with pytest.raises(Exception):
+        Stream.toposort(s2.gather())
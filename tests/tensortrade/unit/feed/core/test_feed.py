@@ -1,7 +1,10 @@
+import pytest
+import numpy as np
+
 
 
 from tensortrade.feed import Stream
-from tensortrade.feed.core.feed import PushFeed
+from tensortrade.feed.core.feed import DataFeed, PushFeed
 
 
 def test_init_push_feed():
@@ -61,3 +64,380 @@ def test_push_one_datum():
             "v3": expected["v3"][i],
             "v4": expected["v4"][i]
         }
+
+
+def _collect(feed):
+    rows = []
+    while feed.has_next():
+        rows += [feed.next()]
+    return rows
+
+
+def test_vectorized_matches_stream():
+
+    array = [1, np.nan, 3, 4, 5, 6, np.nan, 7, 2, 1]
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        return [
+            s.rolling(3).mean().rename("rolling"),
+            s.expanding().sum().rename("expanding"),
+            s.ewm(span=3).mean().rename("ewm"),
+            s.lag(2).rename("lag"),
+            s.ffill().cumsum().rename("cumsum"),
+            (s.fillna(0) * 2 - 1).clamp(0, 8).rename("ops"),
+            s.apply(lambda x: x if x > 3 else 0).rename("apply")
+        ]
+
+    feed = DataFeed(build())
+    feed.compile()
+    expected = _collect(feed)
+
+    feed = DataFeed(build())
+    feed.compile(mode="vectorized")
+    actual = _collect(feed)
+
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        np.testing.assert_allclose(list(a.values()), list(e.values()))
+
+    feed.reset()
+    assert len(_collect(feed)) == len(array)
+
+
+def test_vectorized_with_live_streams():
+
+    class Counter:
+        count = 0
+
+    counter = Counter()
+
+    s = Stream.source([1, 2, 3, 4], dtype="float").rename("s")
+    c = Stream.sensor(counter, lambda obj: obj.count, dtype="float").rename("c")
+
+    feed = DataFeed([
+        s.lag().rename("lag"),
+        (s.rolling(2).sum() + c).rename("mix")
+    ], mode="vectorized")
+
+    outputs = []
+    while feed.has_next():
+        counter.count += 10
+        outputs += [feed.next()]
+
+    assert [o["mix"] for o in outputs] == [11, 23, 35, 47]
+    np.testing.assert_allclose([o["lag"] for o in outputs], [np.nan, 1, 2, 3])
+
+
+def test_vectorized_requires_finite_source():
+
+    s = Stream.placeholder(dtype="float").rename("s")
+
+    feed = DataFeed([s])
+
+    with pytest.raises(Exception):
+        feed.compile(mode="vectorized")
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_optimize_fuses_elementwise_streams(mode):
+
+    array = [1, np.nan, 3, 4, -5, 6, np.nan, 7, 2, 1]
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        a = (s.fillna(0) * 2 - 1).abs().rename("a")
+        return [
+            a,
+            (a + 1).sqrt().rename("b"),
+            (a * s.rolling(2).sum()).clamp_min(0).rename("c")
+        ]
+
+    feed = DataFeed(build())
+    feed.compile()
+    expected = _collect(feed)
+
+    feed = DataFeed(build(), mode=mode, optimize=True)
+    feed.compile()
+    actual = _collect(feed)
+
+    assert len(actual) == len(expected)
+    for a, e in zip(actual, expected):
+        assert a.keys() == e.keys()
+        np.testing.assert_allclose(list(a.values()), list(e.values()))
+
+    fused = [s for s in feed.process if s.generic_name == "fused"]
+    assert sorted(s.name for s in fused) == ["a", "b", "c"]
+
+    feed.reset()
+    assert len(_collect(feed)) == len(array)
+
+
+def test_optimize_keeps_shared_streams():
+
+    s = Stream.source([1, 2, 3], dtype="float").rename("s")
+    shared = (s + 1).rename("shared")
+    listened = (s * 3).rename("listened")
+
+    class Listener:
+        values = []
+
+        def on_next(self, value):
+            self.values += [value]
+
+    listener = Listener()
+    listened.attach(listener)
+
+    feed = DataFeed([
+        (shared * 2).rename("x"),
+        (shared - listened).rename("y")
+    ], optimize=True)
+    feed.compile()
+
+    names = [s.name for s in feed.process]
+    assert "shared" in names
+    assert "listened" in names
+    assert _collect(feed) == [
+        {"x": 4, "y": -1},
+        {"x": 6, "y": -3},
+        {"x": 8, "y": -5}
+    ]
+    assert listener.values == [3, 6, 9]
+
+
+def test_optimize_merges_duplicate_streams():
+
+    array = [1, 2, 3, 4, 5, 6, 7, 8]
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        return [
+            (s - s.rolling(3).mean()).rename("a"),
+            (s.rolling(3).mean() * 2).rename("b"),
+            s.rolling(3).mean().rename("c"),
+            s.rolling(3).mean().rename("d"),
+            s.rolling(4).mean().rename("e")
+        ]
+
+    feed = DataFeed(build())
+    feed.compile()
+    expected = _collect(feed)
+
+    feed = DataFeed(build(), optimize=True)
+    feed.compile()
+
+    assert _collect(feed) == expected
+
+    # "c" and "d" are both outputs, so the other means are merged into "c"
+    # while "d" is kept.
+    names = [s.name for s in feed.process]
+    assert len(names) == 8
+    assert {"a", "b", "c", "d", "e"} <= set(names)
+
+    merged = dict(feed.report["merged"])
+    assert len(merged) == 5
+    assert list(merged.values()).count("c") == 2
+    assert sorted(feed.report["pruned"]) == sorted(merged.keys())
+
+
+def test_optimize_keeps_grouped_streams():
+
+    s = Stream.source([1, 2, 3], dtype="float").rename("s")
+
+    group = Stream.group([
+        (s + 1).rename("x"),
+        (s + 1).rename("y")
+    ]).rename("group")
+
+    feed = DataFeed([group], optimize=True)
+    feed.compile()
+
+    names = [s.name for s in feed.process]
+    assert "x" in names
+    assert "y" in names
+    assert _collect(feed) == [
+        {"group": {"x": 2, "y": 2}},
+        {"group": {"x": 3, "y": 3}},
+        {"group": {"x": 4, "y": 4}}
+    ]
+
+
+def test_optimize_keeps_stacked_streams():
+
+    s = Stream.source([1, 2, 3], dtype="float").rename("s")
+
+    stack = Stream.stack([
+        (s + 1).rename("x"),
+        (s + 1).rename("y")
+    ]).rename("stack")
+
+    feed = DataFeed([stack], output="array", optimize=True)
+    feed.compile()
+
+    names = [s.name for s in feed.process]
+    assert "x" in names
+    assert "y" in names
+    assert feed.columns == {"stack:/x": 0, "stack:/y": 1}
+    np.testing.assert_array_equal(feed.next(), [2, 2])
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_array_output(mode):
+
+    s1 = Stream.source([1, 2, 3], dtype="float").rename("s1")
+    s2 = Stream.source([4, 5, 6], dtype="float").rename("s2")
+
+    feed = DataFeed([
+        (s1 + s2).rename("sum"),
+        Stream.group([s1, s2]).rename("group")
+    ], mode=mode, output="array", output_dtype=np.float32)
+    feed.compile()
+
+    assert feed.columns == {"sum": 0, "group:/s1": 1, "group:/s2": 2}
+
+    row = feed.next()
+    assert row.dtype == np.float32
+    np.testing.assert_array_equal(row, [5, 1, 4])
+
+    out = np.zeros(3)
+    assert feed.next(out=out) is out
+    np.testing.assert_array_equal(out, [7, 2, 5])
+
+    assert feed.next() is row
+    np.testing.assert_array_equal(row, [9, 3, 6])
+    assert not feed.has_next()
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_stack(mode):
+
+    s1 = Stream.source([1, 2, 3], dtype="float").rename("s1")
+    s2 = Stream.source([4, 5, 6], dtype="float").rename("s2")
+
+    stack = Stream.stack([s1, s2.lag().rename("lag")]).rename("stack")
+
+    assert stack.columns == {"s1": 0, "lag": 1}
+
+    feed = DataFeed([stack, s1], mode=mode)
+
+    rows = [feed.next()["stack"].copy() for _ in range(3)]
+
+    np.testing.assert_array_equal(rows, [[1, np.nan], [2, 4], [3, 5]])
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_seek(mode):
+
+    array = np.random.RandomState(1).randn(100).cumsum()
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        return [
+            s.rolling(10).mean().rename("mean"),
+            s.lag(2).rolling(3).max().rename("max"),
+            s.ewm(span=4).mean().rename("ewm")
+        ]
+
+    expected = _collect(DataFeed(build(), mode=mode))
+
+    feed = DataFeed(build(), mode=mode)
+    feed.compile()
+
+    for index in [0, 5, 60, 99]:
+        feed.seek(index)
+        actual = _collect(feed)
+
+        assert len(actual) == len(expected) - index
+        for a, e in zip(actual, expected[index:]):
+            np.testing.assert_allclose(list(a.values()), list(e.values()))
+
+    feed.seek(100)
+    assert not feed.has_next()
+
+    with pytest.raises(ValueError):
+        feed.seek(-1)
+
+
+def test_seek_with_warmup_window():
+
+    array = np.random.RandomState(2).randn(200).cumsum()
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        return [s.rolling(5).sum().rename("sum"), s.ewm(span=3).mean().rename("ewm")]
+
+    expected = _collect(DataFeed(build()))
+
+    feed = DataFeed(build())
+    assert feed.lookback() is None
+
+    feed.seek(150, warmup=60)
+    actual = _collect(feed)
+
+    np.testing.assert_allclose([a["sum"] for a in actual], [e["sum"] for e in expected[150:]])
+    np.testing.assert_allclose([a["ewm"] for a in actual], [e["ewm"] for e in expected[150:]], rtol=1e-9)
+
+    feed = DataFeed([build()[0]])
+    assert feed.lookback() == 4
+
+    def gen():
+        yield from array
+
+    s = Stream.source(gen, dtype="float").rename("s")
+    feed = DataFeed([s.rolling(5).sum().rename("sum")])
+    assert feed.lookback() is None
+
+    s = Stream.source(array, dtype="float").rename("s")
+    feed = DataFeed([s.lag(4).rename("lag")])
+    assert feed.lookback() == 4
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_seek_rolling_with_missing_values(mode):
+
+    def build():
+        s = Stream.source([1, 2, 3, 4, np.nan, np.nan, 5, 6, 7], dtype="float").rename("s")
+        return [s.rolling(3, min_periods=2).mean().rename("mean")]
+
+    expected = _collect(DataFeed(build(), mode=mode))
+
+    feed = DataFeed(build(), mode=mode)
+    for index in range(9):
+        feed.seek(index)
+        actual = _collect(feed)
+
+        np.testing.assert_allclose([a["mean"] for a in actual], [e["mean"] for e in expected[index:]])
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_seek_rolling_restores_observed_count(mode):
+
+    rng = np.random.RandomState(3)
+    array = rng.randint(0, 10, 300).astype(float)
+    array[:40] = np.nan
+    array[rng.rand(300) < 0.3] = np.nan
+
+    def build():
+        s = Stream.source(array, dtype="float").rename("s")
+        return [
+            s.rolling(5, min_periods=3).mean().rename("mean"),
+            s.lag(3).rolling(8, min_periods=6).sum().rename("sum")
+        ]
+
+    expected = _collect(DataFeed(build(), mode=mode))
+
+    # Vectorized feeds precompute the aggregations, so only stream feeds
+    # have to restore the windows.
+    feed = DataFeed(build(), mode=mode)
+    assert feed.lookback() == (10 if mode == "stream" else 0)
+
+    for index in [6, 41, 45, 120, 299]:
+        feed.seek(index)
+        actual = _collect(feed)
+
+        for name in ["mean", "sum"]:
+            np.testing.assert_array_equal(
+                [a[name] for a in actual],
+                [e[name] for e in expected[index:]]
+            )
@@ -0,0 +1,54 @@
+import pytest
+
+from tensortrade.feed.core import Stream, DataFeed
+
+
+@pytest.mark.parametrize("mode", ["stream", "vectorized"])
+def test_profile(mode):
+
+    s = Stream.source([1, 2, 3, 4], dtype="float").rename("s")
+    sensor = Stream.sensor([10], lambda obj: obj[0], dtype="float").rename("sensor")
+
+    feed = DataFeed([
+        s.rolling(2).mean().rename("mean"),
+        (s + sensor).rename("sum")
+    ], mode=mode)
+    feed.compile()
+
+    profiler = feed.profile()
+
+    while feed.has_next():
+        feed.next()
+
+    totals = profiler.totals()
+    assert totals["steps"] == 4
+    assert totals["time"] >= totals["streams_time"] > 0
+
+    df = profiler.as_frame()
+    assert list(df.columns) == ["name", "type", "calls", "time", "mean_time", "allocations"]
+    assert (df.calls == 4).all()
+    assert "sensor" in df.name.values
+    assert "DataFeed" in df.type.values
+    assert df.time.is_monotonic_decreasing
+
+    assert "steps: 4" in profiler.table()
+    assert len(profiler.table(limit=1).splitlines()) == 3
+
+    assert feed.profile(enabled=False) is None
+    feed.reset()
+    feed.next()
+    assert profiler.totals()["steps"] == 4
+
+
+def test_profile_allocations():
+
+    s = Stream.source([1, 2, 3], dtype="float").rename("s")
+
+    feed = DataFeed([s.apply(lambda x: [x] * 100).rename("list")])
+    feed.compile()
+
+    profiler = feed.profile(allocations=True)
+    feed.next()
+
+    df = profiler.as_frame()
+    assert df.loc[df.name == "list", "allocations"].iloc[0] > 0
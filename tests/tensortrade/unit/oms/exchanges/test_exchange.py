@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from tensortrade.feed import Stream
+from tensortrade.oms.exchanges import Exchange, ExchangeOptions
+from tensortrade.oms.instruments import ExchangePair, USD, BTC
+from tensortrade.oms.services.execution.simulated import execute_order
+
+
+class FakeCCXT:
+
+    def __init__(self):
+        self.calls = 0
+
+    def quote_price(self, pair):
+        self.calls += 1
+        return 100.0 + self.calls
+
+
+def test_quote_price_is_cached_per_step():
+    price = Stream.source([7000.1234, 7000.1234, 7100.5], dtype="float").rename("USD-BTC")
+    exchange = Exchange("bitfinex", service=execute_order, t_signal=True)(price)
+    pair = ExchangePair(exchange, USD/BTC)
+
+    price.run()
+    assert pair.price == Decimal("7000.12")
+    assert exchange.quote_price(USD/BTC, True) is pair.price
+    assert pair.inverse_price == Decimal("0.00014285")
+    assert pair.inverse_price is pair.inverse_price
+
+    price.run()
+    quote = pair.price
+    assert quote == Decimal("7000.12")
+
+    price.run()
+    assert pair.price == Decimal("7100.50")
+    assert pair.inverse_price == (Decimal(1) / Decimal("7100.50")).quantize(Decimal(10) ** -8)
+
+
+def test_live_quote_price_is_cached_for_ttl():
+    exchange = Exchange("bitfinex", service=execute_order, t_signal=True, options=ExchangeOptions(quote_ttl=60))
+    exchange.ccxt = FakeCCXT()
+    pair = ExchangePair(exchange, USD/BTC)
+
+    assert pair.price_online == Decimal("101.00")
+    assert pair.inverse_price_online == Decimal("0.00990099")
+    assert pair.price_online == Decimal("101.00")
+    assert exchange.ccxt.calls == 1
+
+    exchange.options.quote_ttl = 0
+    assert pair.price_online == Decimal("102.00")
+    assert exchange.ccxt.calls == 2
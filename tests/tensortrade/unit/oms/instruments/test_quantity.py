@@ -2,6 +2,8 @@
 import pytest
 import unittest.mock as mock
 
+from decimal import Decimal
+
 from tensortrade.oms.instruments import *
 from tensortrade.core.exceptions import *
 
@@ -612,3 +614,70 @@ def test_convert(mock_exchange_pair):
 
     assert float(converted.size) == 1.6 * 9000
     assert converted.instrument == USD
+
+
+# Fixed point
+@pytest.fixture
+def decimal_only():
+    Quantity.fixed_point = False
+    yield
+    Quantity.fixed_point = True
+
+
+def test_units():
+
+    assert Quantity(USD, Decimal("10.25")).units == 1025
+    assert Quantity(BTC, 1).units == 10**BTC.precision
+    assert Quantity(USD, Decimal("10.255")).units is None
+
+
+@pytest.mark.parametrize("a,b", [
+    ("10.25", "0.75"),
+    ("10.255", "0.75"),
+    ("0.01", "0.02"),
+    ("0.01", "0.01"),
+    ("100", "99.99"),
+])
+def test_fixed_point_matches_decimal(a, b):
+
+    def results():
+        q1, q2 = Quantity(USD, Decimal(a)), Quantity(USD, Decimal(b))
+        outcome = [(q1 + q2).size, q1 < q2, q1 == q2, q1 >= q2, q1.quantize().size]
+        try:
+            outcome += [(q1 - q2).size]
+        except InvalidNegativeQuantity:
+            outcome += ["negative"]
+        return outcome
+
+    fixed = results()
+    Quantity.fixed_point = False
+    try:
+        assert fixed == results()
+    finally:
+        Quantity.fixed_point = True
+
+
+def test_fixed_point_negative_rounding():
+
+    # A difference of one unit below zero is rounded to zero, like in Decimal.
+    q = Quantity(USD, Decimal("1.00")) - Quantity(USD, Decimal("1.01"))
+    assert q.size == 0
+
+    with pytest.raises(InvalidNegativeQuantity):
+        Quantity(USD, Decimal("1.00")) - Quantity(USD, Decimal("1.02"))
+
+
+def test_fixed_point_keeps_path_id():
+
+    q = Quantity(USD, 5, path_id=path_id) + Quantity(USD, 3, path_id=path_id)
+    assert q.units == 800
+    assert q.size == 8
+    assert q.path_id == path_id
+    assert q.free().units == 800
+
+
+def test_decimal_opt_in(decimal_only):
+
+    q = Quantity(USD, 5) + Quantity(USD, 3)
+    assert q.size == 8
+    assert q._size is not None
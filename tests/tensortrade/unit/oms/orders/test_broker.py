@@ -264,3 +264,78 @@ def test_reset(mock_exchange_class):
     assert broker.unexecuted == []
     assert broker.executed == {}
     assert broker.trades == {}
+
+
+class FakeOrder:
+
+    def __init__(self, id, end=None, executable=False):
+        self.id = id
+        self.end = end
+        self.step = 0
+        self.executable = executable
+        self.criteria = None
+        self.status = OrderStatus.PENDING
+        self.executions = 0
+        self.expiry_checks = 0
+
+    @property
+    def is_executable(self):
+        return self.executable
+
+    @property
+    def is_expired(self):
+        self.expiry_checks += 1
+        return self.end is not None and self.step >= self.end
+
+    @property
+    def is_active(self):
+        return self.status not in [OrderStatus.FILLED, OrderStatus.CANCELLED]
+
+    def attach(self, listener):
+        pass
+
+    def execute(self, t_signal):
+        self.executions += 1
+        self.status = OrderStatus.OPEN
+
+    def cancel(self):
+        self.status = OrderStatus.CANCELLED
+
+
+def test_update_cancels_expired_orders():
+
+    broker = Broker()
+    orders = [FakeOrder(str(i), end=i + 1) for i in range(5)]
+    for order in orders:
+        broker.submit(order)
+
+    orders[0].executable = True
+    for order in orders:
+        order.step = 3
+    broker.update(True)
+
+    assert [o.status for o in orders] == [OrderStatus.CANCELLED] * 3 + [OrderStatus.PENDING] * 2
+    assert broker.unexecuted == orders[3:]
+    assert orders[0].id in broker.executed
+
+
+def test_update_skips_completed_orders():
+
+    broker = Broker()
+    filled = []
+    for i in range(100):
+        order = FakeOrder(str(i), end=1000, executable=True)
+        broker.submit(order)
+        filled += [order]
+    broker.update(True)
+    for order in filled:
+        order.status = OrderStatus.FILLED
+        order.expiry_checks = 0
+
+    pending = FakeOrder("pending", end=1000)
+    broker.submit(pending)
+    broker.update(True)
+
+    assert sum(o.expiry_checks for o in filled) <= 1
+    assert all(o.executions == 1 for o in filled)
+    assert broker.unexecuted == [pending]
@@ -0,0 +1,111 @@
+import pytest
+
+from tensortrade.oms.orders import Broker, OrderStatus, TradeSide
+from tensortrade.oms.orders.criteria import Limit, Stop, Timed
+from tensortrade.oms.orders.triggers import Trigger, TriggerIndex, triggers_of
+from tensortrade.oms.instruments import USD, BTC, ExchangePair
+
+
+class FakeExchange:
+
+    def __init__(self, price):
+        self.name = "fake"
+        self.price = price
+        self.quotes = 0
+
+    def quote_price(self, pair, t_signal):
+        self.quotes += 1
+        return self.price
+
+    def is_pair_tradable(self, pair):
+        return True
+
+
+class FakeOrder:
+
+    def __init__(self, id, exchange, criteria, side=TradeSide.SELL, price=100.0):
+        self.id = id
+        self.side = side
+        self.price = price
+        self.pair = USD / BTC
+        self.exchange_pair = ExchangePair(exchange, self.pair)
+        self.criteria = criteria
+        self.end = None
+        self.status = OrderStatus.PENDING
+        self.checks = 0
+
+    @property
+    def is_executable(self):
+        self.checks += 1
+        return self.criteria(self, self.exchange_pair.exchange)
+
+    @property
+    def is_active(self):
+        return self.status == OrderStatus.PENDING
+
+    def attach(self, listener):
+        pass
+
+    def execute(self, t_signal):
+        self.status = OrderStatus.OPEN
+
+
+@pytest.fixture
+def exchange():
+    return FakeExchange(100.0)
+
+
+def test_triggers(exchange):
+    sell = FakeOrder("sell", exchange, None)
+    buy = FakeOrder("buy", exchange, None, side=TradeSide.BUY)
+
+    assert Limit(90).triggers(buy) == [Trigger(90, False, True)]
+    assert Limit(110).triggers(sell) == [Trigger(110, True, True)]
+    assert Stop("up", 0.1, True).triggers(sell) == [Trigger(pytest.approx(110), True, True)]
+    assert Stop("down", 0.1, True).triggers(sell) == [Trigger(pytest.approx(90), False, True)]
+
+    bracket = Stop("down", 0.1, True) ^ Stop("up", 0.1, True)
+    assert [t.above for t in triggers_of(bracket, sell)] == [False, True]
+
+    assert triggers_of(Timed(5), sell) is None
+    assert triggers_of(~Limit(110), sell) is None
+    assert triggers_of(Limit(110) | Timed(5), sell) is None
+    assert triggers_of(Limit(110) & Timed(5), sell) == [Trigger(110, True, True)]
+    assert triggers_of(lambda order, exchange: True, sell) is None
+
+
+def test_candidates(exchange):
+    index = TriggerIndex()
+    orders = [FakeOrder(str(i), exchange, Limit(100.0 + i)) for i in range(-5, 6)]
+    for seq, order in enumerate(orders):
+        assert index.add(order, seq)
+
+    assert sorted(index.candidates()) == sorted(o.id for o in orders[:6])
+
+    exchange.price = 103.0
+    assert sorted(index.candidates()) == sorted(o.id for o in orders[:9])
+
+    index.remove(orders[0])
+    assert orders[0] not in index
+    assert len(index) == 10
+    assert orders[0].id not in index.candidates()
+
+
+def test_broker_checks_triggered_orders_only(exchange):
+    broker = Broker()
+
+    orders = [FakeOrder(str(i), exchange, Stop("up", 0.01 * (i + 1), True)) for i in range(100)]
+    timed = FakeOrder("timed", exchange, lambda order, exchange: False)
+    for order in orders + [timed]:
+        broker.submit(order)
+
+    broker.update(True)
+    assert sum(o.checks for o in orders) == 0
+    assert timed.checks == 1
+
+    exchange.price = 103.5
+    broker.update(True)
+
+    assert [o.status for o in orders[:3]] == [OrderStatus.OPEN] * 3
+    assert sum(o.checks for o in orders) == 3
+    assert broker.unexecuted == orders[3:] + [timed]
@@ -0,0 +1,22 @@
+
+import pytest
+
+
+class FakeClock:
+    """A clock whose time only moves when it is slept on."""
+
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps += [seconds]
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(now=0)
@@ -0,0 +1,53 @@
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from tensortrade.oms.services.execution.candles import CandleBuffer
+
+
+def candles(start, end):
+    dates = pd.date_range("2021-01-01", periods=end, freq="5min")[start:end]
+    values = np.arange(start * 5, end * 5, dtype=np.float64).reshape(-1, 5)
+    return pd.DataFrame({
+        "date": dates,
+        "open": values[:, 0],
+        "high": values[:, 1],
+        "low": values[:, 2],
+        "close": values[:, 3],
+        "volume": values[:, 4]
+    })
+
+
+def test_merge_keeps_new_candles_only():
+    buffer = CandleBuffer(10)
+
+    assert buffer.merge_frame(candles(0, 4)) == 4
+    assert buffer.merge_frame(candles(2, 7)) == 3
+    assert buffer.merge_frame(candles(3, 7)) == 0
+    assert buffer.size == 7
+
+    expected = candles(0, 7)
+    pd.testing.assert_frame_equal(buffer.frame(), expected, check_dtype=False)
+    assert buffer.last_date == np.datetime64(expected["date"].iloc[-1], "ms")
+
+
+def test_capacity_is_bounded():
+    buffer = CandleBuffer(5)
+
+    for end in range(3, 30, 3):
+        buffer.merge_frame(candles(max(0, end - 6), end))
+
+    assert buffer.size == 5
+    pd.testing.assert_frame_equal(buffer.frame(), candles(22, 27), check_dtype=False)
+    pd.testing.assert_frame_equal(buffer.frame(2), candles(25, 27), check_dtype=False)
+
+    dates, values = buffer.view(3)
+    assert len(dates) == 3
+    assert np.shares_memory(values, buffer._values)
+
+    buffer.reset()
+    assert buffer.size == 0 and buffer.last_date is None
+
+    with pytest.raises(ValueError):
+        CandleBuffer(0)
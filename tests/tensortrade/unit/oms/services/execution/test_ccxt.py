@@ -0,0 +1,77 @@
+
+import numpy as np
+import pandas as pd
+
+from tensortrade.oms.services.execution.ccxt import CCXTExchange
+from tensortrade.oms.services.execution.scheduler import BarScheduler
+
+
+class FakeClient:
+    """A local stand-in for a CCXT exchange serving candles from a list."""
+
+    def __init__(self, candles):
+        self.candles = candles
+        self.now = 30
+        self.requests = []
+
+    def fetch_ohlcv(self, symbol, timeframe=None, since=None, limit=None):
+        self.requests += [(since, limit)]
+        candles = self.candles[:self.now]
+        if since is not None:
+            candles = [c for c in candles if c[0] >= since]
+        else:
+            candles = candles[-limit:]
+        # Every request lets a new candle start.
+        self.now += 1
+        return candles[:limit]
+
+    def fetch_ticker(self, symbol):
+        return {"close": self.candles[self.now - 1][4]}
+
+    def load_markets(self):
+        pass
+
+
+def make_candles(n):
+    start = int(pd.Timestamp("2021-01-01").value // 10**6)
+    return [
+        [start + i * 5 * 60 * 1000, 1.0 + i, 2.0 + i, 0.5 + i, 1.5 + i, 10.0 * i]
+        for i in range(n)
+    ]
+
+
+def test_parse_ohlcv():
+    candles = make_candles(3)
+    exchange = CCXTExchange(FakeClient(make_candles(40)))
+
+    parsed = exchange.parse_ohlcv(candles)
+
+    assert list(parsed.columns) == ['date', 'open', 'high', 'low', 'close', 'volume']
+    assert parsed['date'].iloc[0] == pd.Timestamp("2021-01-01")
+    assert parsed['date'].iloc[2] == pd.Timestamp("2021-01-01 00:10")
+    assert np.allclose(parsed['close'], [c[4] for c in candles])
+
+
+def test_next_observation_fetches_new_candles_only(clock):
+    candles = make_candles(60)
+    client = FakeClient(candles)
+    clock.now = candles[29][0] / 1000
+    scheduler = BarScheduler("5m", settle=1, clock=clock)
+    exchange = CCXTExchange(client, capacity=100, scheduler=scheduler)
+
+    # The last of the 30 served candles is still open.
+    assert exchange._candles.size == 24
+    assert client.requests == [(None, 25)]
+
+    for _ in range(5):
+        observations = exchange.next_observation(window_size=10)
+
+    # Each step sleeps until the open candle closes.
+    assert clock.sleeps == [301] + [300] * 4
+
+    since, limit = client.requests[-1]
+    assert since is not None and limit == 11
+
+    expected = exchange.parse_ohlcv(candles[5:34])
+    pd.testing.assert_frame_equal(observations, expected, check_dtype=False)
+    assert exchange.quote_price(exchange._observation_pairs[0]) == candles[client.now - 1][4]
@@ -0,0 +1,142 @@
+
+import asyncio
+
+import pandas as pd
+
+from tensortrade.feed.core.feed import PushFeed
+from tensortrade.oms.services.execution.candles import parse_ohlcv
+from tensortrade.oms.services.execution.ccxt_async import AsyncCCXTExchange, RateLimiter
+from tensortrade.oms.services.execution.scheduler import BarScheduler
+
+
+class FakeExchange:
+    """An in-process exchange serving candles, one more candle of each symbol
+    being opened every time the clock enters a new bar."""
+
+    def __init__(self, symbols, clock, start, lag=None):
+        self.clock = clock
+        self.start = start
+        self.lag = lag or {}
+        self.symbols = symbols
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.closed = False
+
+    def candles(self, symbol):
+        bars = int((self.clock.now - self.start) // 300) + 1 - self.lag.get(symbol, 0)
+        offset = self.symbols.index(symbol) * 1000
+        return [
+            [int((self.start + 300 * i) * 1000), offset + i, offset + i + 2, offset + i - 1, offset + i + 1, 10.0]
+            for i in range(bars)
+        ]
+
+    async def fetch_ohlcv(self, symbol, timeframe=None, since=None, limit=None):
+        self.requests += [(symbol, since, limit)]
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+
+        candles = self.candles(symbol)
+        if since is not None:
+            return [c for c in candles if c[0] >= since][:limit]
+        return candles[-limit:]
+
+    async def fetch_ticker(self, symbol):
+        return {"close": self.candles(symbol)[-1][4]}
+
+    async def close(self):
+        self.closed = True
+
+
+def make_exchange(clock, lag=None, rate=None):
+    symbols = ["BTC/USDT", "ETH/USDT", "XRP/USDT"]
+    start = pd.Timestamp("2021-01-01").timestamp()
+    clock.now = start + 300 * 30 + 10
+
+    async def sleep(seconds):
+        clock.sleep(seconds)
+
+    fake = FakeExchange(symbols, clock, start, lag=lag)
+    exchange = AsyncCCXTExchange(
+        fake,
+        symbols,
+        scheduler=BarScheduler("5m", settle=1, clock=clock),
+        rate=rate,
+        sleep=sleep
+    )
+    return exchange, fake
+
+
+def test_push_fetches_symbols_concurrently(clock):
+    exchange, fake = make_exchange(clock)
+
+    async def run():
+        feed = PushFeed(exchange.streams())
+        outputs = []
+        async with exchange:
+            for _ in range(4):
+                outputs += [await exchange.push(feed, window_size=10)]
+            tickers = await exchange.fetch_tickers()
+        return outputs, tickers
+
+    outputs, tickers = asyncio.run(run())
+
+    assert fake.closed
+    assert fake.max_in_flight == 3
+
+    # The first bar fetches a window, the following ones only the new candles.
+    assert [r[1] is None for r in fake.requests] == [True] * 3 + [False] * 9
+
+    for k, output in enumerate(outputs):
+        for j, symbol in enumerate(fake.symbols):
+            assert output[symbol + ":open"] == 1000 * j + 29 + k
+
+    for j, symbol in enumerate(fake.symbols):
+        expected = parse_ohlcv(fake.candles(symbol)[-14:-1])
+        pd.testing.assert_frame_equal(exchange.candles[symbol].frame(), expected, check_dtype=False)
+        assert tickers[symbol]["close"] == fake.candles(symbol)[-1][4]
+
+
+def test_lagging_symbol_is_retried(clock):
+    exchange, fake = make_exchange(clock, lag={"ETH/USDT": 0})
+
+    async def run():
+        await exchange.next_bar(window_size=5)
+        # The next candle of ETH/USDT is published a bar late.
+        fake.lag["ETH/USDT"] = 1
+        before = clock.now
+
+        async def publish():
+            while clock.now - before < 310:
+                await asyncio.sleep(0)
+            fake.lag["ETH/USDT"] = 0
+
+        await asyncio.gather(exchange.next_bar(window_size=5), publish())
+
+    asyncio.run(run())
+
+    eth = [r for r in fake.requests if r[0] == "ETH/USDT"]
+    assert len(eth) > 2
+    assert exchange.candles["ETH/USDT"].size == exchange.candles["BTC/USDT"].size
+
+
+def test_rate_limiter():
+    now = [0.0]
+    sleeps = []
+
+    async def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = RateLimiter(rate=2, burst=2, clock=lambda: now[0], sleep=sleep)
+
+    async def run():
+        for _ in range(5):
+            async with limiter:
+                pass
+
+    asyncio.run(run())
+
+    assert sleeps == [0.5, 0.5, 0.5]
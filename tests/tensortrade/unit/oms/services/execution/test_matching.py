@@ -0,0 +1,208 @@
+import unittest.mock as mock
+
+import numpy as np
+import pytest
+
+from decimal import Decimal
+
+from tensortrade.core import Clock
+from tensortrade.oms.wallets import Wallet, Portfolio
+from tensortrade.oms.instruments import BTC, USD, ExchangePair
+from tensortrade.oms.orders import Order, TradeSide, TradeType, OrderStatus
+from tensortrade.oms.exchanges import ExchangeOptions
+
+from tensortrade.oms.services.execution.matching import MatchingEngine, OrderBook
+
+
+@pytest.fixture
+def book():
+    return OrderBook(
+        bids=[[99, 1], [98, 2], [97, 3]],
+        asks=[[102, 3], [101, 2], [100, 1]]
+    )
+
+
+def test_init_sorts_levels(book):
+    assert book.bid_prices.tolist() == [99, 98, 97]
+    assert book.ask_prices.tolist() == [100, 101, 102]
+    assert book.mid == 99.5
+
+
+def test_take_size(book):
+    size, notional = book.take(TradeSide.SELL, 2.5)
+
+    assert size == 2.5
+    assert notional == 99 + 1.5 * 98
+    assert book.bid_sizes.tolist() == [0, 0.5, 3]
+    assert book.best(TradeSide.SELL) == 98
+
+
+def test_take_notional(book):
+    size, notional = book.take(TradeSide.BUY, 100 + 101, notional=True)
+
+    assert size == pytest.approx(2)
+    assert notional == pytest.approx(201)
+    assert book.ask_sizes.tolist() == pytest.approx([0, 1, 3])
+
+
+def test_take_limit(book):
+    size, notional = book.take(TradeSide.BUY, 10, limit=101)
+
+    assert size == 3
+    assert notional == 100 + 2 * 101
+    assert book.take(TradeSide.BUY, 10, limit=101) == (0, 0)
+
+
+def test_take_shares_depth(book):
+    first, _ = book.take(TradeSide.SELL, 2)
+    second, notional = book.take(TradeSide.SELL, 2)
+
+    assert (first, second) == (2, 2)
+    assert notional == 98 + 97
+
+
+def test_sizes_at(book):
+    assert book.sizes_at(TradeSide.BUY, [99, 98.5, 97]).tolist() == [1, 0, 3]
+    assert book.sizes_at(TradeSide.SELL, [100, 102, 103]).tolist() == [1, 3, 0]
+
+
+def test_synthesize():
+    book = OrderBook.synthesize(100, spread=0.02, levels=3, tick=0.01, size=1, growth=1)
+
+    assert book.bid_prices.tolist() == pytest.approx([99, 98, 97])
+    assert book.ask_prices.tolist() == pytest.approx([101, 102, 103])
+    assert book.ask_sizes.tolist() == [1, 2, 4]
+
+
+def test_from_ccxt():
+    book = OrderBook.from_ccxt({"bids": [[99, 1, 0]], "asks": [[100, 2, 0]]})
+
+    assert book.mid == 99.5
+    assert book.ask_sizes.tolist() == [2]
+
+
+@pytest.fixture
+def setup():
+    clock = Clock()
+    options = ExchangeOptions(commission=0.001)
+
+    exchange = mock.Mock()
+    exchange.name = "bitfinex"
+    exchange.id = "bitfinex"
+    exchange.options = options
+    exchange.clock = clock
+    exchange.quote_price = lambda pair, t_signal: Decimal("100.00")
+
+    base_wallet = Wallet(exchange, 10000 * USD)
+    quote_wallet = Wallet(exchange, 10 * BTC)
+    portfolio = Portfolio(USD, [base_wallet, quote_wallet])
+
+    def order(side, quantity, trade_type=TradeType.MARKET, price=Decimal("100.00")):
+        order = Order(
+            step=0,
+            side=side,
+            trade_type=trade_type,
+            exchange_pair=ExchangePair(exchange, USD / BTC),
+            quantity=quantity,
+            portfolio=portfolio,
+            price=price,
+            t_signal=True
+        )
+        order.status = OrderStatus.OPEN
+        return order
+
+    def execute(engine, order):
+        trade = engine(order, base_wallet, quote_wallet, Decimal("100.00"), options, clock, True)
+        if trade:
+            order.fill(trade, True)
+        return trade
+
+    return order, execute, base_wallet, quote_wallet
+
+
+def test_market_buy_walks_levels(setup, book):
+    order, execute, base_wallet, quote_wallet = setup
+    engine = MatchingEngine()
+    engine.books["USD/BTC"] = book
+    engine._tracked.add("USD/BTC")
+
+    buy = order(TradeSide.BUY, 250 * USD)
+    trade = execute(engine, buy)
+
+    assert trade.price > 100
+    assert trade.quantity.size + trade.commission.size == 250
+    assert quote_wallet.locked[buy.path_id].size == pytest.approx(Decimal(250 * 0.999) / trade.price, abs=1e-6)
+    assert book.ask_sizes[0] == 0
+
+
+def test_market_sell_partial_fill(setup, book):
+    order, execute, base_wallet, quote_wallet = setup
+    engine = MatchingEngine()
+    engine.books["USD/BTC"] = book
+    engine._tracked.add("USD/BTC")
+
+    sell = order(TradeSide.SELL, 8 * BTC)
+    trade = execute(engine, sell)
+
+    assert float(trade.quantity.size) == pytest.approx(6)
+    assert sell.remaining.size > 0
+    assert book.bid_sizes.tolist() == [0, 0, 0]
+
+
+def test_limit_order_rests_in_queue(setup, book):
+    order, execute, base_wallet, quote_wallet = setup
+    engine = MatchingEngine()
+    engine.books["USD/BTC"] = book
+    engine._tracked.add("USD/BTC")
+
+    buy = order(TradeSide.BUY, 98 * USD, trade_type=TradeType.LIMIT, price=Decimal("98.00"))
+    assert execute(engine, buy) is None
+    assert engine.resting["USD/BTC"][0].ahead == 2
+
+    # Half the size ahead of the order trades.
+    engine.update("USD/BTC", OrderBook([[99, 1], [98, 1], [97, 3]], [[100, 1]]))
+    assert buy.trades == []
+
+    # The rest of the queue is cancelled, which does not fill the order.
+    engine.update("USD/BTC", OrderBook([[99, 1], [97, 3]], [[100, 1]]))
+    assert buy.trades == []
+
+    # Then the price trades through the order.
+    engine.update("USD/BTC", OrderBook([[97, 3]], [[99, 1]]))
+    assert len(buy.trades) == 1
+    assert buy.trades[0].price == Decimal("98.00")
+    assert engine.resting["USD/BTC"] == []
+
+
+def test_limit_order_inside_spread_waits_for_trades(setup):
+    order, execute, base_wallet, quote_wallet = setup
+    engine = MatchingEngine()
+    engine.books["USD/BTC"] = OrderBook([[98, 2], [97, 3]], [[100, 1], [101, 2]])
+    engine._tracked.add("USD/BTC")
+
+    buy = order(TradeSide.BUY, 99 * USD, trade_type=TradeType.LIMIT, price=Decimal("99.00"))
+    assert execute(engine, buy) is None
+    assert engine.resting["USD/BTC"][0].ahead == 0
+
+    # Nothing traded, so the order is not filled.
+    engine.update("USD/BTC", OrderBook([[98, 2], [97, 3]], [[100, 1], [101, 2]]))
+    assert buy.trades == []
+
+    # Sizes below the price of the order trading do not reach it either.
+    engine.update("USD/BTC", OrderBook([[98, 1], [97, 3]], [[100, 1], [101, 2]]))
+    assert buy.trades == []
+
+    # The asks coming down to the order fill it.
+    engine.update("USD/BTC", OrderBook([[98, 1], [97, 3]], [[99, 2], [101, 2]]))
+    assert len(buy.trades) == 1
+    assert buy.trades[0].price == Decimal("99.00")
+
+
+def test_synthetic_book_per_step(setup):
+    order, execute, base_wallet, quote_wallet = setup
+    engine = MatchingEngine(levels=5, size=0.5)
+
+    trade = execute(engine, order(TradeSide.SELL, 1 * BTC))
+
+    assert trade.price < 100
+    assert engine.books["USD/BTC"].bid_sizes[0] == 0
@@ -0,0 +1,47 @@
+
+import random
+
+import pytest
+
+from tensortrade.oms.services.execution.scheduler import BarScheduler, parse_timeframe
+
+
+def test_parse_timeframe():
+    assert parse_timeframe("5m") == 300
+    assert parse_timeframe("1h") == 3600
+    assert parse_timeframe("1d") == 86400
+    assert parse_timeframe(30) == 30
+
+    with pytest.raises(ValueError):
+        parse_timeframe("5x")
+
+
+def test_wait_for_close(clock):
+    clock.now = 1000
+    scheduler = BarScheduler("5m", settle=2, clock=clock)
+
+    scheduler.wait_for_close(bar_open=900)
+    assert clock.sleeps == [202]
+    assert clock.now == 1202
+
+    # A bar that is already closed does not wait.
+    scheduler.wait_for_close(bar_open=600)
+    assert clock.sleeps == [202]
+
+
+def test_poll_backs_off(clock):
+    scheduler = BarScheduler("5m", backoff=1, max_backoff=5, jitter=0.1, clock=clock, rng=random.Random(0))
+
+    attempts = []
+
+    def fetch():
+        attempts.append(clock.time())
+        return len(attempts)
+
+    assert scheduler.poll(fetch, lambda n: n == 6) == 6
+    assert len(clock.sleeps) == 5
+
+    for sleep, base in zip(clock.sleeps, [1, 2, 4, 5, 5]):
+        assert base * 0.9 <= sleep <= base * 1.1
+
+    assert len(set(clock.sleeps)) == 5
@@ -0,0 +1,123 @@
+import os
+import multiprocessing as mp
+
+import numpy as np
+import pytest
+
+from types import SimpleNamespace
+
+from tensortrade.core.base import Clock
+from tensortrade.oms.instruments import USD, BTC
+from tensortrade.oms.wallets.ledger import Ledger, Transaction
+
+
+path_id = "f4cfeeae-a3e4-42e9-84b9-a24ccd2eebeb"
+
+
+@pytest.fixture
+def wallet():
+    exchange = SimpleNamespace(name="bitfinex", clock=Clock())
+    return SimpleNamespace(
+        exchange=exchange,
+        balance=100 * USD,
+        locked_balance=20 * USD,
+        locked={path_id: (20 * USD).lock_for(path_id)}
+    )
+
+
+def commit(ledger, wallet, n):
+    for i in range(n):
+        quantity = (i * USD).lock_for(path_id) if i % 2 else i * USD
+        ledger.commit(wallet, quantity, "source", "target", "MEMO {}".format(i % 3))
+
+
+def test_as_frame(wallet):
+    ledger = Ledger(chunk_size=4)
+    commit(ledger, wallet, 10)
+
+    df = ledger.as_frame()
+
+    assert list(df.columns) == list(Transaction._fields)
+    assert len(df) == 10
+    assert df.amount.tolist() == list(range(10))
+    assert df.memo.tolist() == ["MEMO {}".format(i % 3) for i in range(10)]
+    assert df.poid[1::2].tolist() == [path_id] * 5
+    assert df.poid[::2].isna().all()
+    assert (df.free == 100).all() and (df.locked == 20).all()
+    assert df.locked_poid[1] == 20 and np.isnan(df.locked_poid[0])
+    assert (df.instrument == str(USD)).all()
+
+
+def test_sort_by_order_seq(wallet):
+    ledger = Ledger(chunk_size=4)
+    commit(ledger, wallet, 6)
+
+    df = ledger.as_frame(sort_by_order_seq=True)
+
+    assert df.amount.tolist() == [0, 2, 4, 1, 3, 5]
+
+
+def test_transactions(wallet):
+    ledger = Ledger()
+    ledger.commit(wallet, 2 * BTC, "a", "b", "c")
+
+    transaction, = ledger.transactions
+
+    assert transaction.amount == 2
+    assert transaction.instrument == str(BTC)
+    assert transaction.source == "a"
+
+
+def test_spill(wallet, tmp_path):
+    ledger = Ledger(chunk_size=4, spill=str(tmp_path))
+    commit(ledger, wallet, 10)
+
+    assert len(os.listdir(tmp_path)) == 2
+    assert ledger.as_frame().amount.tolist() == list(range(10))
+
+    ledger.reset()
+
+    assert os.listdir(tmp_path) == []
+    assert len(ledger.as_frame()) == 0
+
+
+def test_spill_from_forked_processes(wallet, tmp_path):
+    ledger = Ledger(chunk_size=4, spill=str(tmp_path))
+
+    def spill():
+        commit(ledger, wallet, 10)
+        ledger.reset()
+
+    process = mp.get_context("fork").Process(target=spill)
+    process.start()
+    commit(ledger, wallet, 10)
+    process.join()
+
+    assert process.exitcode == 0
+    assert len(os.listdir(tmp_path)) == 2
+    assert ledger.as_frame().amount.tolist() == list(range(10))
+
+
+def test_metrics_only(wallet):
+    ledger = Ledger(record=False)
+    commit(ledger, wallet, 10)
+
+    assert ledger.count == 10
+    assert len(ledger.as_frame()) == 0
+
+
+def test_non_integer_steps(wallet):
+    ledger = Ledger(chunk_size=2)
+    commit(ledger, wallet, 2)
+
+    wallet.exchange.clock = SimpleNamespace(step="warmup")
+    commit(ledger, wallet, 1)
+    wallet.exchange.clock = SimpleNamespace(step=np.int64(7))
+    commit(ledger, wallet, 1)
+
+    assert ledger.as_frame().step.tolist() == [0, 0, "warmup", 7]
+    assert ledger.transactions[2].step == "warmup"
+
+    ledger.reset()
+    commit(ledger, wallet, 1)
+    assert ledger.as_frame().step.tolist() == [7]
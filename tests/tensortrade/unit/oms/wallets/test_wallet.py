@@ -4,6 +4,7 @@ import unittest.mock as mock
 
 from decimal import Decimal
 
+from tensortrade.core.base import Clock
 from tensortrade.core.exceptions import InsufficientFunds, IncompatibleInstrumentOperation
 from tensortrade.oms.exchanges import Exchange
 from tensortrade.oms.wallets import Wallet
@@ -14,7 +15,7 @@ path_id = "f4cfeeae-a3e4-42e9-84b9-a24ccd2eebeb"
 other_id = "7f3de243-0474-48d9-bf44-ca55ae07a70e"
 
 
-exchange = Exchange('Exchange', lambda x: x)
+exchange = Exchange('Exchange', lambda x: x, t_signal=True)
 
 
 def test_init():
@@ -183,8 +184,9 @@ def test_transfer():
 
     exchange = mock.Mock()
     price = Decimal(9750.19).quantize(Decimal(10)**-2)
-    exchange.quote_price = lambda pair: price
+    exchange.quote_price = lambda pair, t_signal: price
     exchange.name = "bitfinex"
+    exchange.clock = Clock()
 
     order = mock.Mock()
     order.path_id = "fake_id"
@@ -204,7 +206,8 @@ def test_transfer():
                     quantity,
                     commission,
                     exchange_pair,
-                    "transfer")
+                    "transfer",
+                    True)
 
     source = Wallet(exchange, 3.79283997 * BTC)
     source.lock(3.00000029 * BTC, order, "test")
@@ -219,5 +222,37 @@ def test_transfer():
                     quantity,
                     commission,
                     exchange_pair,
-                    "transfer")
+                    "transfer",
+                    True)
 
+
+
+def test_float_balances():
+
+    wallet = Wallet(exchange, 10000 * USD)
+    assert wallet.float_balances == (10000, 0, 10000)
+
+    balances = wallet.float_balances
+    assert wallet.float_balances is balances
+
+    wallet.deposit(
+        quantity=Quantity(USD, 500, path_id=path_id),
+        reason="test"
+    )
+    assert wallet.float_balances == (10000, 500, 10500)
+
+    order = mock.Mock()
+    order.path_id = other_id
+    wallet.lock(1000 * USD, order, "test")
+    assert wallet.float_balances == (9000, 1500, 10500)
+    assert wallet.locked_balance == 1500 * USD
+
+    wallet.unlock(Quantity(USD, 200, path_id=other_id), "test")
+    assert wallet.float_balances == (9200, 1300, 10500)
+
+    wallet.withdraw(Quantity(USD, 500, path_id=path_id), "test")
+    assert wallet.float_balances == (9200, 800, 10000)
+    assert wallet.total_balance == 10000 * USD
+
+    wallet.reset()
+    assert wallet.float_balances == (10000, 0, 10000)